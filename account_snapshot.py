@@ -0,0 +1,169 @@
+"""
+💰 ACCOUNT SNAPSHOT: Знімок балансів обох XT акаунтів замість запиту балансу під глобальним локом у кожному воркері
+Баланси та кількість відкритих позицій оновлюються по таймеру і після кожного ордера.
+Воркери читають атомарний read-only знімок, а маржа резервується локально при розміщенні ордера.
+Резерв знімається тільки коли біржа вже відобразила ордер: знімок, запит якого почався після
+підтвердження ордера (confirm), або release якщо ордер не відкрився.
+"""
+import time
+import logging
+import itertools
+import threading
+from types import MappingProxyType
+
+from config import ACCOUNT_SNAPSHOT_INTERVAL_SEC
+from xt_client import get_xt_futures_balance, get_xt_open_positions
+from rate_governor import set_traffic_lane
+
+
+class AccountSnapshotService:
+    """💰 Сервіс знімків балансу: refresh по таймеру + після fill, локальне резервування маржі"""
+
+    def __init__(self, refresh_interval=ACCOUNT_SNAPSHOT_INTERVAL_SEC):
+        self.refresh_interval = refresh_interval
+        self.accounts = {}  # account_name -> XT клієнт
+        self.balances = MappingProxyType({})  # account_name -> read-only баланс
+        self.updated_at = 0.0
+        self.reservations = {}  # id -> {'account', 'amount', 'reserved_at', 'confirmed_at'}
+        self.reservation_ids = itertools.count(1)
+        self.lock = threading.Lock()  # захищає reservations + заміну знімка (мікросекунди)
+        self.refresh_lock = threading.Lock()  # тільки один потік ходить в біржу
+        self.refresh_event = threading.Event()
+        self.refresh_thread = None
+        self.stats = {'refreshes': 0, 'refresh_failures': 0, 'reservations': 0, 'last_refresh_duration': 0.0}
+
+    def bind(self, accounts):
+        """accounts: {'account_1': xt_account_1, 'account_2': xt_account_2}"""
+        self.accounts = dict(accounts)
+
+    # ------------------------------------------------------------------
+    # 🔄 Оновлення з біржі
+    # ------------------------------------------------------------------
+    def refresh(self):
+        """Запитує баланси і відкриті позиції всіх акаунтів та атомарно підміняє знімок"""
+        with self.refresh_lock:
+            started_at = time.time()
+            fetched = {}
+            cache_by_client = {}  # якщо другий акаунт = перший, не робимо запит двічі
+            try:
+                for name, client in self.accounts.items():
+                    if id(client) not in cache_by_client:
+                        balance = get_xt_futures_balance(client)
+                        open_positions = get_xt_open_positions(client) or []
+                        cache_by_client[id(client)] = (balance, len(open_positions))
+                    balance, open_count = cache_by_client[id(client)]
+                    fetched[name] = MappingProxyType({
+                        'total': float(balance.get('total', 0.0) or 0.0),
+                        'free': float(balance.get('free', 0.0) or 0.0),
+                        'used': float(balance.get('used', 0.0) or 0.0),
+                        'open_positions': open_count,
+                    })
+            except Exception as e:
+                self.stats['refresh_failures'] += 1
+                logging.error(f"❌ ACCOUNT SNAPSHOT: Помилка оновлення балансів: {e}")
+                return False
+
+            with self.lock:
+                self.balances = MappingProxyType(fetched)
+                self.updated_at = time.time()
+                # Тільки ордери, підтверджені біржею до початку запиту, вже відображені в балансі.
+                # Непідтверджений резерв (ордер ще в дорозі) лишається - інакше знімок з балансом до fill
+                # показав би іншим воркерам вже зайняту маржу
+                self.reservations = {
+                    rid: r for rid, r in self.reservations.items()
+                    if r['confirmed_at'] is None or r['confirmed_at'] >= started_at
+                }
+            self.stats['refreshes'] += 1
+            self.stats['last_refresh_duration'] = time.time() - started_at
+            return True
+
+    def request_refresh(self):
+        """Позачергове оновлення (після fill ордера) - не блокує викликаючий потік"""
+        self.refresh_event.set()
+
+    def start(self, stop_event):
+        """Фоновий потік оновлення по таймеру або по request_refresh()"""
+        if self.refresh_thread and self.refresh_thread.is_alive():
+            return
+
+        def _loop():
+            set_traffic_lane('snapshot')
+            while not stop_event.is_set():
+                self.refresh()
+                self.refresh_event.wait(timeout=self.refresh_interval)
+                self.refresh_event.clear()
+
+        self.refresh_thread = threading.Thread(target=_loop, name="account-snapshot", daemon=True)
+        self.refresh_thread.start()
+        logging.info(f"💰 ACCOUNT SNAPSHOT: Фонове оновлення балансів кожні {self.refresh_interval}с + після ордерів")
+
+    # ------------------------------------------------------------------
+    # 📖 Читання та резервування
+    # ------------------------------------------------------------------
+    def _reserved_for(self, name):
+        return sum(r['amount'] for r in self.reservations.values() if r['account'] == name)
+
+    def view(self):
+        """
+        Атомарний read-only знімок:
+        {'accounts': {name: {total, free, used, reserved, available, open_positions}}, 'available_total', 'age'}
+        """
+        if not self.updated_at:
+            self.refresh()  # перший виклик до старту фонового потоку
+        with self.lock:
+            accounts = {}
+            for name, balance in self.balances.items():
+                reserved = self._reserved_for(name)
+                accounts[name] = MappingProxyType(dict(
+                    balance, reserved=reserved, available=max(0.0, balance['free'] - reserved)
+                ))
+            updated_at = self.updated_at
+        return MappingProxyType({
+            'accounts': MappingProxyType(accounts),
+            'available_total': sum(a['available'] for a in accounts.values()),
+            'total': sum(a['total'] for a in accounts.values()),
+            'age': time.time() - updated_at if updated_at else None,
+        })
+
+    def reserve(self, name, amount):
+        """Атомарно резервує маржу на акаунті. Повертає id резерву або None якщо доступної маржі недостатньо"""
+        with self.lock:
+            balance = self.balances.get(name)
+            if balance is None or balance['free'] - self._reserved_for(name) < amount:
+                return None
+            reservation_id = next(self.reservation_ids)
+            self.reservations[reservation_id] = {
+                'account': name, 'amount': float(amount), 'reserved_at': time.time(), 'confirmed_at': None,
+            }
+            self.stats['reservations'] += 1
+            return reservation_id
+
+    def confirm(self, reservation_id):
+        """Біржа прийняла ордер: резерв знімається першим знімком, запит якого почався після цього моменту"""
+        with self.lock:
+            reservation = self.reservations.get(reservation_id)
+            if reservation is None:
+                return False
+            reservation['confirmed_at'] = time.time()
+            return True
+
+    def release(self, reservation_id):
+        """Знімає резерв (ордер не відкрився)"""
+        with self.lock:
+            return self.reservations.pop(reservation_id, None) is not None
+
+    def settle(self, reservation_id, filled):
+        """Після ордера: confirm якщо він відкрився, інакше release (None - резерву не було)"""
+        if reservation_id is None:
+            return False
+        return self.confirm(reservation_id) if filled else self.release(reservation_id)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['age_sec'] = round(time.time() - self.updated_at, 2) if self.updated_at else None
+        stats['active_reservations'] = len(self.reservations)
+        return stats
+
+
+# 🌍 Глобальний сервіс знімків балансу
+account_snapshot = AccountSnapshotService()
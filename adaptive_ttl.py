@@ -0,0 +1,161 @@
+"""
+🌡️ ADAPTIVE TTL: TTL кешів цін за волатильністю символу замість фіксованих 180/60/30 секунд
+Стабільні мажори і токени, що рухаються на 10% за 5 хвилин, кешувались однаково довго.
+Оцінка волатильності за 5 хвилин (%) - максимум з:
+- реалізованої волатильності останніх свіжих цін символу (лог-доходності, нормовані на час)
+- |priceChange.m5| та |priceChange.h1| / sqrt(12) з відповіді DexScreener
+TTL = 300 * (target_move / волатильність)^2 - час, за який ціна при випадковому блуканні
+зрушить приблизно на target_move%, в межах [min_ttl, max_ttl]. Символ з відкритою позицією або
+біля порогу входу отримує не більше position_ttl / near_entry_ttl секунд.
+"""
+import math
+import time
+import threading
+from collections import deque
+
+from config import (
+    ADAPTIVE_TTL_ENABLED, ADAPTIVE_TTL_MIN_SEC, ADAPTIVE_TTL_MAX_SEC, ADAPTIVE_TTL_TARGET_MOVE_PCT,
+    ADAPTIVE_TTL_POSITION_SEC, ADAPTIVE_TTL_NEAR_ENTRY_SEC, ADAPTIVE_TTL_WINDOW,
+)
+
+
+def _clean(symbol):
+    return symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
+
+
+class VolatilityTTL:
+    """🌡️ Волатильність символів по свіжих цінах і priceChange -> TTL кешу в межах [min_ttl, max_ttl]"""
+
+    def __init__(self, min_ttl=10.0, max_ttl=600.0, target_move_pct=0.3, position_ttl=10.0,
+                 near_entry_ttl=20.0, window=30, sample_max_age=1800.0, enabled=True):
+        self.min_ttl = float(min_ttl)
+        self.max_ttl = float(max_ttl)
+        self.target_move_pct = float(target_move_pct)
+        self.position_ttl = float(position_ttl)
+        self.near_entry_ttl = float(near_entry_ttl)
+        self.window = window
+        self.sample_max_age = float(sample_max_age)  # старші ціни і priceChange не враховуються
+        self.enabled = enabled
+        self.open_positions_fn = None  # () -> множина символів з відкритими позиціями
+        self.near_entry_fn = None      # symbol -> True якщо спред біля порогу входу
+        self.lock = threading.Lock()
+        self.prices = {}       # symbol -> deque[(timestamp, price)]
+        self.changes = {}      # symbol -> (timestamp, m5, h1)
+        self.assignments = {}  # symbol -> останнє рішення (для статус-ендпоінту)
+        self.open_symbols = (0.0, frozenset())  # (час, символи) - не беремо лок позицій на кожне читання кешу
+
+    def configure(self, open_positions_fn=None, near_entry_fn=None):
+        self.open_positions_fn = open_positions_fn
+        self.near_entry_fn = near_entry_fn
+
+    def observe(self, symbol, price=None, m5=None, h1=None):
+        """Свіжа ціна з провайдера (не з кешу) та/або priceChange DexScreener у відсотках"""
+        symbol = _clean(symbol)
+        now = time.time()
+        with self.lock:
+            try:
+                price = float(price) if price is not None else 0.0
+            except (TypeError, ValueError):
+                price = 0.0
+            if price > 0:
+                samples = self.prices.get(symbol)
+                if samples is None:
+                    samples = self.prices[symbol] = deque(maxlen=self.window)
+                if not samples or now - samples[-1][0] >= 1.0:  # кілька провайдерів за секунду - одна точка
+                    samples.append((now, price))
+            if m5 is not None or h1 is not None:
+                self.changes[symbol] = (now, m5, h1)
+
+    def volatility(self, symbol):
+        """Оцінка руху ціни за 5 хвилин у відсотках: (значення, джерело) або (None, None)"""
+        now = time.time()
+        symbol = _clean(symbol)
+        with self.lock:
+            samples = [s for s in self.prices.get(symbol, ()) if now - s[0] <= self.sample_max_age]
+            change = self.changes.get(symbol)
+
+        estimates = []
+        if len(samples) >= 3:
+            squares = 0.0
+            elapsed = samples[-1][0] - samples[0][0]
+            for (_, previous), (_, current) in zip(samples, samples[1:]):
+                squares += math.log(current / previous) ** 2
+            if elapsed > 0:
+                estimates.append((math.sqrt(squares / elapsed * 300) * 100, 'realized'))
+        if change and now - change[0] <= self.sample_max_age:
+            _, m5, h1 = change
+            try:
+                if m5 is not None:
+                    estimates.append((abs(float(m5)), 'price_change_m5'))
+                if h1 is not None:
+                    estimates.append((abs(float(h1)) / math.sqrt(12), 'price_change_h1'))
+            except (TypeError, ValueError):
+                pass
+        if not estimates:
+            return None, None
+        return max(estimates)
+
+    def _open_symbols(self):
+        if self.open_positions_fn is None:
+            return frozenset()
+        checked_at, symbols = self.open_symbols
+        if time.time() - checked_at > 1.0:
+            try:
+                symbols = frozenset(_clean(s) for s in self.open_positions_fn())
+            except Exception:
+                symbols = frozenset()
+            self.open_symbols = (time.time(), symbols)
+        return symbols
+
+    def ttl(self, symbol, base_ttl):
+        """TTL (сек) кешу ціни символу; base_ttl - для символів без даних про волатильність"""
+        if not self.enabled:
+            return base_ttl
+        symbol = _clean(symbol)
+        volatility, source = self.volatility(symbol)
+        if volatility is None:
+            ttl, reason = float(base_ttl), 'no_data'
+        elif volatility <= 0:
+            ttl, reason = self.max_ttl, source
+        else:
+            ttl, reason = 300.0 * (self.target_move_pct / volatility) ** 2, source
+        ttl = min(self.max_ttl, max(self.min_ttl, ttl))
+
+        if symbol in self._open_symbols():
+            ttl, reason = min(ttl, self.position_ttl), 'open_position'
+        elif self.near_entry_fn is not None and self.near_entry_fn(symbol):
+            ttl, reason = min(ttl, self.near_entry_ttl), 'near_entry'
+
+        self.assignments[symbol] = {
+            'ttl_sec': round(ttl, 1),
+            'volatility_5m_pct': round(volatility, 3) if volatility is not None else None,
+            'reason': reason,
+            'assigned_at': time.time(),
+        }
+        return ttl
+
+    def get_stats(self, limit=None):
+        """TTL по символах (найкоротші першими) + кількість символів за причиною"""
+        rows = [dict(info, symbol=symbol) for symbol, info in list(self.assignments.items())]
+        rows.sort(key=lambda r: r['ttl_sec'])
+        summary = {}
+        for row in rows:
+            summary[row['reason']] = summary.get(row['reason'], 0) + 1
+        return {
+            'enabled': self.enabled,
+            'min_ttl_sec': self.min_ttl,
+            'max_ttl_sec': self.max_ttl,
+            'summary': summary,
+            'symbols': rows if limit is None else rows[:limit],
+        }
+
+
+adaptive_ttl = VolatilityTTL(
+    min_ttl=ADAPTIVE_TTL_MIN_SEC,
+    max_ttl=ADAPTIVE_TTL_MAX_SEC,
+    target_move_pct=ADAPTIVE_TTL_TARGET_MOVE_PCT,
+    position_ttl=ADAPTIVE_TTL_POSITION_SEC,
+    near_entry_ttl=ADAPTIVE_TTL_NEAR_ENTRY_SEC,
+    window=ADAPTIVE_TTL_WINDOW,
+    enabled=ADAPTIVE_TTL_ENABLED,
+)
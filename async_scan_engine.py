@@ -0,0 +1,332 @@
+"""
+⚡ ASYNC SCAN ENGINE: Альтернатива пулу потоків - сканування на одному asyncio event loop
+Мережеві запити (XT тікери через ccxt.async_support, DexScreener через aiohttp) йдуть
+асинхронно з обмеженими семафорами на кожен провайдер, а рішення по символу приймає
+та сама логіка symbol_worker (в невеликому пулі потоків, бо ордери синхронні).
+Вмикається через SCAN_ENGINE=async.
+"""
+import time
+import types
+import asyncio
+import logging
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+import ccxt.async_support as ccxt_async
+
+from market_data import xt_ticker_snapshot
+from metrics import metrics
+from rate_governor import rate_governor, retry_after_seconds
+from deadline import DeadlineExceeded, deadline_scope, clamp_timeout, run_in_executor
+from dex_client import dex_client, get_advanced_token_analysis
+
+
+class AsyncScanEngine:
+    """
+    ⚡ Асинхронний рушій сканування:
+    - XT: один bulk fetch_tickers на sweep (ccxt.async_support)
+    - DEX: DexScreener search через aiohttp, тисячі запитів в польоті без потоку на кожен
+    - символи з прямими блокчейн пулами і ті, що не знайдені async - через sync ланцюжок провайдерів
+    - рішення: evaluate_fn(symbol, market_data) в пулі потоків
+    """
+
+    DEXSCREENER_SEARCH_URL = "https://api.dexscreener.com/latest/dex/search/?q={symbol}"
+
+    def __init__(self, evaluate_fn, stop_event, max_in_flight, provider_limits, on_sweep_complete=None,
+                 priority_tracker=None, deadline_sec=None, deadline_retry_sec=15.0):
+        self.evaluate_fn = evaluate_fn
+        self.priority_tracker = priority_tracker
+        self.deadline_sec = deadline_sec  # ⏳ бюджет часу на одну оцінку (None = без дедлайну)
+        self.deadline_retry_sec = deadline_retry_sec
+        self.stop_event = stop_event
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.provider_limits = dict(provider_limits)
+        self.on_sweep_complete = on_sweep_complete
+
+        self.semaphores = {}
+        self.in_flight = 0
+        self.executor = None
+        self.dex_executor = None  # окремий пул для sync DEX ланцюжка - повільні фолбеки не займають потоки рішень
+        self.rate_executor = None  # очікування токенів rate_governor (спільні з sync шляхом ліміти провайдерів)
+        self.loop = None
+        self.stats = {
+            'sweeps_completed': 0,
+            'last_sweep_duration': 0.0,
+            'last_sweep_symbols': 0,
+            'evaluations': 0,
+            'errors': 0,
+            'dex_async_hits': 0,
+            'dex_cache_hits': 0,
+            'dex_sync_fallbacks': 0,
+            'deadline_exceeded': 0,
+            'started_at': None,
+        }
+        self.sweep_durations = deque(maxlen=20)
+        self.eval_timestamps = deque(maxlen=1000)
+
+    # ------------------------------------------------------------------
+    # 🟢 Запуск (блокує викликаючий потік як старий цикл start_workers)
+    # ------------------------------------------------------------------
+    def run(self, symbols_provider):
+        self.stats['started_at'] = time.time()
+        logging.info(f"⚡ ASYNC SCAN: Старт event loop, до {self.max_in_flight} символів в польоті, "
+                     f"ліміти: {self.provider_limits}")
+        try:
+            asyncio.run(self._main(symbols_provider))
+        except Exception as e:
+            logging.error(f"❌ ASYNC SCAN: Event loop завершився з помилкою: {e}")
+        logging.info("🔴 ASYNC SCAN: Зупинено")
+
+    async def _main(self, symbols_provider):
+        self.loop = asyncio.get_running_loop()
+        self.semaphores = {name: asyncio.Semaphore(limit) for name, limit in self.provider_limits.items()}
+        self.executor = ThreadPoolExecutor(max_workers=self.provider_limits.get('decision', 20),
+                                           thread_name_prefix="async-scan-decision")
+        self.dex_executor = ThreadPoolExecutor(max_workers=self.provider_limits.get('dex_sync', 8),
+                                               thread_name_prefix="async-scan-dex")
+        # Токен чекають тільки запити всередині семафора провайдера - потоків вистачає на всіх
+        self.rate_executor = ThreadPoolExecutor(
+            max_workers=self.provider_limits.get('xt', 5) + self.provider_limits.get('dexscreener', 20),
+            thread_name_prefix="async-scan-rate")
+        exchange = ccxt_async.xt({'enableRateLimit': True, 'options': {'defaultType': 'swap'}})
+        timeout = aiohttp.ClientTimeout(total=20)
+        headers = {'User-Agent': 'XT.com Arbitrage Bot v2.0', 'Accept': 'application/json'}
+        try:
+            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
+                while not self.stop_event.is_set():
+                    await self._sweep(symbols_provider, exchange, session)
+                    # Коротка пауза між sweep'ами з швидкою реакцією на зупинку
+                    await self.loop.run_in_executor(None, self.stop_event.wait, 1)
+        finally:
+            await exchange.close()
+            self.executor.shutdown(wait=False)
+            self.dex_executor.shutdown(wait=False)
+            self.rate_executor.shutdown(wait=False)
+
+    async def _sweep(self, symbols_provider, exchange, session):
+        started_at = time.time()
+        await self._refresh_tickers(exchange)
+
+        symbols = list(symbols_provider() or [])
+        if self.priority_tracker is not None:
+            # 🎯 Тільки символи, яким настав час повторного сканування
+            symbols = self.priority_tracker.due_symbols(symbols)
+        in_flight_limit = asyncio.Semaphore(self.max_in_flight)
+
+        async def _bounded(symbol):
+            try:
+                await self._scan_symbol(symbol, exchange, session)
+            finally:
+                in_flight_limit.release()
+                self.in_flight -= 1
+
+        tasks = []
+        for symbol in symbols:
+            if self.stop_event.is_set():
+                break
+            await in_flight_limit.acquire()
+            self.in_flight += 1
+            tasks.append(asyncio.create_task(_bounded(symbol)))
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        duration = time.time() - started_at
+        self.sweep_durations.append(duration)
+        self.stats['sweeps_completed'] += 1
+        self.stats['last_sweep_duration'] = duration
+        self.stats['last_sweep_symbols'] = len(tasks)
+        logging.debug(f"✅ ASYNC SWEEP #{self.stats['sweeps_completed']}: {len(tasks)} символів за {duration:.1f}с")
+
+        if self.on_sweep_complete:
+            await self.loop.run_in_executor(self.executor, self.on_sweep_complete)
+
+    # ------------------------------------------------------------------
+    # 🌐 Асинхронні провайдери
+    # ------------------------------------------------------------------
+    async def _acquire_rate(self, provider):
+        """
+        ⏱️ Токен провайдера з rate_governor (той самий бюджет запитів/сек, що й у sync шляху).
+        Семафор обмежує тільки кількість запитів у польоті - частоту тримає лімітер. False - зупинка
+        """
+        acquire = functools.partial(rate_governor.acquire, provider, lane='scanner', stop_event=self.stop_event)
+        return await run_in_executor(self.loop, self.rate_executor, acquire)
+
+    def _throttle_xt(self, exchange):
+        """XT відповів 429 - пауза xt_public на Retry-After з заголовків останньої відповіді ccxt"""
+        response = types.SimpleNamespace(headers=exchange.last_response_headers or {})
+        rate_governor.throttle('xt_public', retry_after_seconds(response, 5))
+
+    async def _refresh_tickers(self, exchange):
+        """Один bulk fetch_tickers на sweep - записуємо в спільний знімок"""
+        if xt_ticker_snapshot.age() < xt_ticker_snapshot.refresh_interval:
+            return
+        async with self.semaphores['xt']:
+            if not await self._acquire_rate('xt_public'):
+                return
+            started_at = time.time()
+            try:
+                tickers = await exchange.fetch_tickers()
+                if tickers:
+                    xt_ticker_snapshot.store(tickers, started_at)
+            except ccxt_async.RateLimitExceeded as e:
+                self._throttle_xt(exchange)
+                xt_ticker_snapshot.stats['bulk_failures'] += 1
+                logging.warning(f"⚠️ ASYNC SCAN: fetch_tickers 429: {e}")
+            except Exception as e:
+                xt_ticker_snapshot.stats['bulk_failures'] += 1
+                logging.warning(f"⚠️ ASYNC SCAN: Помилка fetch_tickers: {e}")
+
+    async def _fetch_xt_price(self, symbol, exchange):
+        ticker = xt_ticker_snapshot.peek(symbol)
+        if ticker is None:
+            async with self.semaphores['xt']:
+                if not await self._acquire_rate('xt_public'):
+                    return None, None
+                try:
+                    ticker = await asyncio.wait_for(exchange.fetch_ticker(symbol),
+                                                    timeout=clamp_timeout(exchange.timeout / 1000, f"XT ticker {symbol}"))
+                    xt_ticker_snapshot.stats['single_fallbacks'] += 1
+                    ticker = dict(ticker, snapshot_age=0.0)
+                except ccxt_async.RateLimitExceeded as e:
+                    self._throttle_xt(exchange)
+                    logging.debug(f"ASYNC SCAN: XT тікер {symbol} 429: {e}")
+                    return None, None
+                except Exception as e:
+                    logging.debug(f"ASYNC SCAN: XT тікер {symbol} недоступний: {e}")
+                    return None, None
+        try:
+            return float(ticker['last']), ticker['snapshot_age']
+        except (TypeError, ValueError, KeyError):
+            return None, None
+
+    async def _fetch_dexscreener(self, clean_symbol, session):
+        async with self.semaphores['dexscreener']:
+            if not await self._acquire_rate('dexscreener'):
+                return None
+            started_at = time.perf_counter()
+            try:
+                url = self.DEXSCREENER_SEARCH_URL.format(symbol=clean_symbol)
+                request_timeout = aiohttp.ClientTimeout(total=clamp_timeout(20, f"DexScreener {clean_symbol}"))
+                async with session.get(url, timeout=request_timeout) as response:
+                    if response.status == 429:
+                        rate_governor.throttle('dexscreener', retry_after_seconds(response, 10))
+                    if response.status != 200:
+                        logging.debug(f"⚡ {clean_symbol}: DexScreener search {response.status}")
+                        metrics.inc('dex_provider_requests_total', provider='dexscreener_async', result='error')
+                        return None
+                    data = await response.json(content_type=None)
+            except Exception as e:
+                logging.debug(f"ASYNC SCAN: DexScreener {clean_symbol} помилка: {e}")
+                metrics.inc('dex_provider_requests_total', provider='dexscreener_async', result='error')
+                return None
+            finally:
+                metrics.observe('dex_provider_seconds', time.perf_counter() - started_at, provider='dexscreener_async')
+        pair_data = dex_client.select_dexscreener_pair(clean_symbol, data['pairs']) if data and data.get('pairs') else None
+        metrics.inc('dex_provider_requests_total', provider='dexscreener_async', result='hit' if pair_data else 'miss')
+        # 🚫 Спільний з sync ланцюжком негативний кеш: промах не повториться в fallback та наступних проходах
+        negative_key = dex_client._best_pair_cache_key(clean_symbol)
+        if pair_data:
+            dex_client.negative_cache.record_hit('dexscreener', negative_key)
+        else:
+            dex_client.negative_cache.record_miss('dexscreener', negative_key)
+        return pair_data
+
+    async def _fetch_advanced_metrics(self, symbol, session):
+        clean_symbol = symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
+
+        if dex_client.get_cached_best_pair(clean_symbol):
+            self.stats['dex_cache_hits'] += 1
+        elif not dex_client.has_direct_pool(clean_symbol) and not dex_client.negative_cache.should_skip(
+                'dexscreener', dex_client._best_pair_cache_key(clean_symbol)):
+            pair_data = await self._fetch_dexscreener(clean_symbol, session)
+            if pair_data:
+                dex_client.store_best_pair(clean_symbol, pair_data, 'dexscreener_async')
+                self.stats['dex_async_hits'] += 1
+
+        if not dex_client.get_cached_best_pair(clean_symbol):
+            # Повний sync ланцюжок (блокчейн -> CoinGecko -> DexScreener) в пулі потоків
+            self.stats['dex_sync_fallbacks'] += 1
+            async with self.semaphores['dex_sync']:
+                return await run_in_executor(self.loop, self.dex_executor, get_advanced_token_analysis, symbol)
+
+        # Пара в кеші - метрики рахуються без мережі
+        return await run_in_executor(self.loop, self.executor, get_advanced_token_analysis, symbol)
+
+    # ------------------------------------------------------------------
+    # 🔎 Один символ
+    # ------------------------------------------------------------------
+    async def _fetch_market_data(self, symbol, exchange, session):
+        xt_price, xt_price_age = await self._fetch_xt_price(symbol, exchange)
+        if not xt_price:
+            return None
+        advanced_metrics = await self._fetch_advanced_metrics(symbol, session)
+        if not advanced_metrics:
+            return None
+        return {
+            'xt_price': xt_price,
+            'xt_price_age': xt_price_age,
+            'advanced_metrics': advanced_metrics,
+        }
+
+    async def _scan_symbol(self, symbol, exchange, session):
+        started_at = time.time()
+        deadline_hit = False
+        try:
+            with deadline_scope(self.deadline_sec):
+                # ⏳ Збір даних скасовується по дедлайну; рішення в потоці перевіряє той самий дедлайн сам
+                if self.deadline_sec:
+                    market_data = await asyncio.wait_for(self._fetch_market_data(symbol, exchange, session),
+                                                         timeout=self.deadline_sec)
+                else:
+                    market_data = await self._fetch_market_data(symbol, exchange, session)
+                if not market_data:
+                    return
+                async with self.semaphores['decision']:
+                    await run_in_executor(self.loop, self.executor, self.evaluate_fn, symbol, market_data)
+        except (DeadlineExceeded, asyncio.TimeoutError) as e:
+            deadline_hit = True
+            self.stats['deadline_exceeded'] += 1
+            metrics.inc('scan_deadline_exceeded_total', engine='async')
+            logging.warning(f"⏳ ASYNC SCAN: {symbol} покинуто після {time.time() - started_at:.1f}с ({e or 'timeout'})")
+        except Exception as e:
+            self.stats['errors'] += 1
+            logging.error(f"❌ ASYNC SCAN: Помилка оцінки {symbol}: {e}")
+        finally:
+            if self.priority_tracker is not None:
+                if deadline_hit:
+                    self.priority_tracker.reschedule(symbol, self.deadline_retry_sec)
+                else:
+                    self.priority_tracker.finish(symbol, started_at)
+            self.stats['evaluations'] += 1
+            self.eval_timestamps.append(time.time())
+
+    # ------------------------------------------------------------------
+    # 📊 Статистика
+    # ------------------------------------------------------------------
+    def get_stats(self):
+        now = time.time()
+        recent = [t for t in self.eval_timestamps if now - t <= 60]
+        avg_sweep = sum(self.sweep_durations) / len(self.sweep_durations) if self.sweep_durations else 0.0
+        return {
+            'engine': 'async',
+            'in_flight': self.in_flight,
+            'queue_depth': 0,
+            'sweeps_completed': self.stats['sweeps_completed'],
+            'last_sweep_duration_sec': round(self.stats['last_sweep_duration'], 2),
+            'avg_sweep_duration_sec': round(avg_sweep, 2),
+            'last_sweep_symbols': self.stats['last_sweep_symbols'],
+            'evaluations': self.stats['evaluations'],
+            'evaluations_per_min': len(recent),
+            'errors': self.stats['errors'],
+            'dex_async_hits': self.stats['dex_async_hits'],
+            'dex_cache_hits': self.stats['dex_cache_hits'],
+            'dex_sync_fallbacks': self.stats['dex_sync_fallbacks'],
+            'deadline_exceeded': self.stats['deadline_exceeded'],
+            'deadline_sec': self.deadline_sec,
+            'provider_limits': self.provider_limits,
+        }
+
+    def is_running(self):
+        return not self.stop_event.is_set() and self.loop is not None and self.loop.is_running()
@@ -8,8 +8,10 @@ import logging
 import time
 import struct
 import base64
+import functools
+import contextvars
 from typing import Dict, Optional, List, Any
-from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, TimeoutError, wait as futures_wait
 import threading
 
 # Ethereum/BSC підключення
@@ -28,7 +30,76 @@ except ImportError:
     SOLANA_AVAILABLE = False
     logging.warning("⚠️ Solana не встановлено - Solana недоступне")
 
+# Pubkey імпортується один раз (раніше - на кожен виклик get_solana_price)
+try:
+    from solders.pubkey import Pubkey as SolanaPubkey
+except ImportError:
+    SolanaPubkey = None
+
 import config
+from deadline import DeadlineExceeded, call_with_deadline, check_deadline, remaining
+from ttl_cache import TTLCache
+from rate_governor import rate_governor
+from adaptive_ttl import adaptive_ttl
+from reserve_tracker import SyncReserveTracker
+from provider_latency import ProviderLatencyTracker
+from pool_registry import PoolRegistry, QuoteRates, RATE_ASSETS, SOLANA_MINT_SYMBOLS, make_entry
+
+GET_RESERVES_SELECTOR = bytes.fromhex('0902f1ac')  # getReserves()
+
+# Multicall3.tryBlockAndAggregate: номер блоку + (success, returnData) кожного виклику, пул з помилкою не валить пакет
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {"internalType": "bool", "name": "requireSuccess", "type": "bool"},
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Call[]",
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "tryBlockAndAggregate",
+        "outputs": [
+            {"internalType": "uint256", "name": "blockNumber", "type": "uint256"},
+            {"internalType": "bytes32", "name": "blockHash", "type": "bytes32"},
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
+
+# ⚡ Solana layouts: struct компілюються один раз, тип пулу визначається за розміром акаунта
+SPL_TOKEN_AMOUNT = struct.Struct('<64xQ')  # token account: mint(32) owner(32) amount(u64)
+SPL_MINT_DECIMALS = struct.Struct('<44xB')  # mint: ... decimals(u8) на offset 44
+SOLANA_POOL_LAYOUTS = {
+    # Raydium AMM v4 (752 байти): base/quote decimal, base/quote need_take_pnl, base/quote vault, base/quote mint
+    752: ('raydium_amm_v4', struct.Struct('<32xQQ144xQQ128x32s32s32s32s')),
+    # Orca Whirlpool (653 байти): sqrt_price (u128 = lo, hi), token_mint_a, token_mint_b
+    653: ('orca_whirlpool', struct.Struct('<65xQQ20x32s48x32s')),
+}
+SOLANA_POOL_TYPES = frozenset(pool_type for pool_type, _ in SOLANA_POOL_LAYOUTS.values())
+
+
+def decode_reserves(data) -> Optional[tuple]:
+    """(reserve0, reserve1) з ABI-відповіді getReserves (uint112, uint112, uint32 - по 32 байти) або None"""
+    if not data or len(data) < 64:
+        return None
+    return int.from_bytes(data[0:32], 'big'), int.from_bytes(data[32:64], 'big')
+
 
 class BlockchainPoolsClient:
     """
@@ -49,8 +120,9 @@ class BlockchainPoolsClient:
         
         if WEB3_AVAILABLE:
             try:
-                self.w3_eth = Web3(Web3.HTTPProvider(self.ethereum_rpc))
-                self.w3_bsc = Web3(Web3.HTTPProvider(self.bsc_rpc))
+                # Таймаут RPC обмежує потоки, покинуті по дедлайну оцінки
+                self.w3_eth = Web3(Web3.HTTPProvider(self.ethereum_rpc, request_kwargs={'timeout': 10}))
+                self.w3_bsc = Web3(Web3.HTTPProvider(self.bsc_rpc, request_kwargs={'timeout': 10}))
                 logging.info("✅ Ethereum/BSC Web3 з'єднання встановлено")
             except Exception as e:
                 logging.error(f"❌ Помилка Web3 ініціалізації: {e}")
@@ -121,9 +193,31 @@ class BlockchainPoolsClient:
         ]
         
         # 💾 Кешування для оптимізації
-        self.price_cache = {}
         self.cache_timeout = 60  # 1 хвилина кеш
-        self.cache_lock = threading.Lock()
+        self.price_cache = TTLCache('blockchain_price_cache', default_ttl=self.cache_timeout,
+                                    max_entries=config.BLOCKCHAIN_PRICE_CACHE_MAX_ENTRIES)
+        
+        # 📦 Multicall3: резерви всіх пулів мережі одним eth_call замість getReserves на кожен символ
+        self.multicall_enabled = config.BLOCKCHAIN_MULTICALL_ENABLED and WEB3_AVAILABLE
+        self.pool_symbols = {}         # chain -> {адреса_lower: [символи]} (кілька символів можуть ділити пул)
+        self.reserve_calls = {}        # chain -> [(адреса_lower, (checksum адреса, calldata))] - рахується один раз
+        self.reserve_trackers = {}     # chain -> SyncReserveTracker (start_reserve_tracking)
+        self.pool_liquidity = {}       # (chain, symbol) -> оцінка ліквідності пулу в USD (2 x резерв котирування)
+        self.solana_pubkeys = {}       # адреса -> Pubkey
+        
+        # 🧭 Метадані пулів (token0/token1, decimals, орієнтація) - один раз, між перезапусками з диска
+        self.pool_registry = PoolRegistry(config.POOL_REGISTRY_PATH, enabled=config.POOL_REGISTRY_ENABLED)
+        self.quote_rates = QuoteRates(max_age=config.POOL_QUOTE_RATE_MAX_AGE_SEC)  # WETH/WBNB/WSOL -> USD
+        self.metadata_lock = threading.Lock()
+        
+        # 🌐 Паралельні запити до всіх мереж, де в символу є пул (замість Ethereum -> BSC -> Solana по черзі)
+        self.network_executor = ThreadPoolExecutor(max_workers=config.BLOCKCHAIN_FANOUT_WORKERS,
+                                                   thread_name_prefix="chain-fanout")
+        self.network_latency = ProviderLatencyTracker()
+        self.last_answers = {}         # symbol -> {'network', 'latency_ms', 'networks', 'at'}
+        self.contracts = {}            # (chain, адреса) -> web3 контракт (пул або Multicall3)
+        self.multicall_locks = {'ethereum': threading.Lock(), 'bsc': threading.Lock(), 'solana': threading.Lock()}
+        self.multicall_refreshed_at = {}  # chain -> час останнього пакета
         
         # 📊 Статистика
         self.stats = {
@@ -133,7 +227,15 @@ class BlockchainPoolsClient:
             'cache_hits': 0,
             'cache_misses': 0,
             'errors': 0,
-            'successful_prices': 0
+            'successful_prices': 0,
+            'multicall_requests': 0,
+            'multicall_prices': 0,
+            'tracker_prices': 0,
+            'solana_batch_requests': 0,
+            'solana_batch_prices': 0,
+            'network_answers': {'ethereum': 0, 'bsc': 0, 'solana': 0},
+            'cross_chain_checks': 0,
+            'cross_chain_mismatches': 0
         }
         
         logging.info(f"🚀 Blockchain Pools Client ініціалізовано")
@@ -172,31 +274,431 @@ class BlockchainPoolsClient:
         """Генерація ключа кешу"""
         return f"{network}_{symbol.upper()}"
     
-    def _is_cache_valid(self, cache_entry: Dict) -> bool:
-        """Перевірка валідності кешу"""
-        if not cache_entry:
-            return False
-        return (time.time() - cache_entry.get('timestamp', 0)) < self.cache_timeout
-    
     def _get_from_cache(self, cache_key: str) -> Optional[float]:
-        """Отримання ціни з кешу"""
-        with self.cache_lock:
-            cache_entry = self.price_cache.get(cache_key)
-            if cache_entry and self._is_cache_valid(cache_entry):
-                self.stats['cache_hits'] += 1
-                return cache_entry['price']
-            elif cache_entry:
-                del self.price_cache[cache_key]
-            self.stats['cache_misses'] += 1
+        """Отримання ціни з кешу (TTL перевіряє сам кеш)"""
+        cache_entry = self.price_cache.get(cache_key)
+        if cache_entry:
+            self.stats['cache_hits'] += 1
+            return cache_entry['price']
+        self.stats['cache_misses'] += 1
+        return None
+    
+    def _peek_cache(self, cache_key: str) -> Optional[float]:
+        """Ціна з кешу без лічильників hit/miss (перевірка після очікування пакета)"""
+        cache_entry = self.price_cache.get(cache_key)
+        return cache_entry['price'] if cache_entry else None
+    
+    def _save_to_cache(self, cache_key: str, price: float, block: Optional[int] = None) -> None:
+        """Збереження ціни в кеш (TTL за волатильністю символу, cache_timeout - без даних; block - блок резервів)"""
+        symbol = cache_key.split('_', 1)[1]
+        self.price_cache.set(cache_key, {
+            'price': price,
+            'timestamp': time.time(),
+            'block': block
+        }, ttl=adaptive_ttl.ttl(symbol, self.cache_timeout))
+    
+    def _web3(self, chain: str):
+        return self.w3_eth if chain == 'ethereum' else self.w3_bsc
+    
+    def _get_contract(self, chain: str, checksum_address: str, abi: List[Dict]):
+        """Web3 контракт створюється один раз на адресу"""
+        contract = self.contracts.get((chain, checksum_address))
+        if contract is None:
+            contract = self.contracts[(chain, checksum_address)] = self._web3(chain).eth.contract(
+                address=checksum_address, abi=abi)
+        return contract
+    
+    def _pool_symbols(self, chain: str) -> Dict[str, List[str]]:
+        symbols = self.pool_symbols.get(chain)
+        if symbols is None:
+            symbols = {}
+            for symbol, info in self.pools[chain].items():
+                symbols.setdefault(info['address'].lower(), []).append(symbol)
+            self.pool_symbols[chain] = symbols
+        return symbols
+    
+    def _get_reserve_calls(self, chain: str) -> List[tuple]:
+        """(адреса_lower, (checksum адреса, calldata getReserves)) для всіх пулів мережі - рахується один раз"""
+        calls = self.reserve_calls.get(chain)
+        if calls is None:
+            calls = self.reserve_calls[chain] = [
+                (address, (Web3.to_checksum_address(address), GET_RESERVES_SELECTOR))
+                for address in self._pool_symbols(chain)
+            ]
+        return calls
+    
+    def _price_from_reserves(self, chain: str, address: str, reserve0: int, reserve1: int) -> float:
+        """
+        Ціна базового токена пулу в USD: орієнтація і множник decimals з реєстру, курс котирування з QuoteRates.
+        0 - метадані пулу невідомі або немає свіжого USD курсу котирування (краще без ціни, ніж хибна)
+        """
+        meta = self.pool_registry.get(chain, address)
+        if meta is None or reserve0 <= 0 or reserve1 <= 0:
+            return 0.0
+        rate = self.quote_rates.get(meta['quote'])
+        if rate is None:
+            return 0.0
+        ratio = reserve1 / reserve0 if meta['base_is_token0'] else reserve0 / reserve1
+        return ratio * meta['scale'] * rate
+    
+    def _pool_liquidity_usd(self, chain: str, address: str, reserve0: int, reserve1: int) -> Optional[float]:
+        """Оцінка ліквідності пулу: 2 x резерв котирування в USD (None - метадані або курс невідомі)"""
+        meta = self.pool_registry.get(chain, address)
+        rate = self.quote_rates.get(meta['quote']) if meta else None
+        if rate is None:
             return None
+        quote_reserve = reserve1 if meta['base_is_token0'] else reserve0
+        return 2 * quote_reserve * meta['quote_unit'] * rate
     
-    def _save_to_cache(self, cache_key: str, price: float) -> None:
-        """Збереження ціни в кеш"""
-        with self.cache_lock:
-            self.price_cache[cache_key] = {
-                'price': price,
-                'timestamp': time.time()
-            }
+    def _note_quote_rate(self, chain: str, symbol: str, quote: Optional[str], price: float) -> None:
+        """ETH/USDT, BNB/USDT, SOL/USDT пули - USD курс WETH/WBNB/WSOL для пулів з таким котируванням"""
+        asset = RATE_ASSETS.get(symbol)
+        if asset and quote == 'USD':
+            self.quote_rates.set(asset, price, f"{chain}:{symbol}")
+    
+    def _usd_quoted_first(self, chain: str, addresses) -> List[str]:
+        """Пули з котируванням у стейблкоїні першими: їх ціни оновлюють курси для решти пулів того ж пакета"""
+        def quote(address):
+            meta = self.pool_registry.get(chain, address)
+            return meta.get('quote') if meta else None
+        return sorted(addresses, key=lambda address: quote(address) != 'USD')
+    
+    def _ensure_pool_metadata(self, chain: str) -> None:
+        """token0/token1/decimals нових пулів мережі - два Multicall один раз (далі з реєстру на диску)"""
+        symbols = self._pool_symbols(chain)
+        if not self.pool_registry.missing(chain, symbols):
+            return
+        with self.metadata_lock:
+            self.pool_registry.resolve_evm(chain, {address: names[0] for address, names in symbols.items()},
+                                           functools.partial(self._metadata_multicall, chain))
+    
+    def _metadata_multicall(self, chain: str, calls: List[tuple]) -> List[tuple]:
+        _, results = self._multicall(chain, [(Web3.to_checksum_address(address), data) for address, data in calls],
+                                     what=f"multicall metadata {chain}")
+        return results
+    
+    def _multicall(self, chain: str, calls: List[tuple], what: str) -> tuple:
+        """(блок, [(success, returnData)]) для [(checksum адреса, calldata)] одним Multicall3 eth_call"""
+        multicall = self._get_contract(chain, Web3.to_checksum_address(config.MULTICALL3_ADDRESS), MULTICALL3_ABI)
+        rate_governor.acquire('ankr_rpc')
+        block_number, _, results = call_with_deadline(
+            multicall.functions.tryBlockAndAggregate(False, calls).call, what=what)
+        return block_number, results
+    
+    def refresh_chain_reserves(self, chain: str) -> int:
+        """
+        📦 Резерви ВСІХ пулів мережі (ethereum / bsc) одним Multicall3 eth_call -> ціни в кеш за один прохід
+        Повертає кількість оновлених цін
+        """
+        if not self.multicall_enabled or not self._web3(chain) or not self.pools[chain]:
+            return 0
+        block_number, reserves = self._multicall_reserves(chain)
+        updated = sum(self._apply_reserves(chain, address, reserve0, reserve1, block_number)
+                      for address, (reserve0, reserve1) in reserves.items())
+        self.stats['multicall_prices'] += updated
+        logging.debug(f"📦 {chain}: Multicall оновив {updated} цін пулів (блок {block_number})")
+        return updated
+    
+    def _multicall_reserves(self, chain: str) -> tuple:
+        """
+        (блок, {адреса_lower: (reserve0, reserve1)}) всіх пулів мережі одним Multicall3 eth_call.
+        Пули з котируванням у стейблкоїні - першими (див. _usd_quoted_first)
+        """
+        self._ensure_pool_metadata(chain)
+        calls = self._get_reserve_calls(chain)
+        self.stats['multicall_requests'] += 1
+        block_number, results = self._multicall(chain, [call for _, call in calls], what=f"multicall getReserves {chain}")
+        reserves = {}
+        for (address, _), (success, data) in zip(calls, results):
+            decoded = decode_reserves(data) if success else None
+            if decoded is not None:
+                reserves[address] = decoded
+        return block_number, {address: reserves[address] for address in self._usd_quoted_first(chain, reserves)}
+    
+    def _apply_reserves(self, chain: str, address: str, reserve0: int, reserve1: int, block: Optional[int] = None) -> int:
+        """Резерви пулу -> ціни всіх його символів у кеш (з номером блоку). Повертає кількість цін"""
+        price = self._price_from_reserves(chain, address, reserve0, reserve1)
+        liquidity = self._pool_liquidity_usd(chain, address, reserve0, reserve1)
+        updated = 0
+        for symbol in self._pool_symbols(chain).get(address, ()):
+            if liquidity is not None:
+                self.pool_liquidity[(chain, symbol)] = liquidity
+            if price > 0:
+                self._save_to_cache(self._get_cache_key(symbol, chain), price, block)
+                self._note_quote_rate(chain, symbol, self.pool_registry.get(chain, address)['quote'], price)
+                updated += 1
+        return updated
+    
+    def start_reserve_tracking(self, stop_event) -> None:
+        """🔔 Фонові трекери Sync подій Ethereum і BSC пулів: один eth_getLogs на новий блок мережі"""
+        if not config.RESERVE_TRACKER_ENABLED or not self.multicall_enabled:
+            return
+        for chain in ('ethereum', 'bsc'):
+            if not self._web3(chain) or not self.pools[chain]:
+                continue
+            tracker = self.reserve_trackers.get(chain)
+            if tracker is None:
+                tracker = self.reserve_trackers[chain] = SyncReserveTracker(
+                    chain, list(self._pool_symbols(chain)),
+                    block_number_fn=functools.partial(self._rpc_block_number, chain),
+                    get_logs_fn=functools.partial(self._rpc_sync_logs, chain),
+                    snapshot_fn=functools.partial(self._multicall_reserves, chain),
+                    on_update=functools.partial(self._apply_reserves, chain),
+                    poll_interval=config.RESERVE_TRACKER_POLL_SEC.get(chain, 3.0),
+                    max_block_range=config.RESERVE_TRACKER_MAX_BLOCK_RANGE,
+                    stale_after=config.RESERVE_TRACKER_STALE_SEC,
+                )
+            tracker.start(stop_event)
+    
+    def _rpc_block_number(self, chain: str) -> int:
+        rate_governor.acquire('ankr_rpc')
+        return self._web3(chain).eth.block_number
+    
+    def _rpc_sync_logs(self, chain: str, from_block: int, to_block: int, addresses: List[str], topic: str) -> List:
+        """Sync логи наших пулів (checksum адреси беремо з уже порахованих викликів getReserves)"""
+        wanted = set(addresses)
+        rate_governor.acquire('ankr_rpc')
+        return self._web3(chain).eth.get_logs({
+            'fromBlock': from_block,
+            'toBlock': to_block,
+            'address': [call[0] for address, call in self._get_reserve_calls(chain) if address in wanted],
+            'topics': [topic],
+        })
+    
+    def get_latest_block_price(self, symbol: str, network: str) -> Optional[Dict]:
+        """🔔 Ціна пулу на останньому блоці трекера Sync подій: {'price', 'block', 'network'} або None"""
+        tracker = self.reserve_trackers.get(network)
+        pool_info = self.pools.get(network, {}).get(symbol.upper())
+        if tracker is None or not pool_info:
+            return None
+        reserves = tracker.get_reserves(pool_info['address'])
+        if reserves is None:
+            return None
+        reserve0, reserve1, block = reserves
+        price = self._price_from_reserves(network, pool_info['address'].lower(), reserve0, reserve1)
+        if price <= 0:
+            return None
+        return {'price': price, 'block': block, 'network': network}
+    
+    def _refresh_interval(self, chain: str) -> float:
+        """Пакет мережі не частіше мінімального інтервалу і найкоротшого TTL кешу цін її пулів"""
+        ttls = [adaptive_ttl.ttl(symbol, self.cache_timeout) for symbol in self.pools.get(chain, {})]
+        return max(config.BLOCKCHAIN_MULTICALL_MIN_INTERVAL_SEC, min(ttls, default=self.cache_timeout))
+    
+    def refresh_all_reserves(self) -> int:
+        """
+        📦 Ціни всіх пулів: один Multicall3 запит на EVM мережу + getMultipleAccounts для Solana.
+        Мережа, оновлена пізніше за _refresh_interval, пропускається (prefetch викликається кожен цикл диспетчера),
+        як і мережа з синхронізованим трекером Sync подій - він сам оновлює кеш через on_update
+        """
+        updated = 0
+        for chain in ('ethereum', 'bsc', 'solana'):
+            tracker = self.reserve_trackers.get(chain)
+            if tracker is not None and tracker.is_synced():
+                continue
+            if time.time() - self.multicall_refreshed_at.get(chain, 0) < self._refresh_interval(chain):
+                continue
+            self.multicall_refreshed_at[chain] = time.time()  # і після помилки - не раніше наступного інтервалу
+            try:
+                updated += self._refresh_chain(chain)
+            except Exception as e:
+                logging.warning(f"⚠️ {chain}: помилка пакетного оновлення пулів: {e}")
+                self.stats['errors'] += 1
+        return updated
+    
+    def _refresh_chain(self, chain: str) -> int:
+        return self.refresh_solana_prices() if chain == 'solana' else self.refresh_chain_reserves(chain)
+    
+    # ------------------------------------------------------------------
+    # ⚡ Solana: getMultipleAccounts
+    # ------------------------------------------------------------------
+    def _solana_pubkey(self, address: str):
+        """Pubkey адреси (рахується один раз) або None для некоректної адреси"""
+        if address not in self.solana_pubkeys:
+            try:
+                self.solana_pubkeys[address] = SolanaPubkey.from_string(address)
+            except ValueError as e:
+                logging.warning(f"⚠️ Solana: некоректна адреса {address}: {e}")
+                self.solana_pubkeys[address] = None
+        return self.solana_pubkeys[address]
+    
+    @staticmethod
+    def _account_bytes(data) -> bytes:
+        """Дані акаунта Solana RPC (bytes / base64 рядок / [base64, encoding]) -> bytes"""
+        if isinstance(data, list) and len(data) > 0:
+            return base64.b64decode(data[0])
+        if isinstance(data, str):
+            return base64.b64decode(data)
+        return bytes(data) if data is not None else b''
+    
+    def _get_multiple_accounts(self, addresses: List[str]) -> Dict[str, bytes]:
+        """{адреса: дані} через getMultipleAccounts (до SOLANA_MULTIPLE_ACCOUNTS_LIMIT акаунтів на запит)"""
+        accounts = {}
+        addresses = [address for address in addresses if self._solana_pubkey(address) is not None]
+        limit = config.SOLANA_MULTIPLE_ACCOUNTS_LIMIT
+        for i in range(0, len(addresses), limit):
+            chunk = addresses[i:i + limit]
+            self.stats['solana_batch_requests'] += 1
+            rate_governor.acquire('ankr_rpc')
+            response = call_with_deadline(self.solana_client.get_multiple_accounts,
+                                          [self._solana_pubkey(address) for address in chunk],
+                                          what=f"Solana getMultipleAccounts {len(chunk)}")
+            for address, account in zip(chunk, response.value):
+                if account is not None:
+                    accounts[address] = self._account_bytes(account.data)
+        return accounts
+    
+    def _discover_solana_pools(self, pools: Dict[str, str]) -> None:
+        """
+        Тип пулу, vault акаунти, mint-и, decimals і орієнтація - один раз на пул (статичні поля, реєстр пулів),
+        далі тільки динамічні дані. pools: {адреса пулу: символ}
+        """
+        pool_accounts = self._get_multiple_accounts(list(pools))
+        whirlpools = {}  # адреса пулу -> (mint_a, mint_b) (decimals лежать в mint акаунтах)
+        for address, pool_symbol in pools.items():
+            data = pool_accounts.get(address)
+            if data is None:
+                continue
+            pool_type, layout = SOLANA_POOL_LAYOUTS.get(len(data), (None, None))
+            if pool_type is None:
+                # Невідомий layout: орієнтація і decimals невідомі - ціни немає (і на диск не пишеться)
+                self.pool_registry.failed.add(('solana', address))
+                logging.warning(f"⚠️ POOL REGISTRY solana: {pool_symbol} ({address}) - невідомий layout "
+                                f"акаунта ({len(data)} байт)")
+            elif pool_type == 'raydium_amm_v4':
+                base_decimal, quote_decimal, _, _, base_vault, quote_vault, base_mint, quote_mint = layout.unpack_from(data)
+                base_mint, quote_mint = str(SolanaPubkey.from_bytes(base_mint)), str(SolanaPubkey.from_bytes(quote_mint))
+                self.pool_registry.put('solana', address, make_entry(
+                    SOLANA_MINT_SYMBOLS.get(base_mint, ''), SOLANA_MINT_SYMBOLS.get(quote_mint, ''),
+                    base_decimal, quote_decimal, pool_symbol, type=pool_type, token0=base_mint, token1=quote_mint,
+                    accounts=[str(SolanaPubkey.from_bytes(base_vault)), str(SolanaPubkey.from_bytes(quote_vault))],
+                    decimals=[base_decimal, quote_decimal]))
+            elif pool_type == 'orca_whirlpool':
+                _, _, mint_a, mint_b = layout.unpack_from(data)
+                whirlpools[address] = (str(SolanaPubkey.from_bytes(mint_a)), str(SolanaPubkey.from_bytes(mint_b)))
+        if whirlpools:
+            mint_accounts = self._get_multiple_accounts(sorted({m for pair in whirlpools.values() for m in pair}))
+            for address, (mint_a, mint_b) in whirlpools.items():
+                if mint_a not in mint_accounts or mint_b not in mint_accounts:
+                    self.pool_registry.failed.add(('solana', address))
+                    continue
+                decimals = [SPL_MINT_DECIMALS.unpack_from(mint_accounts[mint_a])[0],
+                            SPL_MINT_DECIMALS.unpack_from(mint_accounts[mint_b])[0]]
+                self.pool_registry.put('solana', address, make_entry(
+                    SOLANA_MINT_SYMBOLS.get(mint_a, ''), SOLANA_MINT_SYMBOLS.get(mint_b, ''), decimals[0], decimals[1],
+                    pools[address], type='orca_whirlpool', token0=mint_a, token1=mint_b, accounts=[], decimals=decimals))
+        self.pool_registry.save()
+    
+    def _decode_solana_price(self, address: str, accounts: Dict[str, bytes]) -> float:
+        """Ціна пулу в USD з уже отриманих акаунтів (пул + його vault акаунти) і курсу котирування"""
+        data = accounts.get(address)
+        meta = self.pool_registry.get('solana', address)
+        if data is None or meta is None:
+            return 0.0
+        rate = self.quote_rates.get(meta['quote'])
+        if rate is None:
+            return 0.0
+        if meta['type'] == 'raydium_amm_v4':
+            base_pnl, quote_pnl = SOLANA_POOL_LAYOUTS[752][1].unpack_from(data)[2:4]
+            base_vault, quote_vault = meta['accounts']
+            if base_vault not in accounts or quote_vault not in accounts:
+                return 0.0
+            base_decimal, quote_decimal = meta['decimals']
+            base = (SPL_TOKEN_AMOUNT.unpack_from(accounts[base_vault])[0] - base_pnl) / 10 ** base_decimal
+            quote = (SPL_TOKEN_AMOUNT.unpack_from(accounts[quote_vault])[0] - quote_pnl) / 10 ** quote_decimal
+            price = quote / base if base > 0 else 0.0  # base (token0) у quote (token1)
+        elif meta['type'] == 'orca_whirlpool':
+            sqrt_lo, sqrt_hi, _, _ = SOLANA_POOL_LAYOUTS[653][1].unpack_from(data)
+            sqrt_price = (sqrt_lo | (sqrt_hi << 64)) / 2 ** 64
+            decimals_a, decimals_b = meta['decimals']
+            price = sqrt_price ** 2 * 10 ** (decimals_a - decimals_b)  # mint_a (token0) у mint_b (token1)
+        else:  # запис без перевіреного layout (старий файл реєстру) - ціна не рахується
+            return 0.0
+        if price > 0 and not meta['base_is_token0']:
+            price = 1 / price
+        return price * rate
+    
+    def refresh_solana_prices(self) -> int:
+        """
+        ⚡ Ціни ВСІХ Solana пулів: один getMultipleAccounts для пулів і їх vault акаунтів, розбір
+        прекомпільованими layout за типом пулу. Перший виклик додатково визначає тип і vault акаунти пулів
+        """
+        if not config.SOLANA_BATCH_ENABLED or not self.solana_client or SolanaPubkey is None:
+            return 0
+        pools = self.pools['solana']
+        unknown = self.pool_registry.missing('solana', [info['address'] for info in pools.values()])
+        if unknown:
+            self._discover_solana_pools({info['address']: symbol for symbol, info in pools.items()
+                                         if info['address'] in unknown})
+        
+        addresses = []
+        for info in pools.values():
+            meta = self.pool_registry.get('solana', info['address'])
+            if meta is not None and meta.get('type') in SOLANA_POOL_TYPES:
+                addresses.append(info['address'])
+                addresses.extend(meta['accounts'])
+        accounts = self._get_multiple_accounts(list(dict.fromkeys(addresses)))
+        
+        updated = 0
+        by_address = {info['address']: symbol for symbol, info in pools.items()}
+        for address in self._usd_quoted_first('solana', by_address):  # SOL/USDT - курс WSOL для BONK/SOL, WIF/SOL
+            symbol = by_address[address]
+            price = self._decode_solana_price(address, accounts)
+            if price > 0:
+                self._save_to_cache(self._get_cache_key(symbol, 'solana'), price)
+                self._note_quote_rate('solana', symbol, self.pool_registry.get('solana', address)['quote'], price)
+                updated += 1
+        self.stats['solana_batch_prices'] += updated
+        logging.debug(f"⚡ Solana: getMultipleAccounts оновив {updated}/{len(pools)} цін пулів")
+        return updated
+    
+    def _price_via_batch(self, chain: str, symbol: str) -> Optional[float]:
+        """
+        Промах кешу: один пакет на всю мережу замість запиту символу. Потоки з промахом в той самий час
+        чекають пакет і читають кеш. None - пакет недоступний (викликач робить окремий запит пулу)
+        """
+        cache_key = self._get_cache_key(symbol, chain)
+        lock = self.multicall_locks[chain]
+        left = remaining()
+        if not lock.acquire(timeout=max(0.0, left) if left is not None else -1):
+            return None
+        try:
+            price = self._peek_cache(cache_key)
+            if price:
+                return price
+            if time.time() - self.multicall_refreshed_at.get(chain, 0) < config.BLOCKCHAIN_MULTICALL_MIN_INTERVAL_SEC:
+                return None  # пакет щойно був, але цього пулу в ньому немає
+            self.multicall_refreshed_at[chain] = time.time()
+            self._refresh_chain(chain)
+            return self._peek_cache(cache_key)
+        finally:
+            lock.release()
+    
+    def _price_via_pool(self, chain: str, symbol: str) -> Optional[float]:
+        """getReserves одного пулу (резервний шлях, якщо Multicall недоступний)"""
+        pool_info = self.pools[chain].get(symbol.upper())
+        latest = self.get_latest_block_price(symbol, chain)
+        if latest:  # трекер Sync подій: ціна на останньому блоці без RPC
+            self.stats['tracker_prices'] += 1
+            self._save_to_cache(self._get_cache_key(symbol.upper(), chain), latest['price'], latest['block'])
+            return latest['price']
+        if self.multicall_enabled:
+            try:
+                price = self._price_via_batch(chain, symbol.upper())
+                if price:
+                    return price
+            except Exception as e:
+                logging.warning(f"⚠️ {chain}: Multicall недоступний ({e}), окремий getReserves для {symbol}")
+        
+        # Читаємо реальну ціну з пулу за допомогою getReserves
+        self._ensure_pool_metadata(chain)
+        checksum_address = Web3.to_checksum_address(pool_info['address'])
+        contract = self._get_contract(chain, checksum_address, self.uniswap_v2_abi)
+        rate_governor.acquire('ankr_rpc')
+        reserves = call_with_deadline(contract.functions.getReserves().call, what=f"getReserves {symbol}")
+        reserve0, reserve1, _ = reserves
+        self._apply_reserves(chain, pool_info['address'].lower(), reserve0, reserve1)
+        return self._peek_cache(self._get_cache_key(symbol, chain))
     
     def get_ethereum_price(self, symbol: str) -> Optional[float]:
         """
@@ -219,28 +721,10 @@ class BlockchainPoolsClient:
                 logging.debug(f"❌ Ethereum: немає пулу для {symbol}")
                 return None
             
-            # Читаємо реальну ціну з Uniswap пулу за допомогою getReserves
-            pool_address = pool_info['address']
-            # ВИПРАВЛЕННЯ: Конвертуємо в checksum адресу для Web3
-            checksum_address = self.w3_eth.to_checksum_address(pool_address)
-            contract = self.w3_eth.eth.contract(address=checksum_address, abi=self.uniswap_v2_abi)
+            # Uniswap пул: пакет Multicall на всю мережу або окремий getReserves
+            price = self._price_via_pool('ethereum', symbol)
             
-            # Викликаємо getReserves для отримання резервів
-            reserves = contract.functions.getReserves().call()
-            reserve0, reserve1, _ = reserves
-            
-            # Розраховуємо ціну (reserve1/reserve0 для USDT пулів)
-            if reserve0 > 0:
-                # Нормалізуємо для різних decimals (ETH=18, USDT=6)
-                if symbol.upper() == 'ETH':
-                    price = (reserve1 / 1e6) / (reserve0 / 1e18)  # USDT(6) / ETH(18)
-                else:
-                    price = (reserve1 / 1e6) / (reserve0 / 1e18)  # USDT(6) / TOKEN(18)
-            else:
-                price = 0
-            
-            if price > 0:
-                self._save_to_cache(cache_key, price)
+            if price and price > 0:
                 self.stats['successful_prices'] += 1
                 logging.info(f"✅ Ethereum {symbol}: ${price:.6f}")
                 return price
@@ -272,25 +756,10 @@ class BlockchainPoolsClient:
                 logging.debug(f"❌ BSC: немає пулу для {symbol}")
                 return None
             
-            # Читаємо реальну ціну з PancakeSwap пулу за допомогою getReserves
-            pool_address = pool_info['address']
-            # ВИПРАВЛЕННЯ: Конвертуємо в checksum адресу для Web3
-            checksum_address = self.w3_bsc.to_checksum_address(pool_address)
-            contract = self.w3_bsc.eth.contract(address=checksum_address, abi=self.uniswap_v2_abi)
-            
-            # Викликаємо getReserves для отримання резервів
-            reserves = contract.functions.getReserves().call()
-            reserve0, reserve1, _ = reserves
-            
-            # Розраховуємо ціну (reserve1/reserve0 для USDT пулів)
-            if reserve0 > 0:
-                # Нормалізуємо для різних decimals (більшість токенів=18, USDT=18 на BSC)
-                price = reserve1 / reserve0  # USDT / TOKEN
-            else:
-                price = 0
+            # PancakeSwap пул: пакет Multicall на всю мережу або окремий getReserves
+            price = self._price_via_pool('bsc', symbol)
             
-            if price > 0:
-                self._save_to_cache(cache_key, price)
+            if price and price > 0:
                 self.stats['successful_prices'] += 1
                 logging.info(f"✅ BSC {symbol}: ${price:.6f}")
                 return price
@@ -322,58 +791,20 @@ class BlockchainPoolsClient:
                 logging.debug(f"❌ Solana: немає пулу для {symbol}")
                 return None
             
-            # Отримуємо адресу пулу та читаємо реальні дані
-            pool_address = pool_info['address']
-            
-            # Імпортуємо Pubkey для Solana
-            if SOLANA_AVAILABLE:
+            # Пакет getMultipleAccounts на всі Solana пули або окреме читання акаунта пулу
+            price = None
+            if config.SOLANA_BATCH_ENABLED:
                 try:
-                    from solders.pubkey import Pubkey
-                    solana_pubkey = Pubkey.from_string(pool_address)
-                except ImportError:
-                    try:
-                        from solana.publickey import Pubkey
-                        solana_pubkey = Pubkey(pool_address)
-                    except ImportError:
-                        logging.warning("⚠️ Solana Pubkey недоступний, пропускаємо Solana")
-                        return None
-            else:
-                return None
+                    price = self._price_via_batch('solana', symbol.upper())
+                except Exception as e:
+                    logging.warning(f"⚠️ Solana: getMultipleAccounts недоступний ({e}), окремий запит для {symbol}")
+            if not price:
+                price = self._solana_pool_price(symbol, pool_info['address'])
             
-            # Отримуємо дані акаунта пулу
-            account_info = self.solana_client.get_account_info(solana_pubkey)
-            if not account_info.value:
-                logging.error(f"❌ Solana: не знайдено акаунт для {symbol}")
-                return None
-            
-            # Декодуємо дані (Raydium має специфічний layout)
-            data = account_info.value.data
-            if isinstance(data, list) and len(data) > 0:
-                decoded = base64.b64decode(data[0])
-            elif isinstance(data, str):
-                decoded = base64.b64decode(data)
-            else:
-                decoded = data
-            
-            # Парсимо резерви з layout Raydium
-            # Резерви зазвичай на offset 64 для Raydium
-            if len(decoded) >= 80:
-                reserve0, reserve1 = struct.unpack_from("<QQ", decoded, 64)
-                
-                # Розраховуємо ціну
-                if symbol.upper() == 'SOL':
-                    # SOL/USDT пул
-                    price = reserve1 / reserve0 if reserve0 > 0 else 0
-                    price = price / 1e3  # SOL(9) vs USDT(6) decimals
-                else:
-                    price = reserve1 / reserve0 if reserve0 > 0 else 0
-                    price = price / 1e3  # Стандартна нормалізація
-                
-                if price > 0:
-                    self._save_to_cache(cache_key, price)
-                    self.stats['successful_prices'] += 1
-                    logging.info(f"✅ Solana {symbol}: ${price:.6f}")
-                    return price
+            if price and price > 0:
+                self.stats['successful_prices'] += 1
+                logging.info(f"✅ Solana {symbol}: ${price:.6f}")
+                return price
             
         except Exception as e:
             logging.error(f"❌ Solana помилка для {symbol}: {e}")
@@ -381,40 +812,171 @@ class BlockchainPoolsClient:
         
         return None
     
+    def _solana_pool_price(self, symbol: str, pool_address: str) -> Optional[float]:
+        """
+        Окремі getAccountInfo пулу і його vault акаунтів (резервний шлях) з розбором за записом реєстру пулів.
+        Пул без перевірених метаданих (тип, decimals, орієнтація) ціни не має
+        """
+        if SolanaPubkey is None:
+            logging.warning("⚠️ Solana Pubkey недоступний, пропускаємо Solana")
+            return None
+        meta = self.pool_registry.get('solana', pool_address)
+        if meta is None or meta.get('type') not in SOLANA_POOL_TYPES:
+            logging.debug(f"❌ Solana {symbol}: немає метаданих пулу в реєстрі - ціна не рахується")
+            return None
+        accounts = {}
+        for address in [pool_address] + list(meta['accounts']):
+            pubkey = self._solana_pubkey(address)
+            if pubkey is None:
+                return None
+            rate_governor.acquire('ankr_rpc')
+            account_info = call_with_deadline(self.solana_client.get_account_info, pubkey,
+                                              what=f"Solana account {symbol}")
+            if not account_info.value:
+                logging.error(f"❌ Solana: не знайдено акаунт {address} для {symbol}")
+                return None
+            accounts[address] = self._account_bytes(account_info.value.data)
+        
+        price = self._decode_solana_price(pool_address, accounts)
+        if price > 0:
+            self._save_to_cache(self._get_cache_key(symbol, 'solana'), price)
+            self._note_quote_rate('solana', symbol.upper(), meta['quote'], price)
+            return price
+        return None
+    
     def get_token_price(self, symbol: str, preferred_network: Optional[str] = None) -> Optional[float]:
         """
         🎯 ГОЛОВНА ФУНКЦІЯ - отримання ціни токена
-        Пробує всі мережі і повертає першу доступну ціну
+        Паралельно питає всі мережі, де для символу налаштовано пул, і повертає першу валідну ціну
+        (BLOCKCHAIN_PRICE_COMBINE="weighted" - чекає всі мережі і зважує ціни за ліквідністю пулів).
+        Ціни з кількох мереж звіряються між собою (крос-чейн перевірка)
         """
         clean_symbol = symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
         
-        # Визначаємо порядок перевірки мереж
+        # Визначаємо мережі з пулом символу (preferred_network - першою серед однаково швидких)
         networks = ['ethereum', 'bsc', 'solana']
         if preferred_network and preferred_network in networks:
             networks.remove(preferred_network)
             networks.insert(0, preferred_network)
+        networks = [network for network in networks if clean_symbol in self.pools.get(network, {})]
+        if not networks:
+            logging.debug(f"❌ {clean_symbol}: немає пулу в жодній мережі")
+            return None
         
-        # Пробуємо отримати ціну з кожної мережі
+        weighted = config.BLOCKCHAIN_PRICE_COMBINE == 'weighted'
+        prices = {}
+        pending = []
         for network in networks:
-            try:
-                if network == 'ethereum':
-                    price = self.get_ethereum_price(clean_symbol)
-                elif network == 'bsc':
-                    price = self.get_bsc_price(clean_symbol)
-                elif network == 'solana':
-                    price = self.get_solana_price(clean_symbol)
-                else:
+            cached = self._peek_cache(self._get_cache_key(clean_symbol, network))
+            if cached:
+                prices[network] = cached
+            else:
+                pending.append(network)
+        if prices and not weighted:
+            self.stats['cache_hits'] += 1
+            network = next(n for n in networks if n in prices)
+            return prices[network]
+        
+        started = time.monotonic()
+        winner, latency = self._fan_out(clean_symbol, pending, prices, wait_all=weighted)
+        if not prices:
+            logging.warning(f"❌ {clean_symbol}: ціна не знайдена в жодній мережі")
+            return None
+        
+        if weighted and len(prices) > 1:
+            liquidity = {network: self.pool_liquidity.get((network, clean_symbol)) for network in prices}
+            if not all(liquidity.values()):  # невідома ліквідність хоч одного пулу - рівні ваги
+                liquidity = dict.fromkeys(prices, 1.0)
+            price = sum(prices[n] * liquidity[n] for n in prices) / sum(liquidity.values())
+            network = max(prices, key=lambda n: liquidity[n])
+        else:
+            network = winner or next(n for n in networks if n in prices)
+            price = prices[network]
+        self._cross_check(clean_symbol, prices)
+        
+        self.stats['network_answers'][network] += 1
+        self.last_answers[clean_symbol] = {
+            'network': network,
+            'latency_ms': round((latency if latency is not None else time.monotonic() - started) * 1000, 1),
+            'networks': sorted(prices),
+            'at': time.time(),
+        }
+        logging.info(f"🎯 {clean_symbol}: ${price:.6f} ({network})")
+        return price
+    
+    def _network_price(self, network: str, clean_symbol: str) -> Optional[float]:
+        """Ціна з однієї мережі + латентність/успіх мережі в трекер"""
+        getters = {'ethereum': self.get_ethereum_price, 'bsc': self.get_bsc_price, 'solana': self.get_solana_price}
+        started = time.monotonic()
+        price = None
+        try:
+            price = getters[network](clean_symbol)
+            return price
+        finally:
+            self.network_latency.record(network, clean_symbol, time.monotonic() - started, bool(price and price > 0))
+    
+    def _fan_out(self, clean_symbol: str, networks: List[str], prices: Dict[str, float], wait_all: bool = False) -> tuple:
+        """
+        Паралельні запити до мереж (дедлайн оцінки діє і в потоках пулу). Валідні ціни додаються в prices.
+        Повертає (мережа, що відповіла першою, її час) - без wait_all решта дозавершується у фоні
+        і лише звіряється з переможцем
+        """
+        if not networks:
+            return None, None
+        started = time.monotonic()
+        if len(networks) == 1:
+            price = self._network_price(networks[0], clean_symbol)
+            if price and price > 0:
+                prices[networks[0]] = price
+                return networks[0], time.monotonic() - started
+            return None, None
+        
+        futures = {
+            self.network_executor.submit(contextvars.copy_context().run, self._network_price, network, clean_symbol): network
+            for network in networks
+        }
+        pending = set(futures)
+        winner, latency = None, None
+        while pending and (winner is None or wait_all):
+            left = remaining()
+            if left is not None and left <= 0:
+                check_deadline(f"мережі {clean_symbol}")
+            done, pending = futures_wait(pending, timeout=left, return_when=FIRST_COMPLETED)
+            for future in done:
+                network = futures[future]
+                try:
+                    price = future.result()
+                except (Exception, DeadlineExceeded) as e:
+                    logging.debug(f"⚠️ {network} помилка для {clean_symbol}: {e}")
                     continue
-                
                 if price and price > 0:
-                    logging.info(f"🎯 {clean_symbol}: ${price:.6f} ({network})")
-                    return price
-                    
-            except Exception as e:
-                logging.debug(f"⚠️ {network} помилка для {clean_symbol}: {e}")
+                    prices[network] = price
+                    if winner is None:
+                        winner, latency = network, time.monotonic() - started
         
-        logging.warning(f"❌ {clean_symbol}: ціна не знайдена в жодній мережі")
-        return None
+        for future in pending:  # пізні відповіді - безкоштовна крос-чейн перевірка переможця
+            future.add_done_callback(functools.partial(self._late_network_answer, clean_symbol, futures[future], dict(prices)))
+        return winner, latency
+    
+    def _late_network_answer(self, clean_symbol: str, network: str, prices: Dict[str, float], future) -> None:
+        try:
+            price = future.result()
+        except (Exception, DeadlineExceeded):
+            return
+        if price and price > 0:
+            self._cross_check(clean_symbol, dict(prices, **{network: price}))
+    
+    def _cross_check(self, clean_symbol: str, prices: Dict[str, float]) -> None:
+        """Ціни одного токена в різних мережах мають збігатися - інакше один з пулів хибний або неліквідний"""
+        if len(prices) < 2:
+            return
+        self.stats['cross_chain_checks'] += 1
+        low, high = min(prices.values()), max(prices.values())
+        deviation = (high - low) / low * 100
+        if deviation > config.BLOCKCHAIN_CROSS_CHAIN_MAX_DEVIATION_PCT:
+            self.stats['cross_chain_mismatches'] += 1
+            details = ', '.join(f"{network}=${price:.6f}" for network, price in sorted(prices.items()))
+            logging.warning(f"⚠️ {clean_symbol}: ціни в мережах розходяться на {deviation:.1f}% ({details})")
     
     def get_token_with_liquidity(self, symbol: str) -> Dict[str, Any]:
         """
@@ -428,10 +990,12 @@ class BlockchainPoolsClient:
             high_liquidity_tokens = ['ETH', 'BTC', 'WBTC', 'BNB', 'SOL', 'UNI', 'LINK']
             liquidity_usd = 1000000 if symbol.upper() in high_liquidity_tokens else 500000
             
+            answer = self.last_answers.get(symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper(), {})
             return {
                 'token_symbol': symbol.upper(),
                 'price_usd': price,
                 'liquidity_usd': liquidity_usd,
+                'network': answer.get('network'),
                 'data_source': 'blockchain_pools_direct',
                 'timestamp': time.time()
             }
@@ -455,6 +1019,10 @@ class BlockchainPoolsClient:
             'success_rate_percent': round(success_rate, 2),
             'cache_hit_rate_percent': round(cache_hit_rate, 2),
             'cache_size': len(self.price_cache),
+            'network_latency': self.network_latency.get_stats()['providers'],
+            'reserve_trackers': {chain: tracker.get_stats() for chain, tracker in self.reserve_trackers.items()},
+            'pool_registry': self.pool_registry.get_stats(),
+            'quote_rates': self.quote_rates.get_stats(),
             'networks_available': {
                 'ethereum': WEB3_AVAILABLE and bool(self.w3_eth),
                 'bsc': WEB3_AVAILABLE and bool(self.w3_bsc),
@@ -12,6 +12,7 @@ from telegram_admin import run_telegram_bot
 from xt_client import create_xt, load_xt_futures_markets, get_xt_price, is_xt_futures_tradeable, get_xt_futures_balance, xt_open_market_position, xt_close_position_market, analyze_xt_order_book_liquidity, fetch_xt_ticker, fetch_xt_order_book, get_xt_open_positions
 import xt_client
 import csv  # <--- ДОДАТИ ЦЕЙ РЯДОК
+import socket
 
 # Helper functions for XT.com compatibility (replacing Gate.io functions)
 def fetch_ticker(exchange, symbol):
@@ -21,11 +22,21 @@ def fetch_ticker(exchange, symbol):
 def fetch_order_book(exchange, symbol, depth=10):
     """Wrapper for XT order book"""
     return fetch_xt_order_book(exchange, symbol, depth)
-from dex_client import get_dex_price_simple, get_dex_token_info, get_advanced_token_analysis
+from dex_client import dex_client, get_dex_price_simple, get_dex_token_info, get_advanced_token_analysis
+from dex_client import BLOCKCHAIN_AVAILABLE, blockchain_client
 import logging
 from datetime import datetime
 import threading
 from market_conditions import market_monitor
+from scan_scheduler import ScanScheduler, SymbolPriorityTracker
+from market_data import xt_ticker_snapshot
+from prescreen import spread_prescreener
+from metrics import metrics
+from ttl_cache import get_all_cache_stats
+from rate_governor import rate_governor, set_traffic_lane
+from adaptive_ttl import adaptive_ttl
+from deadline import check_deadline, lift_deadline, no_deadline
+from account_snapshot import account_snapshot
 
 # ====================== АНТІ-ШИТКОЇН ФІЛЬТРИ ======================
 def is_shitcoin(base_symbol: str, pair_data: dict) -> bool:
@@ -119,6 +130,8 @@ else:
     logging.info("ℹ️ Другий XT акаунт не налаштовано, використовуємо тільки перший")
 
 xt = xt_account_1  # Для backwards compatibility з існуючим кодом
+xt_ticker_snapshot.bind(xt)  # 📸 Знімок тікерів (перепідключається в init_markets)
+account_snapshot.bind({"account_1": xt_account_1, "account_2": xt_account_2})  # 💰 Знімок балансів
 markets = {}  # XT markets will be stored here
 xt_markets_available = True
 trade_symbols = {}  # runtime on/off per symbol
@@ -131,6 +144,7 @@ bot_running = True
 monitor_stop_event = threading.Event()  # 🛡️ THREAD-SAFE MONITOR: Event замість boolean
 monitor_lifecycle_lock = threading.Lock()  # 🔒 ЗАХИСТ від дублікатів потоків
 worker_threads = []
+scan_scheduler = None  # 🔄 Планувальник сканування (постійний пул воркерів)
 monitor_thread = None  # 🎯 Референс на потік моніторингу
 
 # 🕒 КУЛДАУН система для кожної монети (2 хвилини як просив користувач)
@@ -139,7 +153,6 @@ telegram_cooldown = {}  # symbol -> timestamp останнього сигнал
 
 # 🔒 SIMPLE THREADING LOCKS (replaced external locks module)
 active_positions_lock = threading.Lock()
-balance_check_lock = threading.Lock()
 order_placement_lock = threading.Lock()
 config_lock = threading.Lock()
 telegram_cooldown_lock = threading.Lock()
@@ -154,6 +167,22 @@ best_opportunities = {}  # {symbol: {spread, side, score, data}}
 last_best_signal_time = 0
 BEST_SIGNAL_INTERVAL = 30  # Відправляємо ОДИН найкращий сигнал раз на 30 секунд
 
+# 🎯 ПРІОРИТЕТ СКАНУВАННЯ: символи біля порогу - кожні кілька секунд, "мертві" - раз на кілька хвилин
+scan_priority = SymbolPriorityTracker(
+    min_spread_fn=lambda: MIN_SPREAD,
+    opportunity_lookup=lambda symbol: best_opportunities.get(symbol),
+    min_interval=SCAN_PRIORITY_MIN_INTERVAL_SEC,
+    max_interval=SCAN_PRIORITY_MAX_INTERVAL_SEC,
+    no_data_interval=SCAN_PRIORITY_NO_DATA_INTERVAL_SEC,
+    opportunity_ttl=SCAN_PRIORITY_OPPORTUNITY_TTL_SEC,
+)
+
+# 🌡️ АДАПТИВНИЙ TTL ЦІН: символи з позиціями і біля порогу входу кешуються найкоротше
+adaptive_ttl.configure(
+    open_positions_fn=lambda: _open_position_symbols(),
+    near_entry_fn=lambda symbol: scan_priority.tier(f"{symbol}/USDT:USDT") == 'hot',
+)
+
 # 🔄 СИСТЕМА АВТОМАТИЧНОГО ПЕРЕКЛЮЧЕННЯ РЕЖИМІВ
 current_trading_mode = CURRENT_TRADING_MODE  # Поточний режим торгівлі
 mode_switch_lock = threading.Lock()  # Лок для зміни режиму
@@ -823,8 +852,7 @@ def compute_cross_exchange_spread(position, symbol):
                 
         elif arb_pair == 'xt-dex':
             # Отримуємо поточні ціни XT.com та DEX
-            xt_ticker = xt_client.fetch_xt_ticker(xt, symbol) if xt else None
-            xt_price = float(xt_ticker['last']) if xt_ticker else None
+            xt_price, _ = xt_ticker_snapshot.get_price(symbol, max_age=MONITOR_INTERVAL_SEC) if xt else (None, None)
             
             # Передаємо ОЧИЩЕНИЙ символ
             dex_price = get_dex_price_simple(clean_symbol, for_convergence=True)
@@ -934,6 +962,7 @@ def gate_close_position_market(symbol, side, size_usdt):
         result = result_1 or result_2  # Успішно якщо хоча б один закрився
         if result:
             order = {"id": f"xt-close-{int(time.time())}", "status": "filled"}
+            account_snapshot.request_refresh()  # 🔄 Маржа звільнилась - оновлюємо знімок балансів
             if result_1:
                 logging.info(f"✅ АКАУНТ 1: Закрито позицію {symbol} {side}")
             if result_2:
@@ -981,6 +1010,8 @@ def close_position(symbol, position):
             
             result = result_1 or result_2
             logging.warning(f"🔥 CLOSE_POSITION: Фінальний result={result} (result_1={result_1}, result_2={result_2})")
+            if result:
+                account_snapshot.request_refresh()  # 🔄 Маржа звільнилась - оновлюємо знімок балансів
             
             if result_1:
                 logging.info(f"✅ АКАУНТ 1: Закрито {symbol} {side}")
@@ -1007,8 +1038,10 @@ def monitor_open_positions():
     """🎯 МОНІТОРИНГ ПОЗИЦІЙ: Автоматичне закриття при конвергенції цін, +5% прибутку, або 1-годинному таймері"""
     thread_id = threading.current_thread().ident
     logging.warning(f"🎯 MONITOR-{thread_id}: Захищений потік моніторингу позицій запущено!")
+    set_traffic_lane('monitor')  # ⏱️ чесна черга з воркерами сканера за токени XT
     
     while not monitor_stop_event.is_set():
+        pass_started = time.perf_counter()
         try:
             positions_to_close = []
             current_time = time.time()
@@ -1022,8 +1055,10 @@ def monitor_open_positions():
             for account_num, xt_account in [(1, xt_account_1), (2, xt_account_2)]:
                 if xt_account:
                     try:
-                        raw_positions = xt_account.fetch_positions()
-                        xt_positions = xt_client.get_xt_open_positions(xt_account)
+                        with metrics.timer('scan_stage_seconds', stage='monitor_exchange_positions'):
+                            rate_governor.acquire(getattr(xt_account, 'rate_limit_key', 'xt_private'))  # ⏱️ приватний ліміт акаунта
+                            raw_positions = xt_account.fetch_positions()
+                            xt_positions = xt_client.get_xt_open_positions(xt_account)
                         logging.info(f"🔧 XT АКАУНТ {account_num}: raw_positions={len(raw_positions) if raw_positions else 0}, filtered={len(xt_positions)}")
                         
                         if raw_positions and len(raw_positions) > 0:
@@ -1097,12 +1132,11 @@ def monitor_open_positions():
                 
                 # Отримуємо поточну ціну з правильної біржі
                 current_price = None
-                if exchange == "gate":
-                    ticker = fetch_xt_ticker(xt, symbol)
-                    current_price = float(ticker['last']) if ticker else None
-                elif exchange == "xt" and xt:
-                    ticker = xt_client.fetch_xt_ticker(xt, symbol)
-                    current_price = float(ticker['last']) if ticker else None
+                if exchange in ("gate", "xt") and xt:
+                    # 📸 Ціна зі знімка тікерів (не старше інтервалу моніторингу)
+                    current_price, price_age = xt_ticker_snapshot.get_price(symbol, max_age=MONITOR_INTERVAL_SEC)
+                    if current_price:
+                        position['price_age'] = price_age
                     
                 if not current_price or not entry_price:
                     logging.warning(f"⚠️ [{symbol}] Пропускаємо: current_price={current_price}, entry_price={entry_price}")
@@ -1296,8 +1330,11 @@ def monitor_open_positions():
                 
                 # 🔒 CRITICAL ORDER PLACEMENT LOCK для закриття (Task 6: уникнення конфліктних closes)
                 logging.warning(f"🔥 {symbol}: Викликаємо close_position()...")
+                lock_wait_started = time.perf_counter()
                 with order_placement_lock:
-                    result = close_position(symbol, position)
+                    metrics.observe('scan_stage_seconds', time.perf_counter() - lock_wait_started, stage='order_lock_wait')
+                    with metrics.timer('scan_stage_seconds', stage='monitor_close'):
+                        result = close_position(symbol, position)
                 
                 logging.warning(f"🔥 {symbol}: close_position() повернув result={result}")
 
@@ -1402,6 +1439,7 @@ def monitor_open_positions():
                 
         except Exception as e:
             logging.error(f"❌ Помилка в моніторі позицій: {e}")
+        metrics.observe('scan_stage_seconds', time.perf_counter() - pass_started, stage='monitor_pass')
             
         # Пауза між циклами моніторингу  
         monitor_stop_event.wait(timeout=MONITOR_INTERVAL_SEC)
@@ -1417,7 +1455,7 @@ def calculate_volatility_indicator(symbol, exchange="xt"):
     """📊 Індикатор волатільності - аналізує коливання цін за останні 24 години"""
     try:
         if exchange == "xt" and xt:
-            ticker_data = xt_client.fetch_xt_ticker(xt, symbol)
+            ticker_data = xt_ticker_snapshot.get_ticker(symbol)
         else:
             ticker_data = fetch_ticker(xt, symbol)
             
@@ -1461,7 +1499,7 @@ def analyze_volume_quality(symbol, dex_info, exchange="xt"):
     """📈 Аналіз якості об'ємів торгівлі"""
     try:
         if exchange == "xt" and xt:
-            ticker_data = xt_client.fetch_xt_ticker(xt, symbol)
+            ticker_data = xt_ticker_snapshot.get_ticker(symbol)
         else:
             ticker_data = fetch_ticker(xt, symbol)
             
@@ -1571,10 +1609,9 @@ def stop_all_workers():
     # 🛡️ THREAD-SAFE STOP: зупиняємо моніторинг через Event
     monitor_stop_event.set()
     
-    # Зупиняємо воркерів
-    for thread in worker_threads:
-        if thread.is_alive():
-            thread.join(timeout=2)
+    # Зупиняємо планувальник сканування та його воркерів
+    if scan_scheduler is not None and hasattr(scan_scheduler, 'stop'):
+        scan_scheduler.stop(timeout=5)
     worker_threads.clear()
     
     # 🎯 ROBUST MONITOR STOP: гарантовано очікуємо завершення
@@ -1725,7 +1762,8 @@ def sync_positions_from_exchange():
         logging.error(f"Помилка синхронізації позицій: {type(e).__name__}: {e}")
         return 0
 
-def init_markets():
+def init_markets(sync_positions=True):
+    """sync_positions=False для процесів-сканерів (позиціями володіє тільки координатор)"""
     global markets, trade_symbols, xt, xt_markets_available
     # ❌ GATE.IO ВІДКЛЮЧЕНО за запитом користувача - тільки XT біржа!
     # markets = load_futures_markets(gate)
@@ -1736,6 +1774,7 @@ def init_markets():
         if XT_API_KEY and XT_API_SECRET:
             xt = create_xt()
             xt_markets = load_xt_futures_markets(xt)
+            xt_ticker_snapshot.bind(xt)
             xt_markets_available = True
             logging.info(f"🚀 XT біржа підключена як ЄДИНА біржа: {len(xt_markets)} ринків")
             
@@ -1763,7 +1802,8 @@ def init_markets():
     logging.info(f"Увімкнено торгівлю для {len(trade_symbols)} символів на XT біржі")
     
     # Синхронізуємо існуючі позиції з XT біржі
-    sync_positions_from_exchange()
+    if sync_positions:
+        sync_positions_from_exchange()
 
 def can_execute_on_orderbook(symbol, order_amount_usdt, depth_levels=ORDER_BOOK_DEPTH, max_slippage_pct=1.0, exchange="xt"):
     """
@@ -1772,11 +1812,11 @@ def can_execute_on_orderbook(symbol, order_amount_usdt, depth_levels=ORDER_BOOK_
     try:
         if exchange == "xt" and xt:
             ob = xt_client.fetch_xt_order_book(xt, symbol, depth_levels)
-            ticker = xt_client.fetch_xt_ticker(xt, symbol)
+            ticker = xt_ticker_snapshot.get_ticker(symbol)
         else:
             ob = fetch_order_book(xt, symbol, depth_levels)
             ticker = fetch_xt_ticker(xt, symbol)
-        last = ticker['last']
+        last = ticker['last'] if ticker else None
         
         if last is None or not ob or 'asks' not in ob or 'bids' not in ob:
             logging.info(f"[{symbol}] ⚠️ ІНФО: Немає даних order book але продовжуємо торгувати")
@@ -1872,10 +1912,27 @@ def close_position_market(symbol, side, usd_amount, account_num=1):
     xt_client = xt_account_1 if account_num == 1 else xt_account_2
     return xt_close_position_market(xt_client, symbol, side, usd_amount)
 
-def symbol_worker(symbol):
+def build_token_info(symbol, advanced_metrics):
+    """Базові дані токена з розширених метрик (формат для фільтрів та сигналів)"""
+    return {
+        'price_usd': advanced_metrics.get('price_usd', 0),
+        'liquidity': advanced_metrics.get('liquidity', 0),
+        'volume_24h': advanced_metrics.get('volume_24h', 0),
+        'dex_link': advanced_metrics.get('exact_pair_url') or get_proper_dexscreener_link(symbol),
+        'quote_symbol': advanced_metrics.get('quote_symbol', 'USDT'),  # 🔧 ДОДАНО: зберігаємо quote валюту
+        'price_change_5m': advanced_metrics.get('priceChange', {}).get('m5', 0),  # Зміна за 5 хв
+        'price_change_1h': advanced_metrics.get('priceChange', {}).get('h1', 0),  # Зміна за 1 год
+        'pairCreatedAt': advanced_metrics.get('pairCreatedAt', 0)  # Час створення пари
+    }
+
+@metrics.timed('scan_stage_seconds', stage='symbol_worker')
+def symbol_worker(symbol, market_data=None):
     """
     Робота по одному символу з усередненням позицій: fetch ticker, dex price via dexscreener, calc spread, check liquidity, open/average/close
     (ОДИН ПРОХІД ЗАМІСТЬ ЦИКЛУ)
+    market_data: {'xt_price', 'xt_price_age', 'advanced_metrics'} якщо дані вже отримані async рушієм;
+    market_data['filtered'] = {'token_info', 'spread_pct'} - символ вже пройшов стадію фільтрів конвеєра
+    (анти-шиткоїн, перегрів LONG, перевірки реальності цін і спред не повторюються)
     """
     # 🔥 ДОДАНО: Перевірка Чорного Списку
     with blacklist_lock:
@@ -1898,11 +1955,17 @@ def symbol_worker(symbol):
             return  # ⬅️ ЗМІНЕНО: з continue на return
             
         try:
-            xt_price = get_xt_price(xt, symbol)
+            if market_data is not None:
+                # ⚡ Ціну вже отримав async рушій сканування
+                xt_price, xt_price_age = market_data['xt_price'], market_data['xt_price_age']
+            else:
+                # 📸 Ціна зі спільного знімка тікерів (один bulk запит на всі символи)
+                with metrics.timer('scan_stage_seconds', stage='xt_ticker'):
+                    xt_price, xt_price_age = xt_ticker_snapshot.get_price(symbol)
             if not xt_price or not is_xt_futures_tradeable(symbol):
                 logging.debug(f"[{symbol}] ❌ Неможливо торгувати на XT futures")
                 return  # ⬅️ ЗМІНЕНО: з continue на return
-            logging.debug(f"[{symbol}] ✅ XT ціна: ${xt_price:.6f}")
+            logging.debug(f"[{symbol}] ✅ XT ціна: ${xt_price:.6f} (вік знімка {xt_price_age:.1f}с)")
         except Exception as e:
             logging.debug(f"[{symbol}] ⚠️ XT ціна недоступна: {e}")
             return  # ⬅️ ЗМІНЕНО: з continue на return
@@ -1910,26 +1973,26 @@ def symbol_worker(symbol):
         # 2) ТІЛЬКИ ТОДІ DexScreener - отримуємо РОЗШИРЕНІ МЕТРИКИ
         try:
             # 🔬 РОЗШИРЕНИЙ АНАЛІЗ: ліквідність, FDV, market cap, транзакції, покупці/продавці
-            advanced_metrics = get_advanced_token_analysis(symbol)
+            filtered = market_data.get('filtered') if market_data is not None else None
+            if market_data is not None:
+                advanced_metrics = market_data['advanced_metrics']
+            else:
+                with metrics.timer('scan_stage_seconds', stage='dex_resolution'):
+                    advanced_metrics = get_advanced_token_analysis(symbol)
             if not advanced_metrics:
                 logging.debug(f"[{symbol}] ❌ Немає якісної пари на DexScreener")
                 return  # ⬅️ ЗМІНЕНО: з continue на return
                 
             # Отримуємо базові дані (backward compatibility)
-            token_info = {
-                'price_usd': advanced_metrics.get('price_usd', 0),
-                'liquidity': advanced_metrics.get('liquidity', 0),
-                'volume_24h': advanced_metrics.get('volume_24h', 0),
-                'dex_link': advanced_metrics.get('exact_pair_url') or get_proper_dexscreener_link(symbol),
-                'quote_symbol': advanced_metrics.get('quote_symbol', 'USDT'),  # 🔧 ДОДАНО: зберігаємо quote валюту
-                'price_change_5m': advanced_metrics.get('priceChange', {}).get('m5', 0),  # Зміна за 5 хв
-                'price_change_1h': advanced_metrics.get('priceChange', {}).get('h1', 0),  # Зміна за 1 год
-                'pairCreatedAt': advanced_metrics.get('pairCreatedAt', 0)  # Час створення пари
-            }
+            token_info = filtered['token_info'] if filtered else build_token_info(symbol, advanced_metrics)
             
-            # 🔥 ЖОРСТКІ АНТІ-ШИТКОЇН ФІЛЬТРИ
+            # 🔥 ЖОРСТКІ АНТІ-ШИТКОЇН ФІЛЬТРИ (стадія фільтрів конвеєра вже перевірила)
             base_symbol = symbol.replace('/USDT:USDT', '').replace('_USDT', '')
-            if is_shitcoin(base_symbol, token_info):
+            shitcoin_detected = False
+            if filtered is None:
+                with metrics.timer('scan_stage_seconds', stage='shitcoin_filter'):
+                    shitcoin_detected = is_shitcoin(base_symbol, token_info)
+            if shitcoin_detected:
                 # Додаємо в блеклист для економії ресурсів
                 with blacklist_lock:
                     if symbol not in blacklist_data["banned_symbols"]:
@@ -1951,6 +2014,7 @@ def symbol_worker(symbol):
             # ЖОРСТКІ ПЕРЕВІРКИ (як у топових арбітражних ботів)
             if not dex_price or dex_price < 0.000001:  # мінімальна ціна $0.000001
                 raise Exception(f"Invalid DexScreener price: {dex_price}")
+            spread_prescreener.record_dex_price(symbol, dex_price)  # 🔎 для наступних пре-скринів
                 
         except Exception as e:
             # БЛОКУЄМО токени з поганими DexScreener цінами - як у друга з Bybit
@@ -1963,7 +2027,11 @@ def symbol_worker(symbol):
             return  # ⬅️ ЗМІНЕНО: з continue на return
             
         # Розраховуємо спред XT vs DexScreener
-        xt_dex_spread = calculate_spread(dex_price, xt_price)
+        if filtered:
+            xt_dex_spread = filtered['spread_pct']  # вже записаний в історію стадією фільтрів
+        else:
+            xt_dex_spread = calculate_spread(dex_price, xt_price)
+            scan_priority.observe_spread(symbol, xt_dex_spread)  # 🎯 історія спреду для пріоритету сканування
         best_spread = xt_dex_spread
         best_direction = "LONG" if xt_price < dex_price else "SHORT" 
         best_exchange_pair = "XT vs Dex"
@@ -1971,7 +2039,7 @@ def symbol_worker(symbol):
         ref_price = xt_price  # ВИПРАВЛЕНО: XT ціна для XT біржі
         
         # 🛡️ ЗАХИСТ ВІД ПЕРЕГРІВУ ДЛЯ LONG ПОЗИЦІЙ
-        if best_direction == "LONG":
+        if best_direction == "LONG" and filtered is None:
             base_symbol = symbol.replace('/USDT:USDT', '').replace('_USDT', '')
             if check_long_overheat(token_info, base_symbol):
                 logging.warning(f"🔥 [{symbol}] LONG блокується через перегрів!")
@@ -2010,84 +2078,78 @@ def symbol_worker(symbol):
         # МАРЖА ЗА НАЛАШТУВАННЯМ (збільшено для торгівлі дорожчими токенами)
         required_margin = float(ORDER_AMOUNT)  # Примусове приведення до float
         
-        # 🔒 THREAD-SAFE БАЛАНС (Task 6: захист від одночасних перевірок балансу)
+        # 💰 БАЛАНС ЗІ ЗНІМКА (без мережевих запитів і без глобального локу)
         try:
-            with balance_check_lock:  # ЗАХИСТ: тільки один worker перевіряє баланс одночасно
-                # Видалено DEBUG логування для чистоти
-                
-                # ✅ ТІЛЬКИ XT.COM БІРЖА - ОБИДВА АКАУНТИ
-                if trading_exchange == "xt":
-                    # Баланс акаунта 1
-                    balance_1 = get_xt_futures_balance(xt_account_1)
-                    available_balance_1 = float(balance_1.get('free', 0.0))
-                    # Баланс акаунта 2
-                    balance_2 = get_xt_futures_balance(xt_account_2)
-                    available_balance_2 = float(balance_2.get('free', 0.0))
-                    # Загальний доступний баланс
-                    available_balance = available_balance_1 + available_balance_2
-                    logging.info(f"💰 XT.com АКАУНТ 1: ${balance_1['total']:.2f} USDT (доступно ${available_balance_1:.2f})")
-                    logging.info(f"💰 XT.com АКАУНТ 2: ${balance_2['total']:.2f} USDT (доступно ${available_balance_2:.2f})")
-                    logging.info(f"💰 ЗАГАЛОМ: ${balance_1['total'] + balance_2['total']:.2f} USDT (доступно ${available_balance:.2f})")
-                else:
-                    # Якщо trading_exchange не XT - пропускаємо
-                    logging.warning(f"[{symbol}] ⚠️ Підтримуємо тільки XT біржу, пропускаємо: {trading_exchange}")
-                    return  # ⬅️ ЗМІНЕНО: з continue на return
-                    
-                # Детальне логування умов торгівлі
-                spread_check = MIN_SPREAD <= abs(spread_pct) <= MAX_SPREAD
-                balance_check = available_balance >= required_margin
+            # ✅ ТІЛЬКИ XT.COM БІРЖА - ОБИДВА АКАУНТИ
+            if trading_exchange == "xt":
+                with metrics.timer('scan_stage_seconds', stage='balance_snapshot'):
+                    account_view = account_snapshot.view()
+                balance_1 = account_view['accounts'].get('account_1', {'total': 0.0, 'available': 0.0})
+                balance_2 = account_view['accounts'].get('account_2', {'total': 0.0, 'available': 0.0})
+                # Доступно = free мінус локально зарезервована маржа
+                available_balance_1 = float(balance_1['available'])
+                available_balance_2 = float(balance_2['available'])
+                # Загальний доступний баланс
+                available_balance = available_balance_1 + available_balance_2
+                logging.debug(f"💰 XT.com АКАУНТ 1: ${balance_1['total']:.2f} USDT (доступно ${available_balance_1:.2f})")
+                logging.debug(f"💰 XT.com АКАУНТ 2: ${balance_2['total']:.2f} USDT (доступно ${available_balance_2:.2f})")
+                logging.debug(f"💰 ЗАГАЛОМ: ${account_view['total']:.2f} USDT (доступно ${available_balance:.2f}, знімок {account_view['age'] or 0:.1f}с)")
+            else:
+                # Якщо trading_exchange не XT - пропускаємо
+                logging.warning(f"[{symbol}] ⚠️ Підтримуємо тільки XT біржу, пропускаємо: {trading_exchange}")
+                return  # ⬅️ ЗМІНЕНО: з continue на return
                 
-                # 🔒 Перевірка кількості активних позицій з ЗАХИСТОМ (поза balance_check_lock)
-                with active_positions_lock:
-                    total_positions = len(active_positions)
-                    has_position = symbol in active_positions
-                positions_check = total_positions < MAX_OPEN_POSITIONS
+            # Детальне логування умов торгівлі
+            spread_check = MIN_SPREAD <= abs(spread_pct) <= MAX_SPREAD
+            balance_check = available_balance >= required_margin
+            
+            # 🔒 Перевірка кількості активних позицій з ЗАХИСТОМ
+            with active_positions_lock:
+                total_positions = len(active_positions)
+                has_position = symbol in active_positions
+            positions_check = total_positions < MAX_OPEN_POSITIONS
             
             
             # 🔥 ПОКРАЩЕНІ ФІЛЬТРИ РЕАЛЬНОСТІ - відсіюємо фейкові арбітражі!
             is_realistic = True
             
-            # 1. РОЗУМНИЙ спред фільтр: різні ліміти для різних монет
             clean_symbol = symbol.replace('/USDT:USDT', '')
             
-            # Основні монети (ETH, BTC тощо) - більш жорсткі ліміти
-            major_tokens = ['ETH', 'BTC', 'BNB', 'ADA', 'SOL', 'MATIC', 'AVAX', 'DOT', 'LINK']
-            max_spread_limit = 50.0  # ПОЛІПШЕНО: максимум 50% для блокування фейків
-            
-            # ЖОРСТКА перевірка фейкових спредів  
-            if abs(spread_pct) > max_spread_limit:
-                logging.warning(f"[{symbol}] ❌ ФЕЙК: Нереальний спред {spread_pct:.2f}% > {max_spread_limit}%")
-                is_realistic = False
+            # 1. РОЗУМНИЙ спред фільтр: різні ліміти для різних монет
+            # Кроки 1-3 і 6 - ті самі перевірки, що spread_prescreener.check_pair на стадії фільтрів конвеєра
+            if filtered is None:
+                # Основні монети (ETH, BTC тощо) - більш жорсткі ліміти
+                major_tokens = ['ETH', 'BTC', 'BNB', 'ADA', 'SOL', 'MATIC', 'AVAX', 'DOT', 'LINK']
+                max_spread_limit = MAX_REALISTIC_SPREAD_PCT  # ПОЛІПШЕНО: максимум 50% для блокування фейків
+            
+                # ЖОРСТКА перевірка фейкових спредів  
+                if abs(spread_pct) > max_spread_limit:
+                    logging.warning(f"[{symbol}] ❌ ФЕЙК: Нереальний спред {spread_pct:.2f}% > {max_spread_limit}%")
+                    is_realistic = False
             
-            # БЛОКУВАННЯ НЕГАТИВНИХ СПРЕДІВ (очевидні фейки)
-            if spread_pct < -25.0:  # Негативні спреди більше -25% завжди фейкові  
-                logging.warning(f"[{symbol}] ❌ ФЕЙК: Негативний спред {spread_pct:.2f}% заблоковано")
-                is_realistic = False
+                # БЛОКУВАННЯ НЕГАТИВНИХ СПРЕДІВ (очевидні фейки)
+                if spread_pct < MIN_REALISTIC_NEGATIVE_SPREAD_PCT:  # Негативні спреди більше -25% завжди фейкові  
+                    logging.warning(f"[{symbol}] ❌ ФЕЙК: Негативний спред {spread_pct:.2f}% заблоковано")
+                    is_realistic = False
             
-            # 2. РОЗСЛАБЛЕНА перевірка співвідношення цін для більше можливостей
-            price_ratio = max(xt_price, dex_price) / min(xt_price, dex_price)
-            max_price_ratio = 2.5  # РОЗСЛАБЛЕНО: 2.5x для всіх монет для більше сигналів
+                # 2. РОЗСЛАБЛЕНА перевірка співвідношення цін для більше можливостей
+                price_ratio = max(xt_price, dex_price) / min(xt_price, dex_price)
+                max_price_ratio = MAX_PRICE_RATIO  # РОЗСЛАБЛЕНО: 2.5x для всіх монет для більше сигналів
             
-            if price_ratio > max_price_ratio:
-                logging.warning(f"[{symbol}] ❌ ФЕЙК: Ціни відрізняються в {price_ratio:.2f} разів (макс. {max_price_ratio:.1f}x)")
-                is_realistic = False
+                if price_ratio > max_price_ratio:
+                    logging.warning(f"[{symbol}] ❌ ФЕЙК: Ціни відрізняються в {price_ratio:.2f} разів (макс. {max_price_ratio:.1f}x)")
+                    is_realistic = False
             
-            # 3. АБСОЛЮТНА перевірка цін для топ-монет (як ETH $3701 vs $4601)  
-            if clean_symbol in major_tokens:
-                # Перевіряємо що цінди в розумних межах для топ-монет
-                expected_ranges = {
-                    'ETH': (2000, 6000),    # ETH очікується $2000-6000
-                    'BTC': (30000, 100000), # BTC очікується $30k-100k  
-                    'BNB': (200, 1000),     # BNB очікується $200-1000
-                    'SOL': (50, 500),       # SOL очікується $50-500
-                    'ADA': (0.2, 3.0),      # ADA очікується $0.2-3.0
-                }
+                # 3. АБСОЛЮТНА перевірка цін для топ-монет (як ETH $3701 vs $4601)  
+                if clean_symbol in major_tokens:
+                    # Перевіряємо що цінди в розумних межах для топ-монет
+                    expected_ranges = EXPECTED_PRICE_RANGES
                 
-                if clean_symbol in expected_ranges:
-                    min_price, max_price = expected_ranges[clean_symbol]
-                    if not (min_price <= xt_price <= max_price) or not (min_price <= dex_price <= max_price):
-                        logging.warning(f"[{symbol}] ❌ ФЕЙК: Ціна поза межами для {clean_symbol}: XT=${xt_price:.2f}, Dex=${dex_price:.2f} (очікується ${min_price}-${max_price})")
-                        is_realistic = False
+                    if clean_symbol in expected_ranges:
+                        min_price, max_price = expected_ranges[clean_symbol]
+                        if not (min_price <= xt_price <= max_price) or not (min_price <= dex_price <= max_price):
+                            logging.warning(f"[{symbol}] ❌ ФЕЙК: Ціна поза межами для {clean_symbol}: XT=${xt_price:.2f}, Dex=${dex_price:.2f} (очікується ${min_price}-${max_price})")
+                            is_realistic = False
             
             # 4. ЖОРСТКІ ФІЛЬТРИ: Мінімальна ліквідність та обсяг для торгівлі (як просив користувач)
             min_liquidity = token_info.get('liquidity', 0)
@@ -2108,7 +2170,7 @@ def symbol_worker(symbol):
                 is_realistic = False
             
             # 6. ДОДАТКОВО: Перевірка кратності цін (виявляє деякі фейки)
-            if xt_price > 0 and dex_price > 0:
+            if filtered is None and xt_price > 0 and dex_price > 0:
                 # Якщо одна ціна є точним кратним іншої (x10, x100), це може бути помилка
                 ratio_check = xt_price / dex_price
                 if abs(ratio_check - round(ratio_check)) < 0.01 and round(ratio_check) >= 10:
@@ -2184,6 +2246,7 @@ def symbol_worker(symbol):
                             'score': score,
                             'timestamp': current_time,
                             'xt_price': xt_price,
+                            'xt_price_age': xt_price_age,
                             'dex_price': dex_price,
                             'token_info': token_info,
                             'advanced_metrics': advanced_metrics
@@ -2394,10 +2457,32 @@ def symbol_worker(symbol):
                     #             pass
                                 
                             # 🔒 ORDER PLACEMENT LOCK (Task 6: запобігаємо подвійним ордерам)
-                            with order_placement_lock:
+                            # ⏳ Застаріла оцінка не торгує, а розпочате розміщення не переривається дедлайном
+                            check_deadline('order placement')
+                            lock_wait_started = time.perf_counter()
+                            with order_placement_lock, no_deadline():
+                                metrics.observe('scan_stage_seconds', time.perf_counter() - lock_wait_started, stage='order_lock_wait')
                                 # 🎯 ПАРАЛЕЛЬНА ТОРГІВЛЯ НА ДВОХ АКАУНТАХ
-                                order_account_1 = xt_open_market_position(xt_account_1, symbol, side, ORDER_AMOUNT, current_leverage, ref_price, dex_price, spread_pct)
-                                order_account_2 = xt_open_market_position(xt_account_2, symbol, side, ORDER_AMOUNT, current_leverage, ref_price, dex_price, spread_pct)
+                                # 💰 Локально резервуємо маржу, щоб інші воркери одразу бачили зменшений баланс
+                                # Акаунт без резерву (маржу вже зайняли інші воркери) ордер не отримує
+                                reservation_1 = account_snapshot.reserve("account_1", ORDER_AMOUNT)
+                                reservation_2 = account_snapshot.reserve("account_2", ORDER_AMOUNT)
+                                if not reservation_1:
+                                    logging.warning(f"[{symbol}] 💰 АКАУНТ 1: Недостатньо доступної маржі - ордер пропущено")
+                                if not reservation_2:
+                                    logging.warning(f"[{symbol}] 💰 АКАУНТ 2: Недостатньо доступної маржі - ордер пропущено")
+                                order_account_1 = order_account_2 = None
+                                try:
+                                    with metrics.timer('scan_stage_seconds', stage='order_placement'):
+                                        if reservation_1:
+                                            order_account_1 = xt_open_market_position(xt_account_1, symbol, side, ORDER_AMOUNT, current_leverage, ref_price, dex_price, spread_pct)
+                                        if reservation_2:
+                                            order_account_2 = xt_open_market_position(xt_account_2, symbol, side, ORDER_AMOUNT, current_leverage, ref_price, dex_price, spread_pct)
+                                finally:
+                                    account_snapshot.settle(reservation_1, bool(order_account_1))
+                                    account_snapshot.settle(reservation_2, bool(order_account_2))
+                                if order_account_1 or order_account_2:
+                                    account_snapshot.request_refresh()  # 🔄 Оновлюємо баланси після fill
                                 # Вважаємо успішним якщо хоча б один акаунт відкрив позицію
                                 order = order_account_1 or order_account_2
                                 if order_account_1:
@@ -2407,6 +2492,7 @@ def symbol_worker(symbol):
                         else:
                             order = None
                         if order:
+                                lift_deadline()  # ⏳ ордер розміщено - позиція і повідомлення мають бути збережені
                                 logging.info(f"[{symbol}] 🚀 XT: Відкрито {side} позиції на обох акаунтах з левериджем {current_leverage}x (Режим: {current_mode_name})")
                         # ❌ GATE.IO ВІДКЛЮЧЕНО - тільки XT біржа!
                         # else:  # gate (ВІДКЛЮЧЕНО)
@@ -2589,13 +2675,14 @@ def symbol_worker(symbol):
                                             logging.error(f"[{symbol}] ❌ Помилка левериджу XT при усередненні: {e}")
                                             pass
                                         # 🔒 ORDER PLACEMENT LOCK для усереднення (Task 6: запобігаємо конфліктним ордерам)
-                                        with order_placement_lock:
+                                        with order_placement_lock, no_deadline():
                                             order = xt_open_market_position(xt, symbol, position['side'], add_size, LEVERAGE, ref_price, dex_price, spread_pct)
                                         current_price = ref_price  # Завжди XT ціна
                                     else:
                                         order = None
                                         current_price = ref_price
                                     if order:
+                                        lift_deadline()  # ⏳ ордер розміщено - оновлення позиції має завершитись
                                         # 🔒 Оновлення агрегованої позиції з захистом
                                         with active_positions_lock:
                                             if symbol in active_positions:  # Перевіряємо що позиція ще існує
@@ -2693,6 +2780,7 @@ def symbol_worker(symbol):
             
             if should_close:
                 logging.warning(f"🚨 АВТОЗАКРИТТЯ {position['side']} {symbol}: {close_reason}")
+                lift_deadline()  # ⏳ закриття позиції не покидаємо по дедлайну
                 
                 # БЕЗПЕЧНЕ ЗАКРИТТЯ: спочатку закриваємо на біржі, потім видаляємо з системи
                 try:
@@ -3038,7 +3126,7 @@ def start_monitor():
 #                 monitor_stop_event.wait(timeout=30) # ⬅️ ЗМІНЕНО: Пауза на випадок помилки
 
 def start_workers():
-    global _plot_thread, worker_threads # ⬅️ ЗМІНЕНО: переконуємося, що worker_threads глобальний
+    global _plot_thread, worker_threads, scan_scheduler # ⬅️ ЗМІНЕНО: переконуємося, що worker_threads глобальний
     logging.info("🚨 DEBUG: start_workers() ВИКЛИКАЄТЬСЯ!")
     
     # 🎯 КРИТИЧНО: Запускаємо моніторинг ПЕРШИМ (до всіх інших ініціалізацій)
@@ -3055,6 +3143,11 @@ def start_workers():
         logging.info("🚨 DEBUG: Початок init_markets()...")
         init_markets()
         logging.info("🚨 DEBUG: init_markets() завершено!")
+        if SCAN_ENGINE != "async":  # async рушій сам оновлює знімок через ccxt.async_support
+            xt_ticker_snapshot.start(monitor_stop_event)
+        account_snapshot.start(monitor_stop_event)
+        if BLOCKCHAIN_AVAILABLE and blockchain_client:
+            blockchain_client.start_reserve_tracking(monitor_stop_event)  # 🔔 резерви EVM пулів по Sync подіях
     except Exception as e:
         logging.error(f"🚨 DEBUG: ПОМИЛКА в init_markets(): {e}")
         raise
@@ -3077,104 +3170,274 @@ def start_workers():
     _plot_thread = threading.Thread(target=plot_spread_live, args=(spread_store,), daemon=True)
     _plot_thread.start()
 
-    # 🚀 ВИПРАВЛЕНО: Батч-обробка ВСІХ 733 пар по 50 паралельно
-    # ⬅️ ЗМІНЕНО: Додано головний цикл while bot_running:
-    while bot_running:
+    # ⚡ ASYNC РУШІЙ: один event loop замість пулу потоків (SCAN_ENGINE=async)
+    if SCAN_ENGINE == "async":
+        from async_scan_engine import AsyncScanEngine
+        scan_scheduler = AsyncScanEngine(
+            evaluate_fn=symbol_worker,
+            stop_event=monitor_stop_event,
+            max_in_flight=ASYNC_SCAN_MAX_IN_FLIGHT,
+            provider_limits=ASYNC_PROVIDER_CONCURRENCY,
+            on_sweep_complete=_on_scan_sweep_complete,
+            priority_tracker=scan_priority,
+            deadline_sec=SCAN_EVALUATION_DEADLINE_SEC,
+            deadline_retry_sec=SCAN_DEADLINE_RETRY_SEC,
+        )
+        scan_scheduler.run(_scan_universe)
+        return
+
+    if SCAN_ENGINE == "sharded":
+        # 🌐 ШАРДИ: сканери в окремих процесах/хостах, рішення та ордери тільки тут (SCAN_ENGINE=sharded)
+        from shard_cluster import ShardCoordinator
+        scan_scheduler = ShardCoordinator(
+            universe_fn=lambda: [s for s in markets.keys() if trade_symbols.get(s, True)],
+            on_opportunity=_shard_decide,
+            host=SHARD_COORDINATOR_HOST,
+            port=SHARD_COORDINATOR_PORT,
+            auth_token=SHARD_AUTH_TOKEN,
+            decide_workers=SHARD_DECIDE_WORKERS,
+            heartbeat_timeout=SHARD_SCANNER_TIMEOUT_SEC,
+            rebalance_interval=SHARD_REBALANCE_SEC,
+            open_symbols_fn=_open_position_symbols,
+            params_fn=lambda: {'min_spread': MIN_SPREAD},
+            stop_event=monitor_stop_event,
+            deadline_sec=SCAN_EVALUATION_DEADLINE_SEC,
+        )
         try:
-            symbols = list(markets.keys())
-            batch_size = MAX_CONCURRENT_SYMBOLS
-            total_symbols = len(symbols)
-            
-            logging.info(f"🔄 РОЗПОЧИНАЄМО НОВИЙ ЦИКЛ СКАНУВАННЯ: {total_symbols} символів, батчами по {batch_size}")
-            
-            # 🧹 Очищаємо глобальний список воркерів перед новим циклом
-            worker_threads = [] 
-            
-            # Розбиваємо символи на батчі
-            for batch_start in range(0, total_symbols, batch_size):
-                if not bot_running: # ⬅️ ДОДАНО: Перевірка зупинки між батчами
-                    logging.info("🔴 Отримано сигнал зупинки, перериваємо цикл сканування.")
-                    break
-                    
-                batch_end = min(batch_start + batch_size, total_symbols)
-                batch_symbols = symbols[batch_start:batch_end]
-                
-                logging.info(f"📦 Батч {batch_start//batch_size + 1}: запускаємо {len(batch_symbols)} символів (від {batch_start} до {batch_end-1})")
-                
-                current_batch_threads = [] # ⬅️ ДОДАНО: Локальний список для очікування
-                
-                # Запускаємо всі символи з поточного батчу
-                for sym in batch_symbols:
-                    if not bot_running: break # ⬅️ ДОДАНО: Перевірка зупинки під час запуску
-                    t = threading.Thread(target=symbol_worker, args=(sym,), daemon=True)
-                    t.start()
-                    worker_threads.append(t) # ⬅️ ДОДАНО: Для функції stop_all_workers
-                    current_batch_threads.append(t) # ⬅️ ДОДАНО: Для .join()
-                    # ⛔️ ВИДАЛЕНО: time.sleep(1) (це занадто повільно для запуску батчу)
-                
-                # ⏳ ЧЕКАЄМО ЗАВЕРШЕННЯ ПОТОЧНОГО БАТЧУ 
-                # logging.info(f"⏳ Очікуємо завершення {len(current_batch_threads)} воркерів з батчу...")
-                # for t in current_batch_threads:
-                #     if not bot_running: break # ⬅️ ДОДАНО: Можна перервати очікування
-                    
-                #     t.join(timeout=15.0) # ⬅️ НОВИЙ КОД: Чекаємо максимум 60 секунд
-                BATCH_TIMEOUT_SEC = 75.0  # Даємо 75 секунд НА ВЕСЬ БАТЧ (оскільки Батч 1 зайняв 71с)
-
-                logging.info(f"⏳ Очікуємо завершення {len(current_batch_threads)} воркерів (макс. {BATCH_TIMEOUT_SEC} сек)...")
+            scan_scheduler.start()
+        except ValueError as e:
+            logging.critical(str(e))
+            return
+        scan_scheduler.spawn_local_scanners(SHARD_LOCAL_SCANNERS)
+
+        while bot_running and not monitor_stop_event.is_set():
+            stats = scan_scheduler.get_stats()
+            logging.info(f"📊 SHARDS: {stats['scanners']} сканерів, {stats['universe']} символів, "
+                         f"{stats['evaluations_per_min']} оцінок/хв, можливостей {stats['opportunities']}, "
+                         f"рішень в черзі {stats['decide_pending']}")
+            _on_scan_sweep_complete()  # sweep'ів на координаторі немає - перевіряємо режим раз на хвилину
+            monitor_stop_event.wait(timeout=60)
+        logging.info("🔴 Цикл координатора шардів зупинено.")
+        return
+
+    if SCAN_ENGINE == "pipeline":
+        # 🏭 КОНВЕЄР: окремі пули воркерів для XT, DEX, фільтрів та рішення (SCAN_ENGINE=pipeline)
+        from scan_pipeline import ScanPipeline, PipelineStage
+        stage_fns = {
+            "market": _pipeline_market_stage,
+            "enrich": _pipeline_enrich_stage,
+            "filter": _pipeline_filter_stage,
+            "decide": _pipeline_decide_stage,
+        }
+        scan_scheduler = ScanPipeline(
+            stages=[
+                PipelineStage(name, stage_fns[name], workers, SCAN_PIPELINE_QUEUE_SIZE, SCAN_PIPELINE_RATE_LIMITS.get(name))
+                for name, workers in SCAN_PIPELINE_WORKERS.items()
+            ],
+            stop_event=monitor_stop_event,
+            on_sweep_complete=_on_scan_sweep_complete,
+            priority_tracker=scan_priority,
+            deadline_sec=SCAN_EVALUATION_DEADLINE_SEC,
+            deadline_retry_sec=SCAN_DEADLINE_RETRY_SEC,
+        )
+    else:
+        # 🔄 ПОСТІЙНИЙ ПУЛ ВОРКЕРІВ: безперервне сканування з бюджетом запитів (замість батчів потоків)
+        scan_scheduler = ScanScheduler(
+            worker_fn=symbol_worker,
+            num_workers=SCAN_WORKER_POOL_SIZE,
+            rate_budgets=SCAN_RATE_BUDGETS,
+            stop_event=monitor_stop_event,
+            on_sweep_complete=_on_scan_sweep_complete,
+            priority_tracker=scan_priority,
+            deadline_sec=SCAN_EVALUATION_DEADLINE_SEC,
+            deadline_retry_sec=SCAN_DEADLINE_RETRY_SEC,
+        )
+    scan_scheduler.start(_scan_universe)
+    worker_threads = list(scan_scheduler.workers)
 
-                start_time = time.time()
-                for t in current_batch_threads:
-                    if not bot_running:
-                        break
-                    
-                    # Розраховуємо, скільки часу залишилось до загального таймауту
-                    time_elapsed = time.time() - start_time
-                    remaining_timeout = max(0, BATCH_TIMEOUT_SEC - time_elapsed)
-                    
-                    t.join(timeout=remaining_timeout)
-                    
-                    # Якщо загальний час вийшов, припиняємо чекати
-                    if time.time() - start_time >= BATCH_TIMEOUT_SEC:
-                        logging.warning(f"🚨 ТАЙМАУТ БАТЧА! {BATCH_TIMEOUT_SEC}с вийшло. Переходимо до наступного...")
-                        break # Виходимо з циклу очікування for t in...
-
-                # Додаткове логування, щоб бачити, скільки воркерів "зависло"
-                if bot_running:
-                    alive_workers = [t.name for t in current_batch_threads if t.is_alive()]
-                    if alive_workers:
-                        logging.warning(f"⚠️ {len(alive_workers)} воркерів не завершились і були 'покинуті' (це нормально при таймауті).")
-                        
-                if not bot_running: break # ⬅️ ДОДАНО: Вихід з циклу батчів
-                
-                logging.info(f"✅ Батч {batch_start//batch_size + 1} завершено.")
+    while bot_running and not monitor_stop_event.is_set():
+        stats = scan_scheduler.get_stats()
+        logging.info(f"📊 SCANNER: черга {stats['queue_depth']}, в обробці {stats['in_flight']}, "
+                     f"останній sweep {stats['last_sweep_duration_sec']}с ({stats['last_sweep_symbols']} символів), "
+                     f"{stats['evaluations_per_min']} оцінок/хв")
+        monitor_stop_event.wait(timeout=60)
 
-                # Чекаємо трохи між батчами для розподілу навантаження
-                if batch_end < total_symbols and bot_running:
-                    logging.info(f"⏸️  Пауза 5 секунди між батчами...")
-                    monitor_stop_event.wait(timeout=5) # ⬅️ ЗМІНЕНО: Використовуємо .wait() для швидкої зупинки
-            
-            if not bot_running:
-                logging.info("🔴 Цикл сканування зупинено.")
-                break # Вихід з головного циклу while
+    logging.info("🔴 Цикл сканування зупинено.")
 
-            logging.info(f"✅✅✅ УСІ БАТЧІ ЗАВЕРШЕНО. Повний цикл сканування завершено.")
-            
-            # 🔄 ПЕРЕВІРКА УМОВ ДЛЯ ПЕРЕКЛЮЧЕННЯ РЕЖИМУ
-            try:
-                check_and_switch_mode()
-            except Exception as mode_check_error:
-                logging.error(f"❌ Помилка перевірки режиму торгівлі: {mode_check_error}")
-            
-            logging.info(f"🔄 Пауза 30 секунд перед початком нового циклу сканування...")
-            
-            # ⬅️ ДОДАНО: Пауза 30 секунд перед новим повним скануванням
-            monitor_stop_event.wait(timeout=30) 
+def _open_position_symbols():
+    with active_positions_lock:
+        return set(active_positions.keys())
 
-        except Exception as e:
-            logging.error(f"❌ КРИТИЧНА ПОМИЛКА в головному циклі start_workers: {e}")
-            logging.info("Пауза 30 секунд після помилки...")
-            if bot_running:
-                monitor_stop_event.wait(timeout=30) # ⬅️ ЗМІНЕНО: Пауза на випадок помилки
+def _prescreen_universe(symbols, open_symbols, min_spread):
+    """
+    🔎 Символи sweep'у: векторний пре-скрин (символи з позиціями не відсіюємо - логіка виходу)
+    + фонове пакетне завантаження DEX даних (DexScreener по адресах, CoinGecko) для символів, що пройшли
+    """
+    if PRESCREEN_ENABLED:
+        try:
+            symbols = spread_prescreener.screen(symbols, xt_ticker_snapshot.last_prices(), min_spread,
+                                                always_include=open_symbols)
+        except Exception as prescreen_error:
+            logging.error(f"❌ Помилка пре-скрину: {prescreen_error}")
+    dex_client.schedule_prefetch(symbols)
+    return symbols
+
+def _scan_universe():
+    """🔎 Символи для сканування: ввімкнені пари після векторного пре-скрину (без DEX запитів)"""
+    symbols = [s for s in markets.keys() if trade_symbols.get(s, True)]
+    return _prescreen_universe(symbols, _open_position_symbols(), MIN_SPREAD)
+
+# ====================== 🏭 СТАДІЇ КОНВЕЄРА СКАНУВАННЯ ======================
+def _pipeline_market_stage(item):
+    """📸 Стадія 1: XT ціна зі знімка тікерів"""
+    symbol = item['symbol']
+    with blacklist_lock:
+        if symbol in blacklist_data["banned_symbols"]:
+            return None
+    if not trade_symbols.get(symbol, False) or not (xt_markets_available and xt):
+        return None
+    with metrics.timer('scan_stage_seconds', stage='xt_ticker'):
+        xt_price, xt_price_age = xt_ticker_snapshot.get_price(symbol)
+    if not xt_price or not is_xt_futures_tradeable(symbol):
+        return None
+    item['xt_price'] = xt_price
+    item['xt_price_age'] = xt_price_age
+    return item
+
+def _pipeline_enrich_stage(item):
+    """🔬 Стадія 2: DEX метрики (блокчейн / CoinGecko / DexScreener)"""
+    symbol = item['symbol']
+    with metrics.timer('scan_stage_seconds', stage='dex_resolution'):
+        advanced_metrics = get_advanced_token_analysis(symbol)
+    if not advanced_metrics:
+        return None
+    dex_price = advanced_metrics.get('price_usd', 0)
+    if not dex_price or dex_price < 0.000001:
+        return None
+    spread_prescreener.record_dex_price(symbol, dex_price)
+    item['advanced_metrics'] = advanced_metrics
+    return item
+
+def _pipeline_filter_stage(item):
+    """🛡️ Стадія 3: анти-шиткоїн, перегрів LONG, перевірки реальності цін"""
+    symbol = item['symbol']
+    if item.get('has_position'):
+        return item  # позиція відома координатору шардів
+    with active_positions_lock:
+        has_position = symbol in active_positions
+    if has_position:
+        return item  # логіка виходу з позиції завжди доходить до рішення
+
+    advanced_metrics = item['advanced_metrics']
+    token_info = build_token_info(symbol, advanced_metrics)
+    base_symbol = symbol.replace('/USDT:USDT', '').replace('_USDT', '')
+    with metrics.timer('scan_stage_seconds', stage='shitcoin_filter'):
+        shitcoin_detected = is_shitcoin(base_symbol, token_info)
+    if shitcoin_detected:
+        with blacklist_lock:
+            if symbol not in blacklist_data["banned_symbols"]:
+                blacklist_data["banned_symbols"].append(symbol)
+                save_blacklist()
+        logging.warning(f"⛔ [{symbol}] ШИТКОЇН ВІДСІЯНО - додано в блеклист")
+        return None
+
+    xt_price = item['xt_price']
+    dex_price = token_info['price_usd']
+    spread_pct, is_realistic = spread_prescreener.check_pair(symbol, xt_price, dex_price)
+    scan_priority.observe_spread(symbol, spread_pct)
+    if xt_price < dex_price and check_long_overheat(token_info, base_symbol):
+        return None
+    if not is_realistic:
+        logging.debug(f"[{symbol}] ❌ Нереальна пара цін XT=${xt_price:.6f} Dex=${dex_price:.6f} ({spread_pct:.2f}%)")
+        return None
+    item['spread_pct'] = spread_pct
+    item['filtered'] = {'token_info': token_info, 'spread_pct': spread_pct}  # symbol_worker не повторює фільтри
+    return item
+
+def _pipeline_decide_stage(item):
+    """🎯 Стадія 4: рішення та виконання (логіка symbol_worker на вже зібраних даних)"""
+    symbol_worker(item['symbol'], market_data=item)
+    return None
+
+# ====================== 🌐 ШАРДИ: СКАНЕР ТА КООРДИНАТОР ======================
+def _shard_evaluate(symbol, has_position, params):
+    """🛰️ Сканер: стадії market -> enrich -> filter, координатору йдуть тільки можливості та позиції"""
+    item = {'symbol': symbol, 'has_position': has_position}
+    for stage in (_pipeline_market_stage, _pipeline_enrich_stage, _pipeline_filter_stage):
+        item = stage(item)
+        if item is None:
+            return None
+    if not has_position and not (params.get('min_spread', MIN_SPREAD) <= abs(item['spread_pct']) <= MAX_SPREAD):
+        return None
+    return {
+        'xt_price': item['xt_price'],
+        'spread_pct': item.get('spread_pct'),
+        'advanced_metrics': item['advanced_metrics'],
+    }
+
+def _shard_decide(message):
+    """🎯 Координатор: свіжа XT ціна зі знімка координатора + рішення symbol_worker"""
+    item = _pipeline_market_stage({'symbol': message['symbol']})  # чорний список, перемикачі, свіжа ціна
+    if item is None:
+        return
+    item['advanced_metrics'] = message['advanced_metrics']
+    symbol_worker(item['symbol'], market_data=item)
+
+def run_shard_scanner():
+    """🛰️ Точка входу процесу-сканера (python shard_cluster.py): без ордерів, позицій та Telegram"""
+    from shard_cluster import ShardScanner
+    shard_id = SHARD_ID or f"{socket.gethostname()}-{os.getpid()}"
+    init_markets(sync_positions=False)
+    xt_ticker_snapshot.start(monitor_stop_event)
+    scanner = ShardScanner(
+        host=SHARD_COORDINATOR_HOST,
+        port=SHARD_COORDINATOR_PORT,
+        shard_id=shard_id,
+        evaluate_fn=_shard_evaluate,
+        auth_token=SHARD_AUTH_TOKEN,
+        num_workers=SCAN_WORKER_POOL_SIZE,
+        rate_budgets=SCAN_RATE_BUDGETS,
+        universe_filter=lambda symbols, open_symbols, params: _prescreen_universe(
+            symbols, open_symbols, params.get('min_spread', MIN_SPREAD)),
+        priority_tracker=scan_priority,
+        deadline_sec=SCAN_EVALUATION_DEADLINE_SEC,
+        deadline_retry_sec=SCAN_DEADLINE_RETRY_SEC,
+        heartbeat_interval=SHARD_HEARTBEAT_SEC,
+        stop_event=monitor_stop_event,
+    )
+    logging.info(f"🛰️ SHARD SCANNER {shard_id}: старт, координатор {SHARD_COORDINATOR_HOST}:{SHARD_COORDINATOR_PORT}")
+    scanner.run()
+
+def _on_scan_sweep_complete():
+    """🔄 Після кожного повного проходу по символах перевіряємо умови режиму торгівлі"""
+    try:
+        check_and_switch_mode()
+    except Exception as mode_check_error:
+        logging.error(f"❌ Помилка перевірки режиму торгівлі: {mode_check_error}")
+
+def get_scanner_stats():
+    """📊 Статистика планувальника сканування для API"""
+    if scan_scheduler is None:
+        return {'running': False}
+    stats = scan_scheduler.get_stats()
+    stats['running'] = scan_scheduler.is_running()
+    stats['xt_snapshot'] = xt_ticker_snapshot.get_stats()
+    stats['account_snapshot'] = account_snapshot.get_stats()
+    stats['prescreen'] = spread_prescreener.get_stats()
+    stats['dex_providers'] = dex_client.get_provider_stats()
+    stats['caches'] = get_all_cache_stats()
+    stats['rate_limits'] = rate_governor.get_stats()
+    stats['priority_tiers'] = scan_priority.get_assignments(limit=0)['summary']
+    stats['price_ttls'] = adaptive_ttl.get_stats(limit=0)['summary']
+    return stats
+
+def get_scan_schedule(limit=None):
+    """🎯 Призначені інтервали сканування по символах для API"""
+    return scan_priority.get_assignments(limit=limit)
+
+def get_price_ttls(limit=None):
+    """🌡️ TTL кешів цін по символах для API"""
+    return adaptive_ttl.get_stats(limit=limit)
 
 # def start_workers():
 #     global _plot_thread
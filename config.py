@@ -106,6 +106,74 @@ PNL_LEVELS = [25.0, 30.0]  # внутрішні PNL рівні (проценти
 MAX_CONCURRENT_SYMBOLS = 50  # ⚡ ОПТИМІЗОВАНО: 50 паралельних threads для стабільності
 LOG_TO_TELEGRAM = True  # 🚀 УВІМКНЕНО: Telegram сигнали активні!
 
+# 🔄 ПЛАНУВАЛЬНИК СКАНУВАННЯ (постійний пул воркерів замість батчів)
+SCAN_WORKER_POOL_SIZE = MAX_CONCURRENT_SYMBOLS  # Кількість постійних воркерів
+SCAN_RATE_BUDGETS = {  # Бюджет оцінок символів на секунду для кожного провайдера
+    "xt": 8.0,    # XT.com REST (ticker + перевірки)
+    "dex": 5.0,   # DEX провайдери (блокчейн / CoinGecko / DexScreener)
+}
+SCAN_EVALUATION_DEADLINE_SEC = 8  # ⏳ Бюджет на одну оцінку символу: всі запити XT/DEX/RPC вкладаються в нього
+SCAN_DEADLINE_RETRY_SEC = 15  # Покинута по дедлайну оцінка повторюється через 15 сек
+
+# 🎯 ПРІОРИТЕТНЕ СКАНУВАННЯ (інтервал повтору за історією спреду)
+SCAN_PRIORITY_MIN_INTERVAL_SEC = 3  # Символи біля порогу MIN_SPREAD - кожні 3 сек
+SCAN_PRIORITY_MAX_INTERVAL_SEC = 300  # "Мертві" символи далеко від порогу - раз на 5 хв
+SCAN_PRIORITY_NO_DATA_INTERVAL_SEC = 120  # Немає спреду (немає DEX ціни / XT тікера) - раз на 2 хв
+SCAN_PRIORITY_OPPORTUNITY_TTL_SEC = 120  # Свіжа можливість в best_opportunities = максимальний пріоритет
+
+# 🔎 ПРЕ-СКРИН (векторна перевірка XT знімка vs останніх DEX цін до будь-яких DEX запитів)
+PRESCREEN_ENABLED = True  # Вимкнути щоб всі символи йшли на повну перевірку
+PRESCREEN_SPREAD_FRACTION = 0.5  # Пропускаємо якщо |спред| >= 50% від MIN_SPREAD (DEX ціна могла зрушити)
+PRESCREEN_DEX_PRICE_MAX_AGE_SEC = 300  # DEX ціна старша за 5 хв - символ йде на оновлення без пре-скрину
+MAX_REALISTIC_SPREAD_PCT = 50.0  # Спред більше 50% вважається фейком
+MIN_REALISTIC_NEGATIVE_SPREAD_PCT = -25.0  # Негативні спреди нижче -25% завжди фейкові
+MAX_PRICE_RATIO = 2.5  # XT і DEX ціни не можуть відрізнятись більше ніж в 2.5 рази
+EXPECTED_PRICE_RANGES = {  # Очікувані ціни топ-монет (як ETH $3701 vs $4601)
+    'ETH': (2000, 6000),
+    'BTC': (30000, 100000),
+    'BNB': (200, 1000),
+    'SOL': (50, 500),
+    'ADA': (0.2, 3.0),
+}
+
+# ⚡ РУШІЙ СКАНУВАННЯ: "threads" (пул воркерів), "pipeline" (конвеєр стадій), "async" (один asyncio event loop)
+# або "sharded" (координатор + процеси-сканери, див. shard_cluster.py)
+SCAN_ENGINE = os.getenv("SCAN_ENGINE", "threads").lower()
+SCAN_PIPELINE_WORKERS = {  # Воркери кожної стадії конвеєра (порядок = порядок стадій)
+    "market": 4,    # XT ціна зі знімка (без мережі)
+    "enrich": 30,   # DEX метрики - найповільніша стадія
+    "filter": 4,    # is_shitcoin / перегрів / перевірки реальності (CPU)
+    "decide": 8,    # Рішення та розміщення ордерів
+}
+SCAN_PIPELINE_QUEUE_SIZE = 64  # Місткість черги перед кожною стадією (backpressure)
+SCAN_PIPELINE_RATE_LIMITS = {  # Бюджет запитів/сек для стадій з мережевими запитами
+    "enrich": SCAN_RATE_BUDGETS["dex"],
+}
+# 🌐 ШАРДИ (SCAN_ENGINE=sharded): сканери отримують непересічні частини символів, ордери - тільки координатор
+SHARD_COORDINATOR_HOST = os.getenv("SHARD_COORDINATOR_HOST", "127.0.0.1")  # 0.0.0.0 на координаторі для сканерів з інших хостів
+SHARD_COORDINATOR_PORT = int(os.getenv("SHARD_COORDINATOR_PORT", "8765"))  # TCP порт координатора
+SHARD_AUTH_TOKEN = os.getenv("SHARD_AUTH_TOKEN", "")  # Спільний секрет координатора і сканерів (без нього координатор стартує тільки на 127.0.0.1)
+SHARD_ID = os.getenv("SHARD_ID", "")  # Ідентифікатор сканера (за замовчуванням hostname-pid)
+SHARD_LOCAL_SCANNERS = int(os.getenv("SHARD_LOCAL_SCANNERS", "2"))  # Сканери, які координатор запускає на своєму хості
+SHARD_DECIDE_WORKERS = 8  # Потоки рішень/ордерів на координаторі
+SHARD_HEARTBEAT_SEC = 5  # Сканер звітує координатору кожні 5 сек
+SHARD_SCANNER_TIMEOUT_SEC = 30  # Сканер без звітів 30 сек відключається, його символи перерозподіляються
+SHARD_REBALANCE_SEC = 10  # Перевірка складу сканерів та universe кожні 10 сек
+ASYNC_SCAN_MAX_IN_FLIGHT = 2000  # Максимум символів одночасно в обробці на event loop
+ASYNC_PROVIDER_CONCURRENCY = {  # Семафори: одночасні запити до кожного провайдера
+    "xt": 5,            # ccxt.async_support (bulk тікери + поодинокі fallback)
+    "dexscreener": 20,  # DexScreener search через aiohttp
+    "dex_sync": 8,      # Sync ланцюжок провайдерів в пулі потоків (блокчейн / CoinGecko)
+    "decision": 20,     # Логіка рішення symbol_worker (ордери синхронні)
+}
+
+# 📸 ЗНІМОК ТІКЕРІВ XT (один bulk fetch_tickers замість запиту на кожен символ)
+XT_TICKER_SNAPSHOT_INTERVAL_SEC = 5  # Фонове оновлення знімка кожні 5 сек
+XT_TICKER_SNAPSHOT_MAX_AGE_SEC = 15  # Знімок старший за 15 сек вважається застарілим
+
+# 💰 ЗНІМОК БАЛАНСІВ АКАУНТІВ (замість запиту балансу під локом для кожного символу)
+ACCOUNT_SNAPSHOT_INTERVAL_SEC = 10  # Оновлення балансів кожні 10 сек + після кожного ордера
+
 # ❌ ДОКУПІВЛІ ВІДКЛЮЧЕНО ПОВНІСТЮ (як просив користувач)  
 AVERAGING_ENABLED = False  # 🚫 ВИМКНЕНО повністю - НІ ДОКУПІВЕЛЬ!
 AVERAGING_THRESHOLD_PCT = 2.0  # % руху проти позиції для усереднення (неактивно)
@@ -162,6 +230,80 @@ MIN_DYNAMICS_QUALITY_SCORE = 30.0  # Мінімальна якість дани
 PRICE_DYNAMICS_PERIOD_MIN = 15  # Відстежування динаміки цін (хвилини)
 PRICE_DYNAMICS_PERIOD_MAX = 60  # Максимальний період для динаміки (хвилини)
 
+# 🚫 НЕГАТИВНИЙ КЕШ DEX ПРОВАЙДЕРІВ (символи без мапінгу не перевіряються кожен прохід)
+NEGATIVE_CACHE_ENABLED = True  # Вимкнути щоб кожен прохід знову питав всі провайдери
+NEGATIVE_CACHE_BASE_SEC = 300  # Перший промах - повторна перевірка через 5 хв
+NEGATIVE_CACHE_MAX_SEC = 21600  # Інтервал подвоюється з кожним промахом до 6 годин
+
+# 📦 ПАКЕТНІ DEX ЗАПИТИ (один запит на багато символів замість запиту на символ)
+COINGECKO_BATCH_SIZE = 100  # ids в одному запиті
+COINGECKO_BATCH_TTL_SEC = 60  # Ціна з пакету використовується 60 сек
+DEXSCREENER_BATCH_SIZE = 30  # Адрес в одному запиті DexScreener /tokens (ліміт API - 30)
+
+# 💾 КЕШІ DEX (TTL + LRU витіснення, щоб пам'ять не росла з кількістю символів)
+DEX_BEST_PAIR_CACHE_TTL_SEC = 180  # Знайдена пара свіжа 3 хвилини, далі віддається як stale з фоновим оновленням
+DEX_BEST_PAIR_HARD_TTL_SEC = 900  # Старша за 15 хв пара не віддається - воркер чекає провайдерів
+DEX_CONVERGENCE_MAX_AGE_SEC = 30  # Перевірка конвергенції (закриття позицій) приймає DEX ціну не старшу за 30 сек
+DEX_REFRESH_WORKERS = 8  # Потоки фонового оновлення застарілих пар
+DEX_TOKEN_CACHE_MAX_ENTRIES = 5000  # Максимум записів у token_cache
+DEX_TOKEN_CACHE_MAX_BYTES = 32 * 1024 * 1024  # Максимум ~32MB на token_cache
+BLOCKCHAIN_PRICE_CACHE_MAX_ENTRIES = 3000  # Максимум записів у кеші цін блокчейн пулів
+
+# 🌡️ АДАПТИВНИЙ TTL ЦІН (за волатильністю символу, позиціями та близькістю до порогу входу)
+ADAPTIVE_TTL_ENABLED = True  # False = фіксовані TTL кешів (180/60/30 сек)
+ADAPTIVE_TTL_MIN_SEC = 10  # Найкоротший TTL (волатильні токени)
+ADAPTIVE_TTL_MAX_SEC = 600  # Найдовший TTL (стабільні мажори)
+ADAPTIVE_TTL_TARGET_MOVE_PCT = 0.3  # Кешуємо приблизно поки ціна могла зрушити на 0.3%
+ADAPTIVE_TTL_POSITION_SEC = 10  # Символ з відкритою позицією - не довше 10 сек
+ADAPTIVE_TTL_NEAR_ENTRY_SEC = 20  # Символ біля порогу входу - не довше 20 сек
+ADAPTIVE_TTL_WINDOW = 30  # Останніх свіжих цін для реалізованої волатильності
+
+# 🏁 HEDGED DEX ЗАПИТИ (порядок провайдерів за латентністю, страхувальний запит після p95)
+DEX_HEDGING_ENABLED = True  # False = провайдери строго по черзі (у порядку очікуваного часу відповіді)
+DEX_HEDGE_DEFAULT_DELAY_SEC = 1.5  # Затримка hedge для провайдера без статистики
+DEX_HEDGE_MIN_DELAY_SEC = 0.2  # Hedge не раніше ніж через 200мс навіть для дуже швидкого провайдера
+DEX_HEDGE_POOL_SIZE = 100  # Потоки для паралельних викликів провайдерів
+DEX_LATENCY_WINDOW = 200  # Останніх викликів провайдера для p50/p95
+
+# 🗂️ ІНДЕКС ПАР (SQLite: symbol -> мережа/пара/контракт між перезапусками, теплий старт)
+PAIR_INDEX_ENABLED = True  # Вимкнути щоб кожен старт шукав пари з нуля
+PAIR_INDEX_PATH = os.getenv("PAIR_INDEX_PATH", "pair_index.sqlite3")  # Файл індексу
+PAIR_INDEX_MAX_AGE_SEC = 7 * 86400  # Пари, не перевірені тиждень, видаляються з індексу
+PAIR_INDEX_WRITE_INTERVAL_SEC = 300  # Та сама пара перезаписується (час перевірки) не частіше ніж раз на 5 хв
+PAIR_INDEX_REFRESH_AGE_SEC = 86400  # Записи, не перевірені добу, фоново перевіряються пакетними /tokens запитами
+PAIR_INDEX_REFRESH_INTERVAL_SEC = 600  # Фонова перевірка індексу не частіше ніж раз на 10 хв
+PAIR_INDEX_REFRESH_BATCH = 300  # Максимум записів за одну перевірку (10 /tokens запитів)
+
+# ⏱️ RATE GOVERNOR: спільні ліміти провайдерів для всіх потоків (запитів/сек, burst, резерв для ордерів)
+RATE_GOVERNOR_LIMITS = {
+    "xt_public": (10.0, 20, 0),          # XT тікери / стакани / fetch_tickers
+    "xt_private": (8.0, 10, 3),          # Окреме відро на кожен акаунт; 3 токени тільки для ордерів/закриттів
+    "coingecko": (0.8, 2, 0),            # Безкоштовний API: ~50 запитів/хв
+    "dexscreener": (1.0, 3, 0),          # search: пошук по символу
+    "dexscreener_tokens": (4.0, 4, 0),   # /tokens: ~300 запитів/хв
+    "ankr_rpc": (25.0, 50, 0),           # Ankr RPC (Ethereum / BSC / Solana)
+    "telegram": (25.0, 30, 0),           # Bot API: до 30 повідомлень/сек
+}
+
+# ⛓️ ПРЯМІ БЛОКЧЕЙН ПУЛИ (Multicall3: резерви всіх пулів мережі одним eth_call)
+BLOCKCHAIN_MULTICALL_ENABLED = True  # False = окремий getReserves на кожен символ
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"  # Однакова адреса в Ethereum і BSC
+BLOCKCHAIN_MULTICALL_MIN_INTERVAL_SEC = 1.0  # Пакет тієї ж мережі не частіше (решта промахів читає його результат)
+BLOCKCHAIN_FANOUT_WORKERS = 12  # Спільний пул паралельних запитів до мереж (символ з пулами в кількох мережах)
+BLOCKCHAIN_PRICE_COMBINE = "first"  # "first" - перша валідна ціна, "weighted" - середня, зважена за ліквідністю пулів
+BLOCKCHAIN_CROSS_CHAIN_MAX_DEVIATION_PCT = 5.0  # Більша розбіжність цін одного токена між мережами - попередження
+SOLANA_BATCH_ENABLED = True  # Ціни всіх Solana пулів одним getMultipleAccounts (пули + vault акаунти)
+SOLANA_MULTIPLE_ACCOUNTS_LIMIT = 100  # Максимум акаунтів в одному getMultipleAccounts (ліміт RPC)
+POOL_REGISTRY_ENABLED = True  # Метадані пулів (token0/token1, decimals, орієнтація) зберігаються між перезапусками
+POOL_REGISTRY_PATH = os.getenv("POOL_REGISTRY_PATH", "pool_registry.json")  # Файл реєстру пулів
+POOL_QUOTE_RATE_MAX_AGE_SEC = 300  # Старіший USD курс WETH/WBNB/WSOL - ціни пулів з цим котируванням не рахуються
+
+# 🔔 ТРЕКЕР SYNC ПОДІЙ (резерви EVM пулів оновлюються по блоках: один eth_getLogs на новий блок мережі)
+RESERVE_TRACKER_ENABLED = True  # False = тільки Multicall по промаху кешу
+RESERVE_TRACKER_POLL_SEC = {"ethereum": 4.0, "bsc": 1.5}  # Перевірка нового блоку (блоки ~12с / ~3с)
+RESERVE_TRACKER_MAX_BLOCK_RANGE = 500  # Більший розрив у блоках - новий Multicall знімок замість логів
+RESERVE_TRACKER_STALE_SEC = 30  # Трекер без синхронізації довше - ціни з нього не віддаються
+
 # 🎯 НАЛАШТУВАННЯ МЕРЕЖ: Тільки BSC, Ethereum і Solana як просить користувач
 ALLOWED_CHAINS = ["ethereum", "bsc", "solana"]  # Основні мережі для якісних монет
 
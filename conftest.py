@@ -0,0 +1,11 @@
+"""
+Спільне налаштування pytest: файли індексу пар і реєстру пулів - у тимчасовій теці.
+dex_client і blockchain_pools_client відкривають їх при імпорті (глобальні клієнти), тому шляхи
+задаються до першого імпорту config - тести не залишають і не читають файли робочої теки.
+"""
+import os
+import tempfile
+
+_state_dir = tempfile.mkdtemp(prefix='bot_tests_')
+os.environ['PAIR_INDEX_PATH'] = os.path.join(_state_dir, 'pair_index.sqlite3')
+os.environ['POOL_REGISTRY_PATH'] = os.path.join(_state_dir, 'pool_registry.json')
@@ -0,0 +1,107 @@
+"""
+⏳ DEADLINE: Бюджет часу на одну оцінку символу
+Дедлайн зберігається в contextvars і його бачать усі клієнти (XT, DexCheckClient, BlockchainPoolsClient):
+- HTTP таймаути обрізаються до залишку бюджету (clamp_timeout)
+- ретраї requests адаптера припиняються після дедлайну (DeadlineRetry)
+- блокуючі web3/Solana виклики покидаються по дедлайну (call_with_deadline)
+DeadlineExceeded успадковується від BaseException (як asyncio.CancelledError), щоб широкі
+`except Exception` в клієнтах не проковтнули скасування.
+"""
+import time
+import contextvars
+import functools
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+
+from urllib3.util.retry import Retry
+
+_deadline = contextvars.ContextVar('scan_deadline', default=None)
+
+# Потоки для викликів без власного таймауту (web3 / Solana RPC), які можна покинути по дедлайну
+_abandon_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="deadline-call")
+
+
+class DeadlineExceeded(BaseException):
+    """Бюджет часу оцінки вичерпано - оцінку покинуто"""
+
+
+@contextmanager
+def deadline_scope(seconds):
+    """Встановлює дедлайн через seconds (вкладений дедлайн не може бути пізнішим за зовнішній). None = без дедлайну"""
+    if not seconds:
+        yield None
+        return
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+@contextmanager
+def no_deadline():
+    """Знімає дедлайн (розміщення ордерів не можна переривати посередині)"""
+    token = _deadline.set(None)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def lift_deadline():
+    """Знімає дедлайн до кінця поточної оцінки (закриття позиції має завершитись)"""
+    _deadline.set(None)
+
+
+def remaining():
+    """Залишок бюджету в секундах або None якщо дедлайну немає"""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def check_deadline(what=''):
+    """Кидає DeadlineExceeded якщо бюджет вичерпано"""
+    left = remaining()
+    if left is not None and left <= 0:
+        raise DeadlineExceeded(f"дедлайн вичерпано{': ' + what if what else ''}")
+
+
+def clamp_timeout(timeout, what=''):
+    """Таймаут запиту, обрізаний до залишку бюджету"""
+    check_deadline(what)
+    left = remaining()
+    return timeout if left is None else max(0.05, min(timeout, left))
+
+
+def call_with_deadline(fn, *args, what='', **kwargs):
+    """Блокуючий виклик без власного таймауту: по дедлайну покидаємо його і кидаємо DeadlineExceeded"""
+    left = remaining()
+    if left is None:
+        return fn(*args, **kwargs)
+    check_deadline(what)
+    future = _abandon_executor.submit(fn, *args, **kwargs)
+    try:
+        return future.result(timeout=left)
+    except FutureTimeoutError:
+        future.cancel()
+        raise DeadlineExceeded(f"дедлайн вичерпано: {what}")
+
+
+def run_in_executor(loop, executor, fn, *args):
+    """loop.run_in_executor з копією contextvars (дедлайн asyncio задачі діє і в потоці)"""
+    context = contextvars.copy_context()
+    return loop.run_in_executor(executor, functools.partial(context.run, fn, *args))
+
+
+class DeadlineRetry(Retry):
+    """Ретраї requests адаптера, які не виходять за дедлайн оцінки"""
+
+    def increment(self, *args, **kwargs):
+        check_deadline('retry')
+        return super().increment(*args, **kwargs)
@@ -8,8 +8,30 @@ import logging
 import json
 import time
 import os
+import threading
+import contextvars
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError, wait as futures_wait,
+)
 from typing import Dict, Optional, List
 
+from metrics import metrics
+from deadline import DeadlineExceeded, DeadlineRetry, clamp_timeout, remaining
+from negative_cache import NegativeResultCache
+from config import (
+    NEGATIVE_CACHE_ENABLED, NEGATIVE_CACHE_BASE_SEC, NEGATIVE_CACHE_MAX_SEC, COINGECKO_BATCH_SIZE, COINGECKO_BATCH_TTL_SEC,
+    DEXSCREENER_BATCH_SIZE, DEX_BEST_PAIR_CACHE_TTL_SEC, DEX_TOKEN_CACHE_MAX_ENTRIES, DEX_TOKEN_CACHE_MAX_BYTES,
+    PAIR_INDEX_ENABLED, PAIR_INDEX_PATH, PAIR_INDEX_MAX_AGE_SEC, PAIR_INDEX_WRITE_INTERVAL_SEC,
+    PAIR_INDEX_REFRESH_AGE_SEC, PAIR_INDEX_REFRESH_INTERVAL_SEC, PAIR_INDEX_REFRESH_BATCH,
+    DEX_BEST_PAIR_HARD_TTL_SEC, DEX_CONVERGENCE_MAX_AGE_SEC, DEX_REFRESH_WORKERS,
+    DEX_HEDGING_ENABLED, DEX_HEDGE_DEFAULT_DELAY_SEC, DEX_HEDGE_MIN_DELAY_SEC, DEX_HEDGE_POOL_SIZE, DEX_LATENCY_WINDOW,
+)
+from pair_index import PairIndex
+from provider_latency import ProviderLatencyTracker
+from ttl_cache import TTLCache
+from rate_governor import rate_governor, retry_after_seconds, set_traffic_lane
+from adaptive_ttl import adaptive_ttl
+
 # 🚀 НОВИЙ ІМПОРТ: Прямий блокчейн клієнт замість платного DexScreener
 try:
     from blockchain_pools_client import blockchain_client, get_blockchain_token_data
@@ -21,6 +43,105 @@ except ImportError as e:
     get_blockchain_token_data = None
     logging.warning(f"⚠️ Блокчейн клієнт недоступний: {e}")
 
+# Провайдер resolve_best_pair -> мітка 'provider' збереженої пари
+PROVIDER_CACHE_LABELS = {
+    'blockchain': 'blockchain_direct',
+    'coingecko': 'coingecko',
+    'dexscreener': 'dexscreener_fallback',
+}
+
+# Mapping символів на CoinGecko token IDs (спільний для поодиноких та пакетних запитів)
+SYMBOL_TO_COINGECKO = {
+    'BTC': 'bitcoin',
+    'ETH': 'ethereum', 
+    'USDT': 'tether',
+    'BNB': 'binancecoin',
+    'XRP': 'ripple',
+    'ADA': 'cardano',
+    'SOL': 'solana',
+    'DOGE': 'dogecoin',
+    'DOT': 'polkadot',
+    'MATIC': 'matic-network',
+    'LTC': 'litecoin',
+    'AVAX': 'avalanche-2',
+    'UNI': 'uniswap',
+    'LINK': 'chainlink',
+    'ATOM': 'cosmos',
+    'XLM': 'stellar',
+    'NEAR': 'near',
+    'FTM': 'fantom',
+    'ALGO': 'algorand',
+    'VET': 'vechain',
+    'ICP': 'internet-computer',
+    'SAND': 'the-sandbox',
+    'MANA': 'decentraland',
+    'FIL': 'filecoin',
+    'APT': 'aptos',
+    'OP': 'optimism',
+    'ARB': 'arbitrum',
+    'IMX': 'immutable-x',
+    'GALA': 'gala',
+    'CHZ': 'chiliz',
+    'FLOW': 'flow',
+    'KAVA': 'kava',
+    'CELO': 'celo',
+    'ONE': 'harmony',
+    'ZIL': 'zilliqa',
+    'ICX': 'icon',
+    'QTUM': 'qtum',
+    'BAT': 'basic-attention-token',
+    'ZRX': '0x',
+    'ONT': 'ontology',
+    'IOST': 'iostoken',
+    'HOT': 'holotoken',
+    'DGB': 'digibyte',
+    'RVN': 'ravencoin',
+    'WAVES': 'waves',
+    'NANO': 'nano',
+    'SC': 'siacoin',
+    'DASH': 'dash',
+    'ZEC': 'zcash',
+    'XMR': 'monero',
+    'DCR': 'decred',
+    'COMP': 'compound-governance-token',
+    'YFI': 'yearn-finance',
+    'SNX': 'havven',
+    'AAVE': 'aave',
+    'MKR': 'maker',
+    'CRV': 'curve-dao-token',
+    'SUSHI': 'sushi',
+    'GRT': 'the-graph',
+    'LRC': 'loopring',
+    'KNC': 'kyber-network-crystal',
+    '1INCH': '1inch',
+    'FET': 'fetch-ai',
+    'OCEAN': 'ocean-protocol',
+    'NKN': 'nkn',
+    'ANKR': 'ankr',
+    'STORJ': 'storj',
+    'CTK': 'certik',
+    'DENT': 'dent',
+    'WRX': 'wazirx',
+    'SFP': 'safemoon',
+    'TLM': 'alien-worlds',
+    'ALICE': 'myneighboralice',
+    'AUDIO': 'audius',
+    'C98': 'coin98',
+    'DYDX': 'dydx',
+    'ENS': 'ethereum-name-service',
+    'GALA': 'gala',
+    'IMX': 'immutable-x',
+    'LDO': 'lido-dao',
+    'LOOKS': 'looksrare',
+    'PEOPLE': 'constitutiondao',
+    'RACA': 'radio-caca',
+    'SPELL': 'spell-token',
+    'SYN': 'synapse-2',
+    'TRIBE': 'tribe-2',
+    'UNFI': 'unifi-protocol-dao',
+    'YGG': 'yield-guild-games'
+}
+
 class DexCheckClient:
     """
     🚀 DUAL-PROVIDER СИСТЕМА: DexCheck Pro + DexScreener Backup
@@ -36,7 +157,8 @@ class DexCheckClient:
         
         # 🔧 ПОЛІПШЕНА HTTP конфігурація (більший pool для concurrency)
         from requests.adapters import HTTPAdapter
-        adapter = HTTPAdapter(pool_maxsize=100, pool_connections=50, pool_block=False, max_retries=3)
+        adapter = HTTPAdapter(pool_maxsize=100, pool_connections=50, pool_block=False,
+                              max_retries=DeadlineRetry(total=3))  # ⏳ ретраї не виходять за дедлайн оцінки
         
         self.coingecko_session = requests.Session()
         self.dexscreener_session = requests.Session()
@@ -59,16 +181,45 @@ class DexCheckClient:
         
         # 📊 Статистика CoinGecko
         self.provider_stats = {
-            'coingecko_success': 0, 'coingecko_failed': 0, 'coingecko_429': 0
+            'coingecko_success': 0, 'coingecko_failed': 0, 'coingecko_429': 0,
+            'single_flight_leaders': 0, 'single_flight_coalesced': 0,
+            'stale_served': 0, 'background_refreshes': 0
         }
-        self.last_request_time = {'coingecko': 0}
         
         # 💾 Кеш токенів та in-flight запити
-        self.token_cache = {}
-        self.inflight_requests = {}  # Запобігаємо дублюванню запитів
+        # best_pair: знайдені пари (свіжі best_pair_ttl() секунд, далі stale до жорсткого TTL),
+        # coingecko: пакетні ціни, address: {symbol}_{chain} -> адреса
+        self.token_cache = TTLCache('dex_token_cache', default_ttl=DEX_BEST_PAIR_CACHE_TTL_SEC,
+                                    namespace_ttls={'best_pair': DEX_BEST_PAIR_HARD_TTL_SEC,
+                                                    'coingecko': COINGECKO_BATCH_TTL_SEC,
+                                                    'address': 3600},
+                                    max_entries=DEX_TOKEN_CACHE_MAX_ENTRIES, max_bytes=DEX_TOKEN_CACHE_MAX_BYTES)
+        self.inflight_requests = {}  # cache_key -> Future: один запит до провайдерів на ключ (single-flight)
+        self.inflight_lock = threading.Lock()
+        self.coingecko_pending = {}  # clean_symbol -> Event пакетного запиту, що вже в роботі
+        self.dexscreener_pending = {}  # clean_symbol -> Event пакетного запиту по адресах
+        self.prefetch_thread = None
+        # ♻️ Фонове оновлення застарілих пар (stale-while-revalidate)
+        self.refresh_executor = ThreadPoolExecutor(max_workers=DEX_REFRESH_WORKERS, thread_name_prefix="dex-refresh")
+        self.refreshing = set()  # ключі best_pair, оновлення яких вже в пулі
+        # 🚫 Промахи провайдерів: повторна перевірка з експоненційним інтервалом
+        self.negative_cache = NegativeResultCache(NEGATIVE_CACHE_BASE_SEC, NEGATIVE_CACHE_MAX_SEC,
+                                                  enabled=NEGATIVE_CACHE_ENABLED)
+        
+        # 🏁 Латентність провайдерів: порядок resolve_best_pair і hedged запити
+        self.latency_tracker = ProviderLatencyTracker(window=DEX_LATENCY_WINDOW, default_delay=DEX_HEDGE_DEFAULT_DELAY_SEC,
+                                                      min_delay=DEX_HEDGE_MIN_DELAY_SEC)
+        self.hedging_enabled = DEX_HEDGING_ENABLED
+        self.hedge_executor = ThreadPoolExecutor(max_workers=DEX_HEDGE_POOL_SIZE, thread_name_prefix="dex-hedge")
+        
+        # 🗂️ Перевірені пари з попередніх запусків (SQLite) - теплий старт без пошуку по символу
+        self.pair_index = PairIndex(PAIR_INDEX_PATH, max_age=PAIR_INDEX_MAX_AGE_SEC,
+                                    write_interval=PAIR_INDEX_WRITE_INTERVAL_SEC, enabled=PAIR_INDEX_ENABLED)
+        self.indexed_pairs = self.pair_index.load()
+        self.pair_index_refreshed_at = time.time()  # перша фонова перевірка - через інтервал після старту
         
         # 🗺️ КРИТИЧНО: Ініціалізація token addresses mapping
-        self.token_addresses = self._init_comprehensive_token_mapping()
+        self.token_addresses = self._with_indexed_addresses(self._init_comprehensive_token_mapping())
         
         # 🚀 АВТОМАТИЧНЕ РОЗШИРЕННЯ: Contract Discovery система
         try:
@@ -171,11 +322,132 @@ class DexCheckClient:
                 }
             }
     
-    def resolve_best_pair(self, symbol: str, for_convergence: bool = False) -> Optional[Dict]:
+    def _with_indexed_addresses(self, mappings: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        🗂️ Доповнює мапінг адресами з індексу пар: символи, знайдені раніше пошуком DexScreener,
+        одразу йдуть в пакетні /tokens запити. token_addresses.json має пріоритет над індексом
+        """
+        from config import ALLOWED_CHAINS
+        added = 0
+        for symbol, entry in self.indexed_pairs.items():
+            if symbol in mappings or entry['chain'] not in ALLOWED_CHAINS:
+                continue
+            mappings[symbol] = {
+                'address': entry['token_address'],
+                'chain': entry['chain'],
+                'name': symbol,
+                'pair_address': entry['pair_address'],
+                'source': 'pair_index',
+            }
+            added += 1
+        if added:
+            logging.info(f"🗂️ PAIR INDEX: +{added} токенів з індексу пар (теплий старт)")
+        return mappings
+    
+    def resolve_best_pair(self, symbol: str, for_convergence: bool = False, max_age: Optional[float] = None,
+                          allow_stale: bool = True) -> Optional[Dict]:
         """
         🚀 MULTI-PROVIDER СИСТЕМА: Apify DexScreener + CoinGecko + DexScreener Fallback
         Максимальне покриття 200+ токенів для арбітражу!
+        Одночасні виклики для того самого символу (воркери, моніторинг, verify_signal) чекають на один запит.
+        ♻️ STALE-WHILE-REVALIDATE: пара старша за best_pair_ttl() (але молодша за жорсткий TTL)
+        повертається одразу, а оновлюється у фоновому пулі. Результат містить age_sec і stale.
+        max_age: найстаріші дані, які приймає виклик (конвергенція - DEX_CONVERGENCE_MAX_AGE_SEC);
+        allow_stale=False - чекати свіжих даних від провайдерів
+        """
+        clean_symbol = symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
+        if for_convergence and max_age is None:
+            max_age = DEX_CONVERGENCE_MAX_AGE_SEC
+        fresh_ttl = self.best_pair_ttl(clean_symbol)
+        fresh_age = fresh_ttl if max_age is None else min(max_age, fresh_ttl)
+        cache_key = self._best_pair_cache_key(clean_symbol, for_convergence)
+        
+        cached = self.token_cache.get(cache_key, namespace='best_pair')
+        if cached:
+            age = time.time() - cached.get('cached_at', 0)
+            if age <= fresh_age:
+                metrics.inc('dex_provider_requests_total', provider='cache', result='hit')
+                return self._with_age(cached, fresh_ttl)
+            if allow_stale and (max_age is None or age <= max_age):
+                self.provider_stats['stale_served'] += 1
+                metrics.inc('dex_provider_requests_total', provider='cache', result='stale')
+                self._schedule_refresh(clean_symbol, for_convergence)
+                return self._with_age(cached, fresh_ttl)
+        
+        result = self._single_flight(cache_key, self._resolve_best_pair, symbol, for_convergence, fresh_age)
+        return self._with_age(result, fresh_ttl) if result else result
+    
+    def best_pair_ttl(self, clean_symbol: str) -> float:
+        """🌡️ Скільки секунд пара символу вважається свіжою: за волатильністю, позиціями і порогом входу"""
+        return min(adaptive_ttl.ttl(clean_symbol, DEX_BEST_PAIR_CACHE_TTL_SEC), DEX_BEST_PAIR_HARD_TTL_SEC)
+    
+    def _with_age(self, pair_data: Dict, fresh_ttl: float) -> Dict:
+        """Копія пари з віком даних (кешований dict спільний для всіх потоків - не змінюємо його)"""
+        age = max(0.0, time.time() - pair_data.get('cached_at', time.time()))
+        return dict(pair_data, age_sec=round(age, 1), stale=age > fresh_ttl)
+    
+    def _schedule_refresh(self, clean_symbol: str, for_convergence: bool):
+        """♻️ Фонове оновлення застарілої пари - одне на ключ, через той самий single-flight"""
+        cache_key = self._best_pair_cache_key(clean_symbol, for_convergence)
+        with self.inflight_lock:
+            if cache_key in self.refreshing:
+                return
+            self.refreshing.add(cache_key)
+        try:
+            self.refresh_executor.submit(self._background_refresh, clean_symbol, for_convergence, cache_key)
+        except RuntimeError:  # пул зупинено
+            with self.inflight_lock:
+                self.refreshing.discard(cache_key)
+    
+    def _background_refresh(self, clean_symbol: str, for_convergence: bool, cache_key: str):
+        set_traffic_lane('refresh')
+        try:
+            self.provider_stats['background_refreshes'] += 1
+            self._single_flight(cache_key, self._resolve_best_pair, clean_symbol, for_convergence)
+        except (Exception, DeadlineExceeded) as e:
+            logging.warning(f"♻️ {clean_symbol}: Помилка фонового оновлення пари: {e}")
+        finally:
+            with self.inflight_lock:
+                self.refreshing.discard(cache_key)
+    
+    def _single_flight(self, key: str, fetch_fn, *args):
+        """
+        🔀 SINGLE-FLIGHT: перший виклик (лідер) робить запит, решта чекають на його Future.
+        Очікування обмежене власним дедлайном виклику; якщо лідера покинуто по дедлайну - запит робить наступний.
         """
+        while True:
+            with self.inflight_lock:
+                future = self.inflight_requests.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self.inflight_requests[key] = future
+                    self.provider_stats['single_flight_leaders'] += 1
+                else:
+                    self.provider_stats['single_flight_coalesced'] += 1
+            
+            if leader:
+                try:
+                    result = fetch_fn(*args)
+                    future.set_result(result)
+                    return result
+                except BaseException as e:
+                    future.set_exception(e)
+                    raise
+                finally:
+                    with self.inflight_lock:
+                        if self.inflight_requests.get(key) is future:
+                            del self.inflight_requests[key]
+            
+            metrics.inc('dex_provider_requests_total', provider='single_flight', result='coalesced')
+            try:
+                return future.result(timeout=remaining())
+            except FutureTimeoutError:
+                raise DeadlineExceeded(f"дедлайн вичерпано: очікування запиту {key}")
+            except DeadlineExceeded:
+                continue  # дедлайн лідера, а не наш - пробуємо стати лідером
+    
+    def _resolve_best_pair(self, symbol: str, for_convergence: bool = False, max_age: Optional[float] = None) -> Optional[Dict]:
         try:
             clean_symbol = symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
             
@@ -192,63 +464,56 @@ class DexCheckClient:
                 logging.warning(f"🚫 {clean_symbol}: Примусово ігноруємо (Hardcoded Ignore)")
                 return None
 
-            # 1. Перевіряємо кеш (окремий для конвергенції)
-            cache_key = f"{clean_symbol}_best_pair{'_convergence' if for_convergence else ''}"
-            if cache_key in self.token_cache:
-                cached_data = self.token_cache[cache_key]
-                # Кеш на 3 хвилини для живих даних
-                if time.time() - cached_data.get('cached_at', 0) < 180:
-                    logging.info(f"💾 {clean_symbol}: Використовуємо кеш")
-                    return cached_data
-            
-            # 2. 🚀 НОВИЙ ПРОВАЙДЕР: Прямі блокчейн пули (безкоштовно!)
+            # 1. Перевіряємо кеш (окремий для конвергенції); пакетний запит по адресі вже в роботі - чекаємо його
+            if not for_convergence:
+                self._wait_pending(self.dexscreener_pending, clean_symbol, "DexScreener batch")
+            cache_key = self._best_pair_cache_key(clean_symbol, for_convergence)
+            cached_data = self.get_cached_best_pair(clean_symbol, for_convergence, max_age)
+            if cached_data:
+                logging.info(f"💾 {clean_symbol}: Використовуємо кеш")
+                metrics.inc('dex_provider_requests_total', provider='cache', result='hit')
+                return cached_data
+            
+            # 🚫 Жоден провайдер ще не має перевіряти символ - весь ланцюжок пропускаємо
+            providers = ['coingecko', 'dexscreener']
             if BLOCKCHAIN_AVAILABLE and blockchain_client:
-                logging.info(f"🔥 {clean_symbol}: Пробуємо прямі блокчейн пули (пріоритетний провайдер)")
-                blockchain_data = self._try_blockchain_direct(clean_symbol, for_convergence)
-                if blockchain_data and blockchain_data.get('price_usd', 0) > 0:
-                    logging.info(f"🚀 {clean_symbol}: BLOCKCHAIN SUCCESS! price=${blockchain_data.get('price_usd', 0):.6f}")
-                    blockchain_data['cached_at'] = time.time()
-                    blockchain_data['provider'] = 'blockchain_direct'
-                    self.token_cache[cache_key] = blockchain_data
-                    return blockchain_data
-                elif blockchain_data:
-                    logging.warning(f"🔥 {clean_symbol}: Блокчейн повернув нульову ціну ${blockchain_data.get('price_usd', 0):.6f}, спробуємо fallback")
-            else:
-                logging.debug(f"⚠️ {clean_symbol}: Блокчейн клієнт недоступний, пропускаємо")
-            
-            # 3. FALLBACK 1: CoinGecko API (безкоштовний, надійний провайдер)
-            coingecko_data = self._try_coingecko(clean_symbol)
-            if coingecko_data and coingecko_data.get('price_usd', 0) > 0:
-                self.provider_stats['coingecko_success'] += 1
-                coingecko_data['cached_at'] = time.time()
-                coingecko_data['provider'] = 'coingecko'
-                self.token_cache[cache_key] = coingecko_data
-                return coingecko_data
-            elif coingecko_data:
-                logging.warning(f"🪙 {clean_symbol}: CoinGecko повернув нульову ціну ${coingecko_data.get('price_usd', 0):.6f}, спробуємо fallback")
-            
-            # 🔄 FALLBACK 2: DexScreener Symbol Search коли Apify і CoinGecko не працюють
-            logging.info(f"🔄 {clean_symbol}: Apify і CoinGecko не знайшли, пробуємо DexScreener fallback...")
-            dexscreener_data = self._try_dexscreener_symbol_search(clean_symbol, for_convergence)
-            if dexscreener_data:
-                logging.info(f"✅ {clean_symbol}: Знайдено через DexScreener fallback")
-                dexscreener_data['cached_at'] = time.time()
-                dexscreener_data['provider'] = 'dexscreener_fallback'
-                self.token_cache[cache_key] = dexscreener_data
-                return dexscreener_data
+                providers.append('blockchain')
+            if self.discovery_client and not for_convergence:
+                providers.append('discovery')
+            if self.negative_cache.backing_off(cache_key, providers):
+                logging.debug(f"🚫 {clean_symbol}: Всі провайдери в негативному кеші, пропускаємо")
+                return None
+            
+            # 2. 🏁 Прямі блокчейн пули / CoinGecko / DexScreener search - в порядку очікуваного часу відповіді,
+            # повільний провайдер страхується hedge запитом до наступного
+            candidates = []
+            if BLOCKCHAIN_AVAILABLE and blockchain_client:
+                candidates.append(('blockchain', self._try_blockchain_direct, (clean_symbol, for_convergence)))
+            candidates.append(('coingecko', self._try_coingecko, (clean_symbol,)))
+            candidates.append(('dexscreener', self._try_dexscreener_symbol_search, (clean_symbol, for_convergence)))
+            winner = self._race_providers(clean_symbol, candidates, cache_key)
+            if winner:
+                provider, data = winner
+                if provider == 'coingecko':
+                    self.provider_stats['coingecko_success'] += 1
+                logging.info(f"✅ {clean_symbol}: {provider} price=${data.get('price_usd', 0):.6f}")
+                return self.store_best_pair(clean_symbol, data, PROVIDER_CACHE_LABELS[provider], for_convergence)
             
             # 🚀 АВТОМАТИЧНЕ РОЗШИРЕННЯ: спробуємо знайти нову адресу
-            if self.discovery_client and not for_convergence:
+            if self.discovery_client and not for_convergence and not self.negative_cache.should_skip('discovery', cache_key):
                 logging.info(f"🔍 {clean_symbol}: Пошук нової контрактної адреси через Discovery API...")
                 try:
                     new_addresses = self.discovery_client.expand_token_database([clean_symbol])
+                    self.negative_cache.record_miss('discovery', cache_key)  # наступний discovery тільки після backoff
                     if new_addresses.get(clean_symbol):
+                        # Нова адреса - провайдери мають перевірити символ знову
+                        self.negative_cache.forget(cache_key, providers=('blockchain', 'coingecko', 'dexscreener'))
                         # Перезавантажуємо token addresses після додання нових
-                        self.token_addresses = self._init_comprehensive_token_mapping()
+                        self.token_addresses = self._with_indexed_addresses(self._init_comprehensive_token_mapping())
                         logging.info(f"♻️ {clean_symbol}: Перезавантажено token mappings після discovery")
                         
                         # Спробуємо ще раз з новою адресою
-                        return self.resolve_best_pair(symbol, for_convergence)
+                        return self._resolve_best_pair(symbol, for_convergence)  # ми вже лідер single-flight
                 except Exception as e:
                     logging.warning(f"🔍 Discovery помилка для {clean_symbol}: {e}")
             
@@ -261,6 +526,115 @@ class DexCheckClient:
             logging.error(f"Критична помилка resolve_best_pair для {symbol}: {e}")
             return None
     
+    def _race_providers(self, clean_symbol: str, candidates: List, negative_key: str) -> Optional[tuple]:
+        """
+        🏁 HEDGED ЗАПИТИ: candidates = [(provider, fn, args)] в статичному порядку.
+        Провайдери запускаються за очікуваним часом відповіді; якщо запущений не відповів за свій p95,
+        паралельно запускається наступний. Виграє перша відповідь з price_usd > 0, решта дозавершуються
+        у фоні (їх латентність і негативний кеш все одно оновлюються). Повертає (provider, data) або None
+        """
+        candidates = [c for c in candidates if not self.negative_cache.should_skip(c[0], negative_key)]
+        calls = {provider: (fn, args) for provider, fn, args in candidates}
+        queue = self.latency_tracker.order([provider for provider, _, _ in candidates], clean_symbol)
+        pending = {}  # Future -> provider
+        hedged = set()
+        hedge_at = None
+        while queue or pending:
+            if queue and (not pending or (hedge_at is not None and time.monotonic() >= hedge_at)):
+                provider = queue.pop(0)
+                if pending:
+                    hedged.add(provider)
+                    logging.debug(f"🏁 {clean_symbol}: {', '.join(pending.values())} не відповів за p95, hedge -> {provider}")
+                fn, args = calls[provider]
+                context = contextvars.copy_context()  # дедлайн і смуга rate governor діють і в потоці hedge
+                future = self.hedge_executor.submit(context.run, self._timed_provider, provider, clean_symbol, fn, args,
+                                                    negative_key)
+                pending[future] = provider
+                hedge_at = time.monotonic() + self.latency_tracker.hedge_delay(provider) if self.hedging_enabled else None
+                continue
+            
+            timeout = max(0.0, hedge_at - time.monotonic()) if queue and hedge_at is not None else None
+            left = remaining()
+            if left is not None:
+                if left <= 0:
+                    raise DeadlineExceeded(f"дедлайн вичерпано: DEX провайдери {clean_symbol}")
+                timeout = left if timeout is None else min(timeout, left)
+            done, _ = futures_wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                provider = pending.pop(future)
+                data = future.result()
+                if data and data.get('price_usd', 0) > 0:
+                    if hedged:
+                        self.latency_tracker.record_hedge(won=provider in hedged)
+                    return provider, data
+                if data:
+                    logging.warning(f"🚨 {clean_symbol}: {provider} повернув нульову ціну, пробуємо інших провайдерів")
+        if hedged:
+            self.latency_tracker.record_hedge(won=False)
+        return None
+    
+    def _timed_provider(self, provider: str, clean_symbol: str, fetch_fn, args: tuple, negative_key: str) -> Optional[Dict]:
+        """Виклик провайдера з записом латентності/успіху в трекер (покинуті по дедлайну виклики не рахуються)"""
+        started_at = time.perf_counter()
+        data = self._call_provider(provider, fetch_fn, *args, negative_key=negative_key)
+        self.latency_tracker.record(provider, clean_symbol, time.perf_counter() - started_at,
+                                    bool(data and data.get('price_usd', 0) > 0))
+        return data
+    
+    def _call_provider(self, provider: str, fetch_fn, *args, negative_key: Optional[str] = None) -> Optional[Dict]:
+        """
+        ⏱️ Виклик провайдера з вимірюванням латентності та лічильником результатів (hit/miss/error)
+        negative_key: ключ негативного кешу - промах відкладає наступну перевірку провайдером
+        """
+        if negative_key and self.negative_cache.should_skip(provider, negative_key):
+            metrics.inc('dex_provider_requests_total', provider=provider, result='negative_cached')
+            return None
+        started_at = time.perf_counter()
+        result = 'error'
+        try:
+            data = fetch_fn(*args)
+            result = 'hit' if data else 'miss'
+            if negative_key:
+                if data:
+                    self.negative_cache.record_hit(provider, negative_key)
+                else:
+                    self.negative_cache.record_miss(provider, negative_key)
+            return data
+        finally:
+            metrics.observe('dex_provider_seconds', time.perf_counter() - started_at, provider=provider)
+            metrics.inc('dex_provider_requests_total', provider=provider, result=result)
+    
+    def get_provider_stats(self) -> Dict:
+        """📊 Лічильники провайдерів + стан негативного кешу"""
+        stats = dict(self.provider_stats)
+        stats['negative_cache'] = self.negative_cache.get_stats()
+        stats['pair_index'] = self.pair_index.get_stats()
+        stats['latency'] = self.latency_tracker.get_stats()
+        return stats
+    
+    def _best_pair_cache_key(self, clean_symbol: str, for_convergence: bool = False) -> str:
+        return f"{clean_symbol}_best_pair{'_convergence' if for_convergence else ''}"
+    
+    def get_cached_best_pair(self, symbol: str, for_convergence: bool = False, max_age: Optional[float] = None) -> Optional[Dict]:
+        """💾 Пара з кешу не старша за max_age (за замовчуванням best_pair_ttl()) або None - без мережевих запитів"""
+        clean_symbol = symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
+        cached = self.token_cache.get(self._best_pair_cache_key(clean_symbol, for_convergence), namespace='best_pair')
+        max_age = self.best_pair_ttl(clean_symbol) if max_age is None else max_age
+        if cached and time.time() - cached.get('cached_at', 0) <= max_age:
+            return cached
+        return None
+    
+    def store_best_pair(self, symbol: str, pair_data: Dict, provider: str, for_convergence: bool = False) -> Dict:
+        """💾 Зберігає знайдену пару у спільний кеш і в індекс пар (якщо пара має адреси)"""
+        clean_symbol = symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
+        pair_data['cached_at'] = time.time()
+        pair_data['provider'] = provider
+        adaptive_ttl.observe(clean_symbol, pair_data.get('price_usd'),
+                             pair_data.get('price_change_m5'), pair_data.get('price_change_h1'))
+        self.pair_index.record(clean_symbol, pair_data)
+        return self.token_cache.set(self._best_pair_cache_key(clean_symbol, for_convergence), pair_data,
+                                    namespace='best_pair')
+    
     def _try_blockchain_direct(self, symbol: str, for_convergence: bool = False) -> Optional[Dict]:
         """
         🚀 НОВИЙ ПРОВАЙДЕР: Прямі блокчейн пули для максимального покриття токенів
@@ -314,103 +688,17 @@ class DexCheckClient:
         🚀 CoinGecko API - безкоштовний, надійний провайдер даних
         Використовує CoinGecko token IDs для отримання актуальних цін
         """
-        # Mapping символів на CoinGecko token IDs
-        symbol_to_coingecko = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum', 
-            'USDT': 'tether',
-            'BNB': 'binancecoin',
-            'XRP': 'ripple',
-            'ADA': 'cardano',
-            'SOL': 'solana',
-            'DOGE': 'dogecoin',
-            'DOT': 'polkadot',
-            'MATIC': 'matic-network',
-            'LTC': 'litecoin',
-            'AVAX': 'avalanche-2',
-            'UNI': 'uniswap',
-            'LINK': 'chainlink',
-            'ATOM': 'cosmos',
-            'XLM': 'stellar',
-            'NEAR': 'near',
-            'FTM': 'fantom',
-            'ALGO': 'algorand',
-            'VET': 'vechain',
-            'ICP': 'internet-computer',
-            'SAND': 'the-sandbox',
-            'MANA': 'decentraland',
-            'FIL': 'filecoin',
-            'APT': 'aptos',
-            'OP': 'optimism',
-            'ARB': 'arbitrum',
-            'IMX': 'immutable-x',
-            'GALA': 'gala',
-            'CHZ': 'chiliz',
-            'FLOW': 'flow',
-            'KAVA': 'kava',
-            'CELO': 'celo',
-            'ONE': 'harmony',
-            'ZIL': 'zilliqa',
-            'ICX': 'icon',
-            'QTUM': 'qtum',
-            'BAT': 'basic-attention-token',
-            'ZRX': '0x',
-            'ONT': 'ontology',
-            'IOST': 'iostoken',
-            'HOT': 'holotoken',
-            'DGB': 'digibyte',
-            'RVN': 'ravencoin',
-            'WAVES': 'waves',
-            'NANO': 'nano',
-            'SC': 'siacoin',
-            'DASH': 'dash',
-            'ZEC': 'zcash',
-            'XMR': 'monero',
-            'DCR': 'decred',
-            'COMP': 'compound-governance-token',
-            'YFI': 'yearn-finance',
-            'SNX': 'havven',
-            'AAVE': 'aave',
-            'MKR': 'maker',
-            'CRV': 'curve-dao-token',
-            'SUSHI': 'sushi',
-            'GRT': 'the-graph',
-            'LRC': 'loopring',
-            'KNC': 'kyber-network-crystal',
-            '1INCH': '1inch',
-            'FET': 'fetch-ai',
-            'OCEAN': 'ocean-protocol',
-            'NKN': 'nkn',
-            'ANKR': 'ankr',
-            'STORJ': 'storj',
-            'CTK': 'certik',
-            'DENT': 'dent',
-            'WRX': 'wazirx',
-            'SFP': 'safemoon',
-            'TLM': 'alien-worlds',
-            'ALICE': 'myneighboralice',
-            'AUDIO': 'audius',
-            'C98': 'coin98',
-            'DYDX': 'dydx',
-            'ENS': 'ethereum-name-service',
-            'GALA': 'gala',
-            'IMX': 'immutable-x',
-            'LDO': 'lido-dao',
-            'LOOKS': 'looksrare',
-            'PEOPLE': 'constitutiondao',
-            'RACA': 'radio-caca',
-            'SPELL': 'spell-token',
-            'SYN': 'synapse-2',
-            'TRIBE': 'tribe-2',
-            'UNFI': 'unifi-protocol-dao',
-            'YGG': 'yield-guild-games'
-        }
         
-        coingecko_id = symbol_to_coingecko.get(symbol.upper())
+        coingecko_id = SYMBOL_TO_COINGECKO.get(symbol.upper())
         if not coingecko_id:
             logging.info(f"🔄 {symbol}: Немає CoinGecko ID mapping, пропускаємо CoinGecko")
             return None
         
+        # 📦 Ціна з пакетного запиту sweep'у - без окремого HTTP виклику
+        batched = self._get_batched_coingecko(symbol.upper())
+        if batched is not None:
+            return batched or None
+        
         try:
             # Rate limiting для CoinGecko (50 calls/min = ~1.2s між запитами)
             self._apply_rate_limit('coingecko', min_interval=1.2)
@@ -429,7 +717,7 @@ class DexCheckClient:
             # INFO-level logging з правильними параметрами
             logging.info(f"🪙 Пробуємо CoinGecko: {symbol} (id={coingecko_id})")
             
-            response = self.coingecko_session.get(url, params=params, timeout=20)
+            response = self.coingecko_session.get(url, params=params, timeout=clamp_timeout(20, f"CoinGecko {symbol}"))
             
             if response.status_code == 200:
                 data = response.json()
@@ -452,6 +740,7 @@ class DexCheckClient:
                         
             elif response.status_code == 429:
                 self.provider_stats['coingecko_429'] += 1
+                rate_governor.throttle('coingecko', retry_after_seconds(response, 30))
                 logging.warning(f"🚨 CoinGecko rate limit hit для {symbol}")
                 return None
             else:
@@ -464,6 +753,246 @@ class DexCheckClient:
         return None
     
     
+    def _coingecko_cache_key(self, clean_symbol: str) -> str:
+        return f"{clean_symbol}_coingecko"
+    
+    def _get_batched_coingecko(self, clean_symbol: str) -> Optional[Dict]:
+        """
+        📦 Результат пакетного запиту: dict з даними, {} якщо CoinGecko не повернув id,
+        None якщо символ не завантажувався пакетом (тоді окремий запит)
+        """
+        self._wait_pending(self.coingecko_pending, clean_symbol, "CoinGecko batch")
+        cached = self.token_cache.get(self._coingecko_cache_key(clean_symbol), namespace='coingecko')
+        if not cached:
+            return None
+        return {} if cached.get('coingecko_missing') else dict(cached)
+    
+    def _wait_pending(self, pending_map: Dict, clean_symbol: str, what: str):
+        """Чекає завершення пакетного запиту, в якому вже є символ (в межах дедлайну оцінки)"""
+        with self.inflight_lock:
+            pending = pending_map.get(clean_symbol)
+        if pending is not None:
+            pending.wait(timeout=clamp_timeout(20, f"{what} {clean_symbol}"))
+    
+    def _register_pending(self, pending_map: Dict, chunks: List[List[str]], symbols_by_key: Dict[str, List[str]]):
+        """Реєструє символи всіх chunk'ів як такі, що вже завантажуються. Повертає Event на кожен chunk"""
+        events = [threading.Event() for _ in chunks]
+        with self.inflight_lock:
+            for chunk, event in zip(chunks, events):
+                for key in chunk:
+                    for clean_symbol in symbols_by_key[key]:
+                        pending_map.setdefault(clean_symbol, event)
+        return events
+    
+    def _release_pending(self, pending_map: Dict, chunk: List[str], symbols_by_key: Dict[str, List[str]], event):
+        with self.inflight_lock:
+            for key in chunk:
+                for clean_symbol in symbols_by_key[key]:
+                    if pending_map.get(clean_symbol) is event:
+                        del pending_map[clean_symbol]
+        event.set()
+    
+    def schedule_prefetch(self, symbols) -> bool:
+        """📦 Фонове пакетне завантаження для символів sweep'у (не блокує диспетчер): DexScreener по адресах, потім CoinGecko"""
+        if self.prefetch_thread and self.prefetch_thread.is_alive():
+            return False
+        self.prefetch_thread = threading.Thread(target=self._prefetch_sweep, args=(list(symbols),),
+                                                name="dex-prefetch", daemon=True)
+        self.prefetch_thread.start()
+        return True
+    
+    def _prefetch_sweep(self, symbols):
+        try:
+            if BLOCKCHAIN_AVAILABLE and blockchain_client:
+                blockchain_client.refresh_all_reserves()  # ціни всіх EVM пулів: один Multicall на мережу
+            self.prefetch_dexscreener_addresses(symbols)
+            self.prefetch_coingecko(symbols)  # тільки символи, для яких DexScreener не знайшов пару
+            if time.time() - self.pair_index_refreshed_at >= PAIR_INDEX_REFRESH_INTERVAL_SEC:
+                self.refresh_pair_index()
+        except Exception as e:
+            logging.error(f"❌ Помилка пакетного завантаження DEX даних: {e}")
+    
+    def prefetch_coingecko(self, symbols) -> int:
+        """
+        📦 Пакетні CoinGecko запити: до COINGECKO_BATCH_SIZE ids в одному simple/price запиті замість
+        запиту на кожен символ. Пропускає символи зі свіжим кешем пари або CoinGecko ціни.
+        Повертає кількість символів з отриманою ціною
+        """
+        pending = {}  # coingecko_id -> [clean_symbol]
+        for symbol in symbols:
+            clean_symbol = symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
+            coingecko_id = SYMBOL_TO_COINGECKO.get(clean_symbol)
+            if not coingecko_id or self.get_cached_best_pair(clean_symbol):
+                continue
+            if self.token_cache.get(self._coingecko_cache_key(clean_symbol), namespace='coingecko'):
+                continue
+            if self.negative_cache.should_skip('coingecko', self._best_pair_cache_key(clean_symbol)):
+                continue
+            pending.setdefault(coingecko_id, []).append(clean_symbol)
+        
+        ids = list(pending)
+        chunks = [ids[i:i + COINGECKO_BATCH_SIZE] for i in range(0, len(ids), COINGECKO_BATCH_SIZE)]
+        events = self._register_pending(self.coingecko_pending, chunks, pending)
+        
+        fetched = 0
+        for chunk, event in zip(chunks, events):
+            try:
+                fetched += self._fetch_coingecko_chunk(chunk, pending)
+            finally:
+                self._release_pending(self.coingecko_pending, chunk, pending, event)
+        if ids:
+            logging.info(f"📦 CoinGecko batch: {fetched}/{sum(len(v) for v in pending.values())} символів за {len(chunks)} запитів")
+        return fetched
+    
+    def _fetch_coingecko_chunk(self, chunk: List[str], pending: Dict[str, List[str]]) -> int:
+        started_at = time.perf_counter()
+        result = 'error'
+        fetched = 0
+        try:
+            self._apply_rate_limit('coingecko', min_interval=1.2)
+            params = {
+                'ids': ','.join(chunk),
+                'vs_currencies': 'usd',
+                'include_market_cap': 'true',
+                'include_24hr_vol': 'true',
+                'include_24hr_change': 'true'
+            }
+            response = self.coingecko_session.get(f"{self.coingecko_base_url}/simple/price", params=params, timeout=20)
+            if response.status_code == 429:
+                self.provider_stats['coingecko_429'] += 1
+                rate_governor.throttle('coingecko', retry_after_seconds(response, 30))
+                logging.warning(f"🚨 CoinGecko rate limit hit для пакету з {len(chunk)} ids")
+                return 0
+            if response.status_code != 200:
+                logging.warning(f"🚨 CoinGecko batch {response.status_code}: {response.text[:200]}")
+                return 0
+            
+            data = response.json() or {}
+            now = time.time()
+            for coingecko_id in chunk:
+                token_data = data.get(coingecko_id)
+                for clean_symbol in pending[coingecko_id]:
+                    parsed = None
+                    if isinstance(token_data, dict) and token_data.get('usd'):
+                        parsed = self._parse_coingecko_response(token_data, clean_symbol, coingecko_id)
+                    entry = parsed or {'price_usd': 0, 'coingecko_missing': True}
+                    entry['cached_at'] = now
+                    self.token_cache.set(self._coingecko_cache_key(clean_symbol), entry, namespace='coingecko')
+                    fetched += bool(parsed)
+            result = 'hit' if fetched else 'miss'
+            return fetched
+        except Exception as e:
+            logging.warning(f"🚨 CoinGecko batch exception: {e}")
+            return fetched
+        finally:
+            metrics.observe('dex_provider_seconds', time.perf_counter() - started_at, provider='coingecko_batch')
+            metrics.inc('dex_provider_requests_total', provider='coingecko_batch', result=result)
+    
+    def has_direct_pool(self, clean_symbol: str) -> bool:
+        """Токени з прямими блокчейн пулами резолвляться on-chain (пріоритет над агрегаторами)"""
+        if not BLOCKCHAIN_AVAILABLE or blockchain_client is None:
+            return False
+        return any(clean_symbol in pools for pools in blockchain_client.pools.values())
+    
+    def prefetch_dexscreener_addresses(self, symbols) -> int:
+        """
+        📦 Пакетний DexScreener по контрактних адресах (token_addresses.json + індекс пар): до DEXSCREENER_BATCH_SIZE
+        адрес в одному /tokens запиті замість пошуку по символу з паузою 1с на кожен.
+        Знайдені пари (ті самі фільтри select_dexscreener_pair) йдуть в кеш пар; символи без якісної пари
+        потрапляють в негативний кеш DexScreener (пошук по символу для них знайшов би чужі токени).
+        Повертає кількість символів зі знайденою парою
+        """
+        by_address = {}  # address.lower() -> [clean_symbol]
+        addresses = {}   # address.lower() -> адреса як у мапінгу (Solana чутлива до регістру)
+        for symbol in symbols:
+            clean_symbol = symbol.replace('/USDT:USDT', '').replace('/USDT', '').upper()
+            address = self.token_addresses.get(clean_symbol, {}).get('address')
+            if not address or self.get_cached_best_pair(clean_symbol) or self.has_direct_pool(clean_symbol):
+                continue
+            if self.negative_cache.should_skip('dexscreener', self._best_pair_cache_key(clean_symbol)):
+                continue
+            by_address.setdefault(address.lower(), []).append(clean_symbol)
+            addresses[address.lower()] = address
+        
+        return self._fetch_dexscreener_batches(by_address, addresses)
+    
+    def refresh_pair_index(self) -> int:
+        """
+        🗂️ Фонова перевірка індексу пар: записи, не перевірені PAIR_INDEX_REFRESH_AGE_SEC, - тим самим пакетним
+        /tokens запитом. Підтверджена пара оновлює verified_at (store_best_pair -> record), тож індекс не втрачає
+        пари символів, які пре-скрин зараз відсіює. Повертає кількість підтверджених записів
+        """
+        self.pair_index_refreshed_at = time.time()
+        by_address = {}
+        addresses = {}
+        for entry in self.pair_index.stale(PAIR_INDEX_REFRESH_AGE_SEC, PAIR_INDEX_REFRESH_BATCH):
+            address = entry['token_address']
+            if self.negative_cache.should_skip('dexscreener', self._best_pair_cache_key(entry['symbol'])):
+                continue
+            by_address.setdefault(address.lower(), []).append(entry['symbol'])
+            addresses[address.lower()] = address
+        if not by_address:
+            return 0
+        confirmed = self._fetch_dexscreener_batches(by_address, addresses)
+        logging.info(f"🗂️ PAIR INDEX: фонова перевірка - підтверджено {confirmed}/{len(by_address)} пар")
+        return confirmed
+    
+    def _fetch_dexscreener_batches(self, by_address: Dict[str, List[str]], addresses: Dict[str, str]) -> int:
+        """Пакети по DEXSCREENER_BATCH_SIZE адрес; потоки з промахом тих самих символів чекають пакет"""
+        keys = list(by_address)
+        chunks = [keys[i:i + DEXSCREENER_BATCH_SIZE] for i in range(0, len(keys), DEXSCREENER_BATCH_SIZE)]
+        events = self._register_pending(self.dexscreener_pending, chunks, by_address)
+        
+        started_at = time.time()
+        found = 0
+        for chunk, event in zip(chunks, events):
+            try:
+                found += self._fetch_dexscreener_chunk([addresses[key] for key in chunk], by_address)
+            finally:
+                self._release_pending(self.dexscreener_pending, chunk, by_address, event)
+        if keys:
+            logging.info(f"📦 DexScreener batch: {found}/{sum(len(v) for v in by_address.values())} символів "
+                         f"за {len(chunks)} запитів ({time.time() - started_at:.1f}с)")
+        return found
+    
+    def _fetch_dexscreener_chunk(self, chunk: List[str], by_address: Dict[str, List[str]]) -> int:
+        started_at = time.perf_counter()
+        result = 'error'
+        found = 0
+        try:
+            self._apply_rate_limit('dexscreener_tokens', 0.25)  # /tokens: ~300 запитів/хв
+            response = self.dexscreener_session.get(f"{self.dexscreener_base_url}/tokens/{','.join(chunk)}", timeout=20)
+            if response.status_code == 429:
+                rate_governor.throttle('dexscreener_tokens', retry_after_seconds(response, 10))
+            if response.status_code != 200:
+                logging.warning(f"🚨 DexScreener batch {response.status_code} для {len(chunk)} адрес")
+                return 0
+            
+            pairs_by_address = {}
+            for pair in (response.json() or {}).get('pairs') or []:
+                base_address = (pair.get('baseToken') or {}).get('address', '').lower()
+                if base_address in by_address:
+                    pairs_by_address.setdefault(base_address, []).append(pair)
+            
+            for address in chunk:
+                for clean_symbol in by_address[address.lower()]:
+                    negative_key = self._best_pair_cache_key(clean_symbol)
+                    pair_data = self.select_dexscreener_pair(clean_symbol, pairs_by_address.get(address.lower(), []))
+                    if pair_data:
+                        self.store_best_pair(clean_symbol, pair_data, 'dexscreener_batch')
+                        self.negative_cache.record_hit('dexscreener', negative_key)
+                        found += 1
+                    else:
+                        self.negative_cache.record_miss('dexscreener', negative_key)
+            result = 'hit' if found else 'miss'
+            return found
+        except Exception as e:
+            logging.warning(f"🚨 DexScreener batch exception: {e}")
+            return found
+        finally:
+            metrics.observe('dex_provider_seconds', time.perf_counter() - started_at, provider='dexscreener_batch')
+            metrics.inc('dex_provider_requests_total', provider='dexscreener_batch', result=result)
+    
     def _try_dexscreener_symbol_search(self, symbol: str, for_convergence: bool = False) -> Optional[Dict]:
         """
         🔄 ДОДАТКОВИЙ FALLBACK: пошук по символу через DexScreener search API
@@ -476,7 +1005,9 @@ class DexCheckClient:
             # Symbol-based search через DexScreener search API
             search_url = f"https://api.dexscreener.com/latest/dex/search/?q={symbol}"
             
-            response = self.dexscreener_session.get(search_url, timeout=20)
+            response = self.dexscreener_session.get(search_url, timeout=clamp_timeout(20, f"DexScreener {symbol}"))
+            if response.status_code == 429:
+                rate_governor.throttle('dexscreener', retry_after_seconds(response, 10))
             if response.status_code != 200:
                 logging.debug(f"🔄 {symbol}: DexScreener search endpoint {response.status_code}")
                 return None
@@ -486,10 +1017,22 @@ class DexCheckClient:
                 logging.debug(f"🔄 {symbol}: DexScreener search no pairs for {symbol}")
                 return None
             
+            return self.select_dexscreener_pair(symbol, data['pairs'], for_convergence)
+            
+        except Exception as e:
+            logging.debug(f"DexScreener symbol search помилка для {symbol}: {e}")
+            return None
+    
+    def select_dexscreener_pair(self, symbol: str, raw_pairs: List[Dict], for_convergence: bool = False) -> Optional[Dict]:
+        """
+        🎯 Вибір найкращої пари з сирої відповіді DexScreener (спільний для sync та async сканування)
+        Фільтри: ALLOWED_CHAINS, точний символ, ALLOWED_DEX_PROVIDERS, мін. ліквідність і об'єм
+        """
+        try:
             # Фільтруємо по всім дозволеним мережам з config.ALLOWED_CHAINS
             from config import ALLOWED_CHAINS
             allowed_chains = ALLOWED_CHAINS
-            filtered_pairs = [p for p in data['pairs'] if p.get('chainId') in allowed_chains]
+            filtered_pairs = [p for p in raw_pairs if p.get('chainId') in allowed_chains]
             
             if not filtered_pairs:
                 logging.debug(f"🔄 {symbol}: No BSC/ETH pairs found in search")
@@ -538,6 +1081,10 @@ class DexCheckClient:
                         'dex_id': dex_name,
                         'base_symbol': symbol,
                         'quote_symbol': 'USDT',
+                        'quote_token_symbol': pair.get('quoteToken', {}).get('symbol', ''),
+                        'pair_created_at': pair.get('pairCreatedAt'),
+                        'price_change_m5': (pair.get('priceChange') or {}).get('m5'),
+                        'price_change_h1': (pair.get('priceChange') or {}).get('h1'),
                         'token_address': pair.get('baseToken', {}).get('address', ''),
                         'market_cap': float(pair.get('marketCap', 0)),
                         'pair_address': pair_address,
@@ -553,7 +1100,7 @@ class DexCheckClient:
             return None
             
         except Exception as e:
-            logging.debug(f"DexScreener symbol search помилка для {symbol}: {e}")
+            logging.debug(f"DexScreener вибір пари помилка для {symbol}: {e}")
             return None
     
     def _parse_dexcheck_response(self, data: Dict, symbol: str, token_info: Dict) -> Optional[Dict]:
@@ -747,18 +1294,10 @@ class DexCheckClient:
     
     def _apply_rate_limit(self, provider: str, min_interval: float):
         """
-        ⏱️ Rate limiting з exponential backoff
+        ⏱️ Токен зі спільного лімітера провайдера (RATE_GOVERNOR_LIMITS).
+        min_interval - ліміт для провайдера без налаштувань у конфігу
         """
-        import time
-        current_time = time.time()
-        last_time = self.last_request_time.get(provider, 0)
-        
-        time_since_last = current_time - last_time
-        if time_since_last < min_interval:
-            sleep_time = min_interval - time_since_last
-            time.sleep(sleep_time)
-        
-        self.last_request_time[provider] = int(time.time())
+        rate_governor.acquire(provider, default_rate=1.0 / min_interval)
     
     def _get_token_address(self, symbol: str, chain: str) -> Optional[str]:
         """
@@ -766,8 +1305,9 @@ class DexCheckClient:
         """
         # Спочатку перевіряємо кеш
         cache_key = f"{symbol}_{chain}"
-        if cache_key in self.token_cache:
-            return self.token_cache[cache_key].get('address')
+        cached = self.token_cache.get(cache_key, namespace='address')
+        if cached:
+            return cached.get('address')
         
         # Перевіряємо вбудовані відомі адреси
         known_addresses = self._get_known_token_addresses()
@@ -10,13 +10,14 @@ import csv
 import io
 import os
 from datetime import datetime, timedelta
-from flask import Flask, jsonify, request, render_template, send_file
+from flask import Flask, jsonify, request, render_template, send_file, Response
 
 # Import existing modules
 import admin
 import bot
 import config
 from utils import test_telegram_configuration
+from metrics import metrics
 
 # Configure logging
 logging.basicConfig(
@@ -126,6 +127,16 @@ def health():
         'deployment_ready': True
     }), 200
 
+@app.route('/metrics')
+def prometheus_metrics():
+    """⏱️ Prometheus метрики: гістограми етапів сканування та лічильники DEX провайдерів"""
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/api/metrics/latency')
+def api_latency_metrics():
+    """API endpoint: p50/p99 по етапах для налаштування паралельності"""
+    return jsonify(metrics.summary())
+
 @app.route('/status')
 def status():
     """Detailed status endpoint"""
@@ -264,12 +275,33 @@ def api_bot_status():
             'last_signal': 'CELR/USDT +3.48% spread',
             'xt_connection': 'Connected' if bot_status['trading_bot'] == 'running' else 'Disconnected',
             'monitoring': bot_status['monitoring'] == 'running',
-            'telegram_bot': bot_status['telegram_bot'] == 'running'
+            'telegram_bot': bot_status['telegram_bot'] == 'running',
+            'scanner': bot.get_scanner_stats()
         })
     except Exception as e:
         logging.error(f"Помилка API bot status: {e}")
         return jsonify({'error': str(e), 'running': False}), 500
 
+@app.route('/api/scanner/schedule')
+def api_scanner_schedule():
+    """API endpoint: пріоритети та інтервали сканування символів"""
+    try:
+        limit = int(request.args.get('limit', 200))
+        return jsonify(bot.get_scan_schedule(limit=limit))
+    except Exception as e:
+        logging.error(f"Помилка API scanner schedule: {e}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/scanner/price-ttls')
+def api_scanner_price_ttls():
+    """API endpoint: адаптивні TTL кешів цін по символах"""
+    try:
+        limit = int(request.args.get('limit', 200))
+        return jsonify(bot.get_price_ttls(limit=limit))
+    except Exception as e:
+        logging.error(f"Помилка API price ttls: {e}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/trading-history')
 def api_trading_history():
     """API endpoint for trading history"""
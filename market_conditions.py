@@ -410,28 +410,26 @@ from typing import Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import numpy as np
 
+from ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 class MarketConditionsMonitor:
     """Моніторинг ринкових умов для автоматичного переключення режимів"""
     
     def __init__(self):
-        self.cache = {}
         self.cache_ttl = 60  # Кешування на 1 хвилину
+        self.cache = TTLCache('market_conditions', default_ttl=self.cache_ttl, max_entries=100, stripes=1)
         self.btc_price_history = []  # Історія цін BTC для розрахунку зміни
         self.max_history_size = 100  # Зберігаємо останні 100 записів
         
     def _get_cached_data(self, key: str) -> Optional[any]:
         """Отримати дані з кешу"""
-        if key in self.cache:
-            timestamp, data = self.cache[key]
-            if time.time() - timestamp < self.cache_ttl:
-                return data
-        return None
+        return self.cache.get(key)
     
     def _cache_data(self, key: str, data: any):
         """Зберегти дані в кеш"""
-        self.cache[key] = (time.time(), data)
+        self.cache.set(key, data)
     
     def get_btc_rsi(self, period: int = 14) -> Optional[float]:
         """
@@ -0,0 +1,178 @@
+"""
+📸 MARKET DATA SNAPSHOT: Один bulk запит fetch_tickers замість ~3 запитів на символ
+Всі воркери, моніторинг позицій та перевірка ордербуку читають ціни з одного знімка.
+Кожна ціна повертається разом з віком знімка (snapshot_age, секунди).
+"""
+import time
+import logging
+import threading
+
+from config import XT_TICKER_SNAPSHOT_INTERVAL_SEC, XT_TICKER_SNAPSHOT_MAX_AGE_SEC
+from deadline import check_deadline
+from rate_governor import rate_governor, set_traffic_lane
+
+
+class XTTickerSnapshot:
+    """📸 Знімок всіх swap тікерів XT.com, оновлюється одним fetch_tickers"""
+
+    def __init__(self, refresh_interval=XT_TICKER_SNAPSHOT_INTERVAL_SEC, max_age=XT_TICKER_SNAPSHOT_MAX_AGE_SEC):
+        self.exchange = None
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.tickers = {}
+        self.updated_at = 0.0
+        self.data_lock = threading.Lock()
+        self.refresh_lock = threading.Lock()  # тільки один потік робить bulk запит
+        self.refresh_thread = None
+        self.stats = {
+            'bulk_refreshes': 0,
+            'bulk_failures': 0,
+            'snapshot_hits': 0,
+            'single_fallbacks': 0,
+            'last_refresh_duration': 0.0,
+        }
+
+    def bind(self, exchange):
+        """Прив'язує знімок до XT клієнта (викликається з init_markets)"""
+        self.exchange = exchange
+
+    # ------------------------------------------------------------------
+    # 🔄 Оновлення
+    # ------------------------------------------------------------------
+    def refresh(self):
+        """Один bulk запит fetch_tickers для всіх swap пар"""
+        if self.exchange is None:
+            return False
+        started_at = time.time()
+        try:
+            rate_governor.acquire('xt_public')
+            tickers = self.exchange.fetch_tickers()
+        except Exception as e:
+            self.stats['bulk_failures'] += 1
+            logging.warning(f"⚠️ XT SNAPSHOT: Помилка bulk fetch_tickers: {e}")
+            return False
+        if not tickers:
+            self.stats['bulk_failures'] += 1
+            return False
+        self.store(tickers, started_at)
+        return True
+
+    def store(self, tickers, started_at=None):
+        """Атомарно підміняє знімок (також використовується async рушієм сканування)"""
+        with self.data_lock:
+            self.tickers = tickers
+            self.updated_at = time.time()
+        self.stats['bulk_refreshes'] += 1
+        if started_at:
+            self.stats['last_refresh_duration'] = time.time() - started_at
+        logging.debug(f"📸 XT SNAPSHOT: {len(tickers)} тікерів за {self.stats['last_refresh_duration']:.2f}с")
+
+    def _ensure_fresh(self, max_age):
+        """Оновлює знімок якщо він старший за max_age (single-flight)"""
+        if self.age() <= max_age:
+            return
+        with self.refresh_lock:
+            # Інший потік міг вже оновити знімок поки ми чекали
+            if self.age() <= max_age:
+                return
+            self.refresh()
+
+    def start(self, stop_event):
+        """Фоновий потік: bulk оновлення кожні refresh_interval секунд"""
+        if self.refresh_thread and self.refresh_thread.is_alive():
+            return
+
+        def _loop():
+            set_traffic_lane('snapshot')
+            while not stop_event.is_set():
+                with self.refresh_lock:
+                    self.refresh()
+                stop_event.wait(timeout=self.refresh_interval)
+
+        self.refresh_thread = threading.Thread(target=_loop, name="xt-ticker-snapshot", daemon=True)
+        self.refresh_thread.start()
+        logging.info(f"📸 XT SNAPSHOT: Фонове оновлення тікерів кожні {self.refresh_interval}с")
+
+    # ------------------------------------------------------------------
+    # 📖 Читання
+    # ------------------------------------------------------------------
+    def age(self):
+        """Вік знімка в секундах (inf якщо знімка ще немає)"""
+        if not self.updated_at:
+            return float('inf')
+        return time.time() - self.updated_at
+
+    def peek(self, symbol, max_age=None):
+        """Тікер зі знімка БЕЗ мережевих запитів (для event loop). None якщо немає або застарів"""
+        max_age = self.max_age if max_age is None else max_age
+        with self.data_lock:
+            ticker = self.tickers.get(symbol)
+            updated_at = self.updated_at
+        age = time.time() - updated_at
+        if ticker is None or age > max_age:
+            return None
+        self.stats['snapshot_hits'] += 1
+        result = dict(ticker)
+        result['snapshot_ts'] = updated_at
+        result['snapshot_age'] = age
+        return result
+
+    def last_prices(self, max_age=None):
+        """{symbol: last} для всіх тікерів знімка БЕЗ мережі (порожньо якщо знімок застарів)"""
+        max_age = self.max_age if max_age is None else max_age
+        with self.data_lock:
+            tickers = self.tickers
+            updated_at = self.updated_at
+        if not tickers or time.time() - updated_at > max_age:
+            return {}
+        return {symbol: ticker.get('last') for symbol, ticker in tickers.items()}
+
+    def get_ticker(self, symbol, max_age=None):
+        """
+        Тікер символу з знімка (копія) з доданими полями snapshot_age та snapshot_ts.
+        Якщо знімок застарів і не оновився або символу немає - fallback на окремий fetch_ticker.
+        """
+        max_age = self.max_age if max_age is None else max_age
+        self._ensure_fresh(max_age)
+
+        result = self.peek(symbol, max_age=max_age)
+        if result is not None:
+            return result
+
+        # Fallback: окремий запит тільки для цього символу
+        if self.exchange is None:
+            return None
+        check_deadline(f"XT ticker {symbol}")
+        try:
+            self.stats['single_fallbacks'] += 1
+            rate_governor.acquire('xt_public')
+            ticker = self.exchange.fetch_ticker(symbol)
+        except Exception as e:
+            logging.debug(f"XT SNAPSHOT: fallback fetch_ticker {symbol} помилка: {e}")
+            return None
+        if not ticker:
+            return None
+        result = dict(ticker)
+        result['snapshot_ts'] = time.time()
+        result['snapshot_age'] = 0.0
+        return result
+
+    def get_price(self, symbol, max_age=None):
+        """Повертає (last_price, snapshot_age) або (None, None)"""
+        ticker = self.get_ticker(symbol, max_age=max_age)
+        if not ticker or ticker.get('last') is None:
+            return None, None
+        try:
+            return float(ticker['last']), ticker['snapshot_age']
+        except (TypeError, ValueError):
+            return None, None
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['symbols'] = len(self.tickers)
+        stats['age_sec'] = round(self.age(), 2) if self.updated_at else None
+        return stats
+
+
+# 🌍 Глобальний знімок тікерів XT
+xt_ticker_snapshot = XTTickerSnapshot()
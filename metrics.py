@@ -0,0 +1,217 @@
+"""
+⏱️ METRICS: Легкі таймери етапів сканування з HDR-подібними гістограмами та лічильниками
+Етапи symbol_worker, monitor_open_positions, verify_signal та DEX провайдери записують
+тривалість в лог-лінійні гістограми (p50/p99 без зберігання кожного виміру).
+Експорт у форматі Prometheus text через /metrics у main.py.
+"""
+import time
+import math
+import bisect
+import threading
+import functools
+
+
+def _hdr_bounds(lowest=0.0001, highest=120.0, sub_buckets=4):
+    """Верхні межі кошиків: кожне подвоєння ділиться на sub_buckets (відносна похибка ~19%)"""
+    bounds = []
+    value = lowest
+    factor = 2 ** (1.0 / sub_buckets)
+    while value < highest:
+        bounds.append(value)
+        value *= factor
+    bounds.append(highest)
+    return bounds
+
+
+HISTOGRAM_BOUNDS = _hdr_bounds()
+
+
+class LatencyHistogram:
+    """📊 Гістограма тривалостей (секунди) з фіксованими лог-лінійними кошиками"""
+
+    def __init__(self, bounds=HISTOGRAM_BOUNDS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # останній кошик = +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        index = bisect.bisect_left(self.bounds, seconds)
+        with self.lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, pct):
+        """Верхня межа кошика, в який потрапляє pct-й перцентиль"""
+        with self.lock:
+            if not self.count:
+                return 0.0
+            rank = max(1, math.ceil(self.count * pct / 100.0))
+            seen = 0
+            for index, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= rank:
+                    return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def snapshot(self):
+        with self.lock:
+            return list(self.counts), self.count, self.total
+
+
+class MetricsRegistry:
+    """⏱️ Реєстр гістограм і лічильників з мітками (label) у стилі Prometheus"""
+
+    def __init__(self):
+        self.histograms = {}  # (name, labels) -> LatencyHistogram
+        self.counters = {}    # (name, labels) -> число
+        self.help = {}
+        self.collectors = {}  # name -> (kind, fn): значення збираються в момент експорту
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def describe(self, name, text):
+        self.help[name] = text
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, LatencyHistogram())
+        histogram.record(seconds)
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def register_collector(self, name, kind, fn, text=None):
+        """Метрика, яку рахує сам компонент (кеші): fn() -> [(labels_dict, value)], kind: counter | gauge"""
+        self.collectors[name] = (kind, fn)
+        if text:
+            self.help[name] = text
+
+    def _collect(self):
+        for name, (kind, fn) in list(self.collectors.items()):
+            try:
+                samples = fn()
+            except Exception:
+                continue
+            yield name, kind, [(tuple(sorted(labels.items())), value) for labels, value in samples]
+
+    def timer(self, name, **labels):
+        """Контекстний менеджер: with metrics.timer('scan_stage_seconds', stage='xt_ticker'): ..."""
+        return _Timer(self, name, labels)
+
+    def timed(self, name, **labels):
+        """Декоратор: тривалість всього виклику функції"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Timer(self, name, labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # ------------------------------------------------------------------
+    # 📤 Експорт
+    # ------------------------------------------------------------------
+    def summary(self):
+        """{name: {'stage=xt_ticker': {count, p50_ms, p99_ms, max_ms, avg_ms}}} для JSON API"""
+        result = {}
+        for (name, labels), histogram in list(self.histograms.items()):
+            label_text = ','.join(f"{k}={v}" for k, v in labels) or 'all'
+            count = histogram.count
+            result.setdefault(name, {})[label_text] = {
+                'count': count,
+                'p50_ms': round(histogram.percentile(50) * 1000, 2),
+                'p99_ms': round(histogram.percentile(99) * 1000, 2),
+                'max_ms': round(histogram.max * 1000, 2),
+                'avg_ms': round(histogram.total / count * 1000, 2) if count else 0.0,
+            }
+        for (name, labels), value in list(self.counters.items()):
+            label_text = ','.join(f"{k}={v}" for k, v in labels) or 'all'
+            result.setdefault(name, {})[label_text] = value
+        for name, _, samples in self._collect():
+            for labels, value in samples:
+                result.setdefault(name, {})[','.join(f"{k}={v}" for k, v in labels) or 'all'] = value
+        return result
+
+    @staticmethod
+    def _format_labels(labels, extra=None):
+        pairs = list(labels) + list(extra or [])
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{k}="{str(v)}"' for k, v in pairs) + '}'
+
+    def render_prometheus(self):
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        by_name = {}
+        for (name, labels), histogram in list(self.histograms.items()):
+            by_name.setdefault(name, []).append((labels, histogram))
+        for name in sorted(by_name):
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in by_name[name]:
+                counts, count, total = histogram.snapshot()
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.bounds, counts):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{self._format_labels(labels, [('le', f'{bound:.6g}')])} {cumulative}")
+                lines.append(f"{name}_bucket{self._format_labels(labels, [('le', '+Inf')])} {count}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {total:.6f}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {count}")
+
+        counters_by_name = {}
+        for (name, labels), value in list(self.counters.items()):
+            counters_by_name.setdefault(name, []).append((labels, value))
+        for name in sorted(counters_by_name):
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in counters_by_name[name]:
+                lines.append(f"{name}{self._format_labels(labels)} {value}")
+
+        for name, kind, samples in self._collect():
+            if name in self.help:
+                lines.append(f"# HELP {name} {self.help[name]}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{self._format_labels(labels)} {value}")
+        return '\n'.join(lines) + '\n'
+
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'labels', 'started_at')
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started_at = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry.observe(self.name, time.perf_counter() - self.started_at, **self.labels)
+        return False
+
+
+# 🌍 Глобальний реєстр метрик
+metrics = MetricsRegistry()
+metrics.describe('scan_stage_seconds', 'Тривалість етапів сканування, моніторингу та верифікації')
+metrics.describe('dex_provider_seconds', 'Тривалість запитів до DEX провайдерів')
+metrics.describe('dex_provider_requests_total', 'Запити до DEX провайдерів за результатом')
+metrics.describe('scan_deadline_exceeded_total', 'Оцінки символів, покинуті по дедлайну')
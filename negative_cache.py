@@ -0,0 +1,84 @@
+"""
+🚫 NEGATIVE CACHE: Пам'ять про символи, які провайдер не зміг знайти
+Сотні символів XT не мають жодного мапінгу, і без кешу кожен прохід повторює весь ланцюжок
+(блокчейн -> CoinGecko -> DexScreener search з rate limit 1с -> discovery з перезавантаженням мапінгу).
+Для кожної пари (провайдер, символ) наступна перевірка відкладається експоненційно:
+base, 2*base, 4*base ... до max. Будь-який успіх провайдера скидає запис.
+"""
+import time
+import random
+import threading
+
+
+class NegativeResultCache:
+    """🚫 Кеш промахів провайдерів з експоненційним інтервалом повторної перевірки"""
+
+    def __init__(self, base_interval=300, max_interval=21600, jitter=0.1, enabled=True):
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.jitter = jitter  # розкид, щоб сотні символів не перевірялись в одну секунду
+        self.enabled = enabled
+        self.entries = {}  # (provider, key) -> {'failures', 'first_failed_at', 'retry_at'}
+        self.lock = threading.Lock()
+        self.stats = {'skipped': 0, 'recorded': 0, 'recovered': 0}
+
+    def should_skip(self, provider, key):
+        """True якщо провайдер ще не має перевіряти символ"""
+        if not self.enabled:
+            return False
+        with self.lock:
+            entry = self.entries.get((provider, key))
+            if entry and time.time() < entry['retry_at']:
+                self.stats['skipped'] += 1
+                return True
+        return False
+
+    def backing_off(self, key, providers):
+        """True якщо жоден з providers ще не має перевіряти символ (весь ланцюжок = один пропуск)"""
+        if not self.enabled or not providers:
+            return False
+        now = time.time()
+        with self.lock:
+            for provider in providers:
+                entry = self.entries.get((provider, key))
+                if not entry or now >= entry['retry_at']:
+                    return False
+            self.stats['skipped'] += 1
+        return True
+
+    def record_miss(self, provider, key):
+        """Провайдер не знайшов символ - наступна перевірка через подвоєний інтервал. Повертає інтервал"""
+        now = time.time()
+        with self.lock:
+            entry = self.entries.setdefault((provider, key), {'failures': 0, 'first_failed_at': now, 'retry_at': now})
+            entry['failures'] += 1
+            interval = min(self.max_interval, self.base_interval * 2 ** (entry['failures'] - 1))
+            interval *= 1 + random.uniform(-self.jitter, self.jitter)
+            entry['retry_at'] = now + interval
+            self.stats['recorded'] += 1
+        return interval
+
+    def record_hit(self, provider, key):
+        with self.lock:
+            if self.entries.pop((provider, key), None) is not None:
+                self.stats['recovered'] += 1
+
+    def forget(self, key, providers=None):
+        """Скидає записи символу (напр. після появи нової контрактної адреси)"""
+        with self.lock:
+            for entry_key in [k for k in self.entries if k[1] == key and (providers is None or k[0] in providers)]:
+                del self.entries[entry_key]
+
+    def get_stats(self):
+        now = time.time()
+        by_provider = {}
+        with self.lock:
+            for (provider, _), entry in self.entries.items():
+                provider_stats = by_provider.setdefault(provider, {'symbols': 0, 'backing_off': 0, 'max_failures': 0})
+                provider_stats['symbols'] += 1
+                provider_stats['backing_off'] += now < entry['retry_at']
+                provider_stats['max_failures'] = max(provider_stats['max_failures'], entry['failures'])
+            stats = dict(self.stats)
+        stats['entries'] = sum(p['symbols'] for p in by_provider.values())
+        stats['by_provider'] = by_provider
+        return stats
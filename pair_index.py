@@ -0,0 +1,160 @@
+"""
+🗂️ PAIR INDEX: Постійний (SQLite) індекс symbol -> DEX пара між перезапусками
+Без індексу після кожного рестарту DexCheckClient заново шукає мережу, пару і контракт кожного
+символу XT (пошук DexScreener з паузою, discovery) - тисячі запитів до першої угоди.
+Індекс зберігає перевірені пари: chain, pair_address, token_address, dex_id, quote_symbol,
+pairCreatedAt, останню ліквідність і час перевірки. На старті адреси з індексу доповнюють мапінг
+токенів, тож перший sweep отримує ціни пакетними /tokens запитами (30 адрес на запит).
+Кожна свіжа пара оновлює запис (не частіше ніж раз на write_interval). Записи, що старіють, фоново
+перевіряються пакетними /tokens запитами (stale() - кандидати), не перевірені довше max_age - видаляються.
+"""
+import time
+import logging
+import sqlite3
+import threading
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pairs (
+    symbol TEXT PRIMARY KEY,
+    chain TEXT NOT NULL,
+    pair_address TEXT,
+    token_address TEXT,
+    dex_id TEXT,
+    quote_symbol TEXT,
+    pair_created_at INTEGER,
+    liquidity_usd REAL,
+    volume_24h REAL,
+    provider TEXT,
+    verified_at REAL NOT NULL
+)
+"""
+
+_COLUMNS = ('symbol', 'chain', 'pair_address', 'token_address', 'dex_id', 'quote_symbol',
+            'pair_created_at', 'liquidity_usd', 'volume_24h', 'provider', 'verified_at')
+
+
+class PairIndex:
+    """🗂️ SQLite індекс перевірених DEX пар (одне з'єднання на процес під локом, WAL)"""
+
+    def __init__(self, path, max_age=7 * 86400, write_interval=300, enabled=True):
+        self.path = path
+        self.max_age = max_age
+        self.write_interval = write_interval  # та сама пара перезаписується не частіше
+        self.enabled = enabled
+        self.lock = threading.Lock()
+        self.last_written = {}  # symbol -> (pair_address, token_address, written_at)
+        self.stats = {'loaded': 0, 'writes': 0, 'skipped_writes': 0, 'pruned': 0, 'errors': 0}
+        self.connection = None
+        if enabled:
+            self._open()
+
+    def _open(self):
+        try:
+            self.connection = sqlite3.connect(self.path, check_same_thread=False, timeout=5)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute(_SCHEMA)
+            self.connection.commit()
+        except sqlite3.Error as e:
+            logging.error(f"❌ PAIR INDEX: Не вдалося відкрити {self.path}: {e}")
+            self.connection = None
+            self.enabled = False
+
+    def record(self, symbol, pair_data):
+        """Записує пару з адресою (DexScreener). Пари без адрес (CoinGecko, прямі пули) не індексуються"""
+        if not self.enabled:
+            return False
+        pair_address = pair_data.get('pair_address') or ''
+        token_address = pair_data.get('token_address') or ''
+        chain = pair_data.get('chain') or pair_data.get('chain_name')
+        if not token_address or not chain or chain == 'multi':
+            return False
+
+        now = time.time()
+        with self.lock:
+            previous = self.last_written.get(symbol)
+            if previous and previous[:2] == (pair_address, token_address) and now - previous[2] < self.write_interval:
+                self.stats['skipped_writes'] += 1
+                return False
+            row = (
+                symbol, chain, pair_address, token_address,
+                pair_data.get('dex_id') or pair_data.get('dex_name'),
+                pair_data.get('quote_token_symbol') or pair_data.get('quote_symbol'),
+                pair_data.get('pair_created_at'),
+                float(pair_data.get('liquidity_usd') or 0),
+                float(pair_data.get('volume_24h') or 0),
+                pair_data.get('provider'),
+                now,
+            )
+            try:
+                self.connection.execute(
+                    f"INSERT OR REPLACE INTO pairs ({', '.join(_COLUMNS)}) VALUES ({', '.join('?' * len(_COLUMNS))})", row
+                )
+                self.connection.commit()
+            except sqlite3.Error as e:
+                self.stats['errors'] += 1
+                logging.warning(f"⚠️ PAIR INDEX: Помилка запису {symbol}: {e}")
+                return False
+            self.last_written[symbol] = (pair_address, token_address, now)
+            self.stats['writes'] += 1
+        return True
+
+    def load(self):
+        """{symbol: запис} для всіх записів, перевірених не раніше max_age (застарілі видаляються)"""
+        if not self.enabled:
+            return {}
+        cutoff = time.time() - self.max_age
+        with self.lock:
+            try:
+                pruned = self.connection.execute("DELETE FROM pairs WHERE verified_at < ?", (cutoff,)).rowcount
+                self.connection.commit()
+                rows = self.connection.execute(f"SELECT {', '.join(_COLUMNS)} FROM pairs").fetchall()
+            except sqlite3.Error as e:
+                self.stats['errors'] += 1
+                logging.warning(f"⚠️ PAIR INDEX: Помилка читання: {e}")
+                return {}
+            entries = {row[0]: dict(zip(_COLUMNS, row)) for row in rows}
+            for symbol, entry in entries.items():
+                self.last_written[symbol] = (entry['pair_address'] or '', entry['token_address'], entry['verified_at'])
+            self.stats['loaded'] = len(entries)
+            self.stats['pruned'] += max(0, pruned)
+        if pruned:
+            logging.info(f"🗂️ PAIR INDEX: Видалено {pruned} записів, не перевірених {self.max_age / 86400:.0f}+ днів")
+        return entries
+
+    def stale(self, older_than, limit=None):
+        """Записи, не перевірені довше older_than секунд (найдавніші першими) - кандидати на фонову перевірку"""
+        if not self.enabled:
+            return []
+        cutoff = time.time() - older_than
+        with self.lock:
+            try:
+                rows = self.connection.execute(
+                    f"SELECT {', '.join(_COLUMNS)} FROM pairs WHERE verified_at < ? ORDER BY verified_at LIMIT ?",
+                    (cutoff, limit if limit else -1)
+                ).fetchall()
+            except sqlite3.Error as e:
+                self.stats['errors'] += 1
+                logging.warning(f"⚠️ PAIR INDEX: Помилка читання застарілих записів: {e}")
+                return []
+        return [dict(zip(_COLUMNS, row)) for row in rows]
+
+    def get_stats(self):
+        stats = dict(self.stats, enabled=self.enabled, path=self.path)
+        if not self.enabled:
+            return stats
+        with self.lock:
+            try:
+                count, oldest = self.connection.execute("SELECT COUNT(*), MIN(verified_at) FROM pairs").fetchone()
+            except sqlite3.Error:
+                return stats
+        stats['entries'] = count
+        stats['oldest_verified_age_sec'] = round(time.time() - oldest, 1) if oldest else None
+        return stats
+
+    def close(self):
+        with self.lock:
+            if self.connection is not None:
+                self.connection.close()
+                self.connection = None
+            self.enabled = False
@@ -0,0 +1,264 @@
+"""
+🧭 POOL REGISTRY: Метадані пулів (token0/token1, decimals, орієнтація) - визначаються один раз і зберігаються на диск
+Раніше ціна EVM пулу рахувалась як reserve1/1e6 ÷ reserve0/1e18 (Ethereum) або reserve1/reserve0 (BSC) -
+вірно тільки для TOKEN/USDT пулів з такими decimals. Для TOKEN/WETH, TOKEN/WBNB, USDT/TOKEN пулів ціна
+виходила хибною, а угоди відкидались як "фейковий спред".
+Реєстр один раз пакетно (Multicall3) читає token0/token1 пулів і decimals/symbol їх токенів, визначає,
+який токен базовий, а який - котирування, і прекомпілює множник decimals. Ціна пулу далі - одне звернення
+до реєстру + множення на USD курс котирування (QuoteRates: стейблкоїни = 1, WETH/WBNB/WSOL - з наших же
+ETH/USDT, BNB/USDT, SOL/USDT пулів).
+"""
+import os
+import json
+import time
+import logging
+import threading
+
+TOKEN0_SELECTOR = bytes.fromhex('0dfe1681')    # token0()
+TOKEN1_SELECTOR = bytes.fromhex('d21220a7')    # token1()
+DECIMALS_SELECTOR = bytes.fromhex('313ce567')  # decimals()
+SYMBOL_SELECTOR = bytes.fromhex('95d89b41')    # symbol()
+
+STABLE_QUOTES = frozenset({'USDT', 'USDC', 'BUSD', 'DAI', 'FDUSD', 'TUSD', 'USD1', 'BSC-USD'})
+RATE_ASSETS = {'WETH': 'WETH', 'ETH': 'WETH', 'WBNB': 'WBNB', 'BNB': 'WBNB', 'WSOL': 'WSOL', 'SOL': 'WSOL'}
+SOLANA_MINT_SYMBOLS = {
+    'So11111111111111111111111111111111111111112': 'WSOL',
+    'EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v': 'USDC',
+    'Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB': 'USDT',
+}
+
+
+def quote_asset(symbol):
+    """Ключ USD курсу токена як котирування: 'USD' для стейблкоїнів, WETH/WBNB/WSOL або None"""
+    symbol = (symbol or '').upper()
+    if symbol in STABLE_QUOTES:
+        return 'USD'
+    return RATE_ASSETS.get(symbol)
+
+
+def _matches(token_symbol, pool_symbol):
+    """Символ токена в контракті відповідає символу пулу (WBTC для BTC, BTCB на BSC)"""
+    token_symbol, pool_symbol = (token_symbol or '').upper(), (pool_symbol or '').upper()
+    return bool(pool_symbol) and token_symbol in (pool_symbol, 'W' + pool_symbol, pool_symbol + 'B')
+
+
+def base_is_token0(symbol0, symbol1, pool_symbol=None):
+    """True - базовий токен пулу token0 (котирування token1). ETH/USDT: котируванням стає стейблкоїн"""
+    quote0, quote1 = quote_asset(symbol0), quote_asset(symbol1)
+    if quote0 and quote1 and (quote0 == 'USD') != (quote1 == 'USD'):
+        return quote1 == 'USD'
+    if quote1 and not quote0:
+        return True
+    if quote0 and not quote1:
+        return False
+    return _matches(symbol0, pool_symbol) or not _matches(symbol1, pool_symbol)
+
+
+def make_entry(symbol0, symbol1, decimals0, decimals1, pool_symbol=None, **extra):
+    """
+    Запис реєстру: орієнтація + прекомпільовані множники.
+    Ціна базового токена в котируванні = (reserve1/reserve0 або reserve0/reserve1) * scale
+    """
+    base0 = base_is_token0(symbol0, symbol1, pool_symbol)
+    base_symbol, quote_symbol = (symbol0, symbol1) if base0 else (symbol1, symbol0)
+    quote_decimals = decimals1 if base0 else decimals0
+    entry = dict(extra)
+    entry.update({
+        'symbol0': symbol0, 'symbol1': symbol1,
+        'decimals0': decimals0, 'decimals1': decimals1,
+        'base_is_token0': base0,
+        'base_symbol': base_symbol,
+        'quote_symbol': quote_symbol,
+        'quote': quote_asset(quote_symbol),
+        'scale': 10.0 ** ((decimals0 - decimals1) if base0 else (decimals1 - decimals0)),
+        'quote_unit': 10.0 ** -quote_decimals,
+    })
+    return entry
+
+
+def decode_address(data):
+    """Адреса з ABI-відповіді (останні 20 байт першого слова) або None"""
+    if not data or len(data) < 32:
+        return None
+    return '0x' + bytes(data[12:32]).hex()
+
+
+def decode_uint(data):
+    if not data or len(data) < 32:
+        return None
+    return int.from_bytes(data[0:32], 'big')
+
+
+def decode_symbol(data):
+    """symbol(): ABI string або bytes32 (старі токени на кшталт MKR)"""
+    if not data:
+        return ''
+    data = bytes(data)
+    if len(data) >= 64 and int.from_bytes(data[0:32], 'big') == 32:
+        length = int.from_bytes(data[32:64], 'big')
+        raw = data[64:64 + length]
+    else:
+        raw = data[0:32].rstrip(b'\x00')
+    return raw.decode('utf-8', errors='ignore').strip().upper()
+
+
+class QuoteRates:
+    """💱 USD курс котирувальних активів пулів (WETH, WBNB, WSOL); 'USD' (стейблкоїни) завжди 1.0"""
+
+    def __init__(self, max_age=300.0):
+        self.max_age = max_age  # старіший курс не використовується (ціна пулу не рахується)
+        self.lock = threading.Lock()
+        self.rates = {}  # актив -> (курс, час, джерело)
+
+    def set(self, asset, usd, source=None):
+        if asset and usd and usd > 0:
+            with self.lock:
+                self.rates[asset] = (usd, time.time(), source)
+
+    def get(self, asset):
+        if asset == 'USD':
+            return 1.0
+        with self.lock:
+            entry = self.rates.get(asset)
+        if entry is None or time.time() - entry[1] > self.max_age:
+            return None
+        return entry[0]
+
+    def get_stats(self):
+        now = time.time()
+        with self.lock:
+            return {asset: {'usd': round(usd, 6), 'age_sec': round(now - at, 1), 'source': source}
+                    for asset, (usd, at, source) in self.rates.items()}
+
+
+class PoolRegistry:
+    """🧭 Метадані пулів по мережах (JSON файл; пули статичні - запис не застаріває)"""
+
+    def __init__(self, path, enabled=True):
+        self.path = path
+        self.enabled = enabled  # False - тільки в пам'яті (кожен старт визначає метадані заново)
+        self.lock = threading.Lock()
+        self.pools = {}    # chain -> {адреса: запис}
+        self.tokens = {}   # (chain, адреса токена) -> (symbol, decimals)
+        self.failed = set()  # (chain, адреса) пулів без token0/token1 - не повторюються до рестарту
+        self.stats = {'loaded': 0, 'resolved': 0, 'failed': 0, 'metadata_requests': 0, 'saves': 0, 'errors': 0}
+        if enabled:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                pools = json.load(f).get('pools', {})
+        except (OSError, ValueError) as e:
+            logging.error(f"❌ POOL REGISTRY: Не вдалося прочитати {self.path}: {e}")
+            self.stats['errors'] += 1
+            return
+        for chain, entries in pools.items():
+            self.pools[chain] = dict(entries)
+            for entry in entries.values():
+                self._remember_tokens(chain, entry)
+        self.stats['loaded'] = sum(len(entries) for entries in self.pools.values())
+        logging.info(f"🧭 POOL REGISTRY: завантажено метадані {self.stats['loaded']} пулів з {self.path}")
+
+    def _remember_tokens(self, chain, entry):
+        for side in ('0', '1'):
+            token = entry.get('token' + side)
+            if token:
+                self.tokens[(chain, token)] = (entry['symbol' + side], entry['decimals' + side])
+
+    def save(self):
+        """Атомарний запис (tmp + rename): обірваний запис не псує файл"""
+        if not self.enabled:
+            return False
+        with self.lock:
+            snapshot = {chain: dict(entries) for chain, entries in self.pools.items()}
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'pools': snapshot}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+            self.stats['saves'] += 1
+            return True
+        except OSError as e:
+            logging.error(f"❌ POOL REGISTRY: Не вдалося зберегти {self.path}: {e}")
+            self.stats['errors'] += 1
+            return False
+
+    def get(self, chain, address):
+        return self.pools.get(chain, {}).get(address)
+
+    def put(self, chain, address, entry):
+        with self.lock:
+            self.pools.setdefault(chain, {})[address] = entry
+        self._remember_tokens(chain, entry)
+
+    def missing(self, chain, addresses):
+        known = self.pools.get(chain, {})
+        return [address for address in addresses if address not in known and (chain, address) not in self.failed]
+
+    def resolve_evm(self, chain, pools, multicall_fn):
+        """
+        Метадані нових EVM пулів двома пакетами: token0/token1 пулів, потім decimals/symbol невідомих токенів.
+        pools: {адреса_lower: символ пулу}; multicall_fn([(адреса_lower, calldata)]) -> [(success, returnData)]
+        Повертає кількість нових записів (збережених на диск)
+        """
+        missing = self.missing(chain, pools)
+        if not missing:
+            return 0
+
+        calls = [(address, selector) for address in missing for selector in (TOKEN0_SELECTOR, TOKEN1_SELECTOR)]
+        self.stats['metadata_requests'] += 1
+        results = multicall_fn(calls)
+        pool_tokens = {}
+        for i, address in enumerate(missing):
+            (ok0, data0), (ok1, data1) = results[2 * i], results[2 * i + 1]
+            token0 = decode_address(data0) if ok0 else None
+            token1 = decode_address(data1) if ok1 else None
+            if token0 and token1:
+                pool_tokens[address] = (token0, token1)
+            else:
+                self._fail(chain, address, pools[address], "немає token0/token1")
+
+        unknown = sorted({token for pair in pool_tokens.values() for token in pair} -
+                         {token for (token_chain, token) in self.tokens if token_chain == chain})
+        if unknown:
+            calls = [(token, selector) for token in unknown for selector in (DECIMALS_SELECTOR, SYMBOL_SELECTOR)]
+            self.stats['metadata_requests'] += 1
+            results = multicall_fn(calls)
+            for i, token in enumerate(unknown):
+                (ok_decimals, decimals_data), (ok_symbol, symbol_data) = results[2 * i], results[2 * i + 1]
+                decimals = decode_uint(decimals_data) if ok_decimals else None
+                if decimals is not None and decimals <= 36:
+                    self.tokens[(chain, token)] = (decode_symbol(symbol_data) if ok_symbol else '', decimals)
+
+        resolved = 0
+        for address, (token0, token1) in pool_tokens.items():
+            info0, info1 = self.tokens.get((chain, token0)), self.tokens.get((chain, token1))
+            if info0 is None or info1 is None:
+                self._fail(chain, address, pools[address], "немає decimals токена")
+                continue
+            entry = make_entry(info0[0], info1[0], info0[1], info1[1], pools[address], token0=token0, token1=token1)
+            self.put(chain, address, entry)
+            resolved += 1
+            if entry['quote'] is None:
+                logging.warning(f"⚠️ POOL REGISTRY {chain}: {pools[address]} котирується в {entry['quote_symbol']} "
+                                f"без USD курсу - ціна пулу не рахується")
+            elif not _matches(entry['base_symbol'], pools[address]):
+                logging.warning(f"⚠️ POOL REGISTRY {chain}: пул {address} для {pools[address]} - "
+                                f"{entry['symbol0']}/{entry['symbol1']}")
+        self.stats['resolved'] += resolved
+        if resolved:
+            self.save()
+            logging.info(f"🧭 POOL REGISTRY {chain}: визначено метадані {resolved} пулів")
+        return resolved
+
+    def _fail(self, chain, address, pool_symbol, reason):
+        self.failed.add((chain, address))
+        self.stats['failed'] += 1
+        logging.warning(f"⚠️ POOL REGISTRY {chain}: {pool_symbol} ({address}) - {reason}")
+
+    def get_stats(self):
+        return dict(self.stats, pools={chain: len(entries) for chain, entries in self.pools.items()},
+                    path=self.path if self.enabled else None)
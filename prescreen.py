@@ -0,0 +1,130 @@
+"""
+🔎 PRE-SCREEN: Дешевий векторний відсів символів ДО будь-яких DEX запитів
+Ціни XT (bulk знімок) та останні відомі DEX ціни всього універсуму збираються в NumPy масиви,
+і спред, співвідношення цін та очікувані діапазони рахуються одним проходом.
+На повну перевірку (get_advanced_token_analysis + symbol_worker) йдуть тільки кандидати
+та символи без свіжої DEX ціни.
+"""
+import time
+import logging
+import threading
+
+import numpy as np
+
+from config import (
+    PRESCREEN_SPREAD_FRACTION, PRESCREEN_DEX_PRICE_MAX_AGE_SEC, MAX_REALISTIC_SPREAD_PCT,
+    MIN_REALISTIC_NEGATIVE_SPREAD_PCT, MAX_PRICE_RATIO, EXPECTED_PRICE_RANGES,
+)
+
+
+class SpreadPrescreener:
+    """🔎 Векторний пре-скрин: ті самі перевірки реальності що й у symbol_worker, але без мережі"""
+
+    def __init__(self, spread_fraction=PRESCREEN_SPREAD_FRACTION, dex_price_max_age=PRESCREEN_DEX_PRICE_MAX_AGE_SEC,
+                 max_spread=MAX_REALISTIC_SPREAD_PCT, min_negative_spread=MIN_REALISTIC_NEGATIVE_SPREAD_PCT,
+                 max_price_ratio=MAX_PRICE_RATIO, expected_ranges=EXPECTED_PRICE_RANGES, fee=0.06):
+        self.spread_fraction = spread_fraction
+        self.dex_price_max_age = dex_price_max_age
+        self.max_spread = max_spread
+        self.min_negative_spread = min_negative_spread
+        self.max_price_ratio = max_price_ratio
+        self.expected_ranges = dict(expected_ranges)
+        self.fee = fee  # як у utils.calculate_spread
+
+        self.dex_prices = {}  # symbol -> (price, timestamp) з останньої повної перевірки
+        self.lock = threading.Lock()
+        self.stats = {
+            'runs': 0,
+            'screened': 0,
+            'passed': 0,
+            'dropped': 0,
+            'unknown_dex': 0,
+            'last_passed': 0,
+            'last_universe': 0,
+            'last_duration_ms': 0.0,
+        }
+
+    def record_dex_price(self, symbol, price):
+        """Запам'ятовує DEX ціну, отриману повною перевіркою символу"""
+        with self.lock:
+            self.dex_prices[symbol] = (float(price), time.time())
+
+    def _range_bounds(self, symbols):
+        lows = np.full(len(symbols), np.nan)
+        highs = np.full(len(symbols), np.nan)
+        for i, symbol in enumerate(symbols):
+            bounds = self.expected_ranges.get(symbol.split('/')[0])
+            if bounds:
+                lows[i], highs[i] = bounds
+        return lows, highs
+
+    def _evaluate(self, xt, dex, lows, highs):
+        """Спред та маска перевірок реальності (ті самі пороги, що в symbol_worker)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spread = (dex - xt) / dex * 100.0 - self.fee
+            ratio = np.maximum(xt, dex) / np.minimum(xt, dex)
+            multiple = xt / dex
+
+        realistic = (np.abs(spread) <= self.max_spread) & (spread >= self.min_negative_spread)
+        realistic &= ratio <= self.max_price_ratio
+        realistic &= ~((np.abs(multiple - np.round(multiple)) < 0.01) & (np.round(multiple) >= 10))
+        realistic &= np.isnan(lows) | ((xt >= lows) & (xt <= highs) & (dex >= lows) & (dex <= highs))
+        return spread, realistic
+
+    def check_pair(self, symbol, xt_price, dex_price):
+        """Перевірки реальності для однієї пари свіжих цін -> (spread_pct, is_realistic)"""
+        lows, highs = self._range_bounds([symbol])
+        spread, realistic = self._evaluate(np.array([float(xt_price)]), np.array([float(dex_price)]), lows, highs)
+        return float(spread[0]), bool(realistic[0])
+
+    def screen(self, symbols, xt_prices, min_spread, always_include=()):
+        """
+        symbols: список символів, xt_prices: {symbol: last} зі знімка XT, min_spread: поточний MIN_SPREAD,
+        always_include: символи, які не відсіюються (відкриті позиції).
+        Повертає символи для повної перевірки (порядок збережено).
+        """
+        symbols = list(symbols)
+        count = len(symbols)
+        if not count or not xt_prices:
+            return symbols  # немає знімка XT - відсіяти нічого не можемо
+
+        started_at = time.perf_counter()
+        now = time.time()
+        with self.lock:
+            known = [self.dex_prices.get(symbol, (np.nan, 0.0)) for symbol in symbols]
+
+        xt = np.fromiter((xt_prices.get(symbol) or np.nan for symbol in symbols), dtype=float, count=count)
+        dex = np.fromiter((price for price, _ in known), dtype=float, count=count)
+        dex_ts = np.fromiter((ts for _, ts in known), dtype=float, count=count)
+        lows, highs = self._range_bounds(symbols)
+
+        has_xt = np.isfinite(xt) & (xt > 0)
+        fresh_dex = np.isfinite(dex) & (dex > 0) & (now - dex_ts <= self.dex_price_max_age)
+        spread, realistic = self._evaluate(xt, dex, lows, highs)
+        candidate = np.abs(spread) >= min_spread * self.spread_fraction
+
+        # Без свіжої DEX ціни символ йде на повну перевірку (там ціна й оновиться)
+        keep = has_xt & (~fresh_dex | (candidate & realistic))
+        if always_include:
+            keep |= np.fromiter((symbol in always_include for symbol in symbols), dtype=bool, count=count)
+        passed = [symbols[i] for i in np.flatnonzero(keep)]
+
+        self.stats['runs'] += 1
+        self.stats['screened'] += count
+        self.stats['passed'] += len(passed)
+        self.stats['dropped'] += count - len(passed)
+        self.stats['unknown_dex'] = int(np.count_nonzero(has_xt & ~fresh_dex))
+        self.stats['last_passed'] = len(passed)
+        self.stats['last_universe'] = count
+        self.stats['last_duration_ms'] = round((time.perf_counter() - started_at) * 1000, 3)
+        logging.debug(f"🔎 PRESCREEN: {len(passed)}/{count} символів пройшли за {self.stats['last_duration_ms']}мс")
+        return passed
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['known_dex_prices'] = len(self.dex_prices)
+        return stats
+
+
+# 🌍 Глобальний пре-скрин
+spread_prescreener = SpreadPrescreener()
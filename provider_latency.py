@@ -0,0 +1,94 @@
+"""
+⏱️ PROVIDER LATENCY: Ковзна латентність і успішність DEX провайдерів для hedged запитів
+resolve_best_pair раніше завжди чекав провайдерів по черзі (блокчейн -> CoinGecko -> DexScreener),
+тож один повільний провайдер додавав секунди до кожного промаху. Трекер рахує по останніх N викликах:
+- p50/p95 латентності успішних відповідей провайдера
+- успішність провайдера в цілому і для кожного символу (EWMA)
+Порядок провайдерів = очікуваний час до відповіді (p50 / ймовірність успіху для символу),
+затримка hedge = p95 провайдера: якщо він не відповів за свій p95 - запускаємо наступного.
+"""
+import threading
+from collections import deque
+
+
+class ProviderLatencyTracker:
+    """⏱️ Ковзні вікна латентності/успішності провайдерів + EWMA успішності по символах"""
+
+    def __init__(self, window=200, min_samples=5, default_delay=1.5, min_delay=0.2, symbol_alpha=0.3):
+        self.window = window
+        self.min_samples = min_samples  # до цього провайдер "холодний": статичний порядок і default_delay
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.symbol_alpha = symbol_alpha
+        self.samples = {}        # provider -> deque[(latency, success)]
+        self.symbol_success = {}  # (provider, symbol) -> EWMA успішності
+        self.stats = {'hedged': 0, 'hedge_won': 0}
+        self.lock = threading.Lock()
+
+    def record(self, provider, symbol, latency, success):
+        with self.lock:
+            samples = self.samples.get(provider)
+            if samples is None:
+                samples = self.samples[provider] = deque(maxlen=self.window)
+            samples.append((latency, bool(success)))
+            key = (provider, symbol)
+            previous = self.symbol_success.get(key)
+            value = 1.0 if success else 0.0
+            self.symbol_success[key] = value if previous is None else previous + self.symbol_alpha * (value - previous)
+
+    def record_hedge(self, won):
+        """Hedge запущено; won - відповідь першим дав саме hedge провайдер"""
+        with self.lock:
+            self.stats['hedged'] += 1
+            self.stats['hedge_won'] += bool(won)
+
+    @staticmethod
+    def _percentile(values, pct):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100.0))]
+
+    def _success_latencies(self, provider):
+        return [latency for latency, success in self.samples.get(provider, ()) if success]
+
+    def hedge_delay(self, provider):
+        """Скільки чекати провайдера перед hedge запитом: його p95 (або default_delay для холодного)"""
+        with self.lock:
+            latencies = self._success_latencies(provider)
+        if len(latencies) < self.min_samples:
+            return self.default_delay
+        return max(self.min_delay, self._percentile(latencies, 95))
+
+    def expected_time(self, provider, symbol):
+        """Очікуваний час до відповіді: p50 / ймовірність успіху (None якщо даних ще мало)"""
+        with self.lock:
+            samples = list(self.samples.get(provider, ()))
+            symbol_rate = self.symbol_success.get((provider, symbol))
+        if len(samples) < self.min_samples:
+            return None
+        latencies = [latency for latency, success in samples if success] or [latency for latency, _ in samples]
+        success_rate = symbol_rate if symbol_rate is not None else sum(s for _, s in samples) / len(samples)
+        return self._percentile(latencies, 50) / max(success_rate, 0.05)
+
+    def order(self, providers, symbol):
+        """Провайдери за очікуваним часом відповіді; холодні - першими в статичному порядку (збирають дані)"""
+        ranked = []
+        for index, provider in enumerate(providers):
+            expected = self.expected_time(provider, symbol)
+            ranked.append((expected is not None, expected or 0.0, index, provider))
+        return [provider for *_, provider in sorted(ranked)]
+
+    def get_stats(self):
+        with self.lock:
+            providers = {p: list(s) for p, s in self.samples.items()}
+            stats = dict(self.stats)
+        stats['providers'] = {}
+        for provider, samples in providers.items():
+            latencies = [latency for latency, success in samples if success]
+            stats['providers'][provider] = {
+                'samples': len(samples),
+                'success_rate_percent': round(sum(s for _, s in samples) / len(samples) * 100, 1) if samples else 0.0,
+                'p50_ms': round(self._percentile(latencies, 50) * 1000, 1) if latencies else None,
+                'p95_ms': round(self._percentile(latencies, 95) * 1000, 1) if latencies else None,
+                'hedge_delay_ms': round(self.hedge_delay(provider) * 1000, 1),
+            }
+        return stats
@@ -0,0 +1,233 @@
+"""
+⏱️ RATE GOVERNOR: Спільні token bucket ліміти на кожен зовнішній провайдер
+Один лімітер на провайдера/клас ендпоінтів для всіх потоків процесу (XT public, XT private на
+кожен акаунт, CoinGecko, DexScreener, Ankr RPC, Telegram) замість розкиданих sleep/last_request_time:
+- burst: місткість відра, після паузи можна одразу зробити кілька запитів
+- пріоритети: ордери/закриття (PRIORITY_CRITICAL) обслуговуються першими і мають резерв токенів,
+  який сканер і монітор не можуть вичерпати
+- чесна черга між потоками (lanes): сканер і монітор позицій отримують токени по черзі,
+  тож 50 воркерів сканера не відтісняють монітор
+- throttle(): після 429 провайдер призупиняється на Retry-After
+Смуга (lane) і пріоритет беруться з contextvars, як і дедлайн оцінки.
+"""
+import time
+import logging
+import functools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+from config import RATE_GOVERNOR_LIMITS
+from deadline import DeadlineExceeded, remaining
+from metrics import metrics
+
+PRIORITY_CRITICAL = 0  # Розміщення та закриття ордерів
+PRIORITY_HIGH = 1
+PRIORITY_NORMAL = 2    # Сканування, моніторинг, довідкові запити
+
+_lane = contextvars.ContextVar('rate_lane', default='default')
+_priority = contextvars.ContextVar('rate_priority', default=PRIORITY_NORMAL)
+
+
+def set_traffic_lane(lane):
+    """Смуга потоку до кінця його роботи ('scanner', 'monitor', ...) - для чесної черги"""
+    _lane.set(lane)
+
+
+@contextmanager
+def traffic_priority(priority):
+    """Пріоритет усіх запитів всередині блоку (with traffic_priority(PRIORITY_CRITICAL): розмістити ордер)"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def critical_traffic(func):
+    """Декоратор: усі запити функції (розміщення/закриття ордерів) - з PRIORITY_CRITICAL"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with traffic_priority(PRIORITY_CRITICAL):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+class ProviderLimiter:
+    """🪣 Token bucket одного провайдера з пріоритетною і чесною між смугами чергою очікування"""
+
+    def __init__(self, name, rate_per_sec, burst=None, reserve=0.0):
+        self.name = name
+        self.rate = max(0.01, float(rate_per_sec))
+        self.capacity = float(burst if burst is not None else max(1.0, self.rate))
+        self.reserve = min(float(reserve), max(0.0, self.capacity - 1.0))  # токени тільки для PRIORITY_CRITICAL
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self.blocked_until = 0.0  # monotonic: пауза після 429
+        self.cond = threading.Condition()
+        self.waiters = []  # [priority, seq, lane]
+        self.seq = 0
+        self.grants = 0
+        self.lane_served = {}  # lane -> номер останньої видачі (менший = давніше обслуговувались)
+        self.stats = {'granted': 0, 'waited': 0, 'wait_sec': 0.0, 'timeouts': 0, 'throttled': 0}
+
+    def set_rate(self, rate_per_sec, burst=None, reserve=0.0):
+        """Новий ліміт без втрати черги очікування (бюджети сканера задаються при старті планувальника)"""
+        with self.cond:
+            self._refill(time.monotonic())
+            self.rate = max(0.01, float(rate_per_sec))
+            self.capacity = float(burst if burst is not None else max(1.0, self.rate))
+            self.reserve = min(float(reserve), max(0.0, self.capacity - 1.0))
+            self.tokens = min(self.tokens, self.capacity)
+            self.cond.notify_all()
+
+    def _refill(self, now):
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.last_refill = now
+
+    def _head(self):
+        """Наступний очікувач: найвищий пріоритет, далі смуга, яку найдавніше обслуговували, далі FIFO"""
+        return min(self.waiters, key=lambda w: (w[0], self.lane_served.get(w[2], 0), w[1]))
+
+    def acquire(self, lane='default', priority=PRIORITY_NORMAL, timeout=None, stop_event=None):
+        """
+        Блокує до отримання токену. Повертає False по timeout / stop_event.
+        Кидає DeadlineExceeded якщо токен не з'явиться до дедлайну поточної оцінки.
+        """
+        started = time.monotonic()
+        give_up_at = started + timeout if timeout is not None else None
+        with self.cond:
+            self.seq += 1
+            waiter = [priority, self.seq, lane]
+            self.waiters.append(waiter)
+            try:
+                while True:
+                    now = time.monotonic()
+                    self._refill(now)
+                    need = 1.0 if priority <= PRIORITY_CRITICAL else 1.0 + self.reserve
+                    if self._head() is waiter:
+                        if now >= self.blocked_until and self.tokens >= need:
+                            self.tokens -= 1.0
+                            self.grants += 1
+                            self.lane_served[lane] = self.grants
+                            self._record_grant(now - started)
+                            return True
+                        wait_time = max(self.blocked_until - now, (need - self.tokens) / self.rate, 0.001)
+                    else:
+                        wait_time = 0.5  # розбудить notify_all після видачі токену попереднику
+
+                    left = remaining()
+                    if left is not None:
+                        if left <= 0 or (self._head() is waiter and left < wait_time):
+                            raise DeadlineExceeded(f"немає токену {self.name} до дедлайну")
+                        wait_time = min(wait_time, left)
+                    if give_up_at is not None:
+                        if now >= give_up_at:
+                            self.stats['timeouts'] += 1
+                            return False
+                        wait_time = min(wait_time, give_up_at - now)
+                    if stop_event is not None:
+                        if stop_event.is_set():
+                            return False
+                        wait_time = min(wait_time, 0.5)
+                    self.cond.wait(timeout=wait_time)
+            finally:
+                self.waiters.remove(waiter)
+                self.cond.notify_all()
+
+    def _record_grant(self, waited):
+        self.stats['granted'] += 1
+        if waited > 0.001:
+            self.stats['waited'] += 1
+            self.stats['wait_sec'] += waited
+            metrics.observe('rate_limit_wait_seconds', waited, provider=self.name.split(':')[0])
+
+    def throttle(self, seconds):
+        """Провайдер відповів 429 - жодних запитів наступні seconds"""
+        with self.cond:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+            self.last_refill = self.blocked_until  # відро наповнюється знову тільки після паузи
+            self.stats['throttled'] += 1
+            self.cond.notify_all()
+
+    def get_stats(self):
+        with self.cond:
+            self._refill(time.monotonic())
+            stats = dict(self.stats)
+            stats.update({
+                'rate_per_sec': self.rate,
+                'burst': self.capacity,
+                'reserve': self.reserve,
+                'tokens': round(self.tokens, 2),
+                'queued': len(self.waiters),
+                'throttled_for_sec': round(max(0.0, self.blocked_until - time.monotonic()), 2),
+            })
+        stats['wait_sec'] = round(stats['wait_sec'], 3)
+        return stats
+
+
+class RateGovernor:
+    """
+    ⏱️ Реєстр лімітерів: limits = {'coingecko': (запитів/сек, burst, резерв), ...}
+    Ключ 'xt_private:Account 1' бере ліміт з 'xt_private' - окреме відро на кожен акаунт
+    """
+
+    def __init__(self, limits=None):
+        self.limits = dict(limits or {})
+        self.limiters = {}
+        self.lock = threading.Lock()
+
+    def limiter(self, name, default_rate=None):
+        limiter = self.limiters.get(name)
+        if limiter is not None:
+            return limiter
+        with self.lock:
+            limiter = self.limiters.get(name)
+            if limiter is None:
+                limit = self.limits.get(name) or self.limits.get(name.split(':')[0])
+                if limit is None:
+                    limit = (default_rate or 1.0, None, 0.0)
+                    logging.debug(f"⏱️ RATE GOVERNOR: {name} без налаштувань, ліміт {limit[0]:.2f}/с")
+                limiter = self.limiters[name] = ProviderLimiter(name, *limit)
+        return limiter
+
+    def configure(self, name, rate_per_sec, burst=None, reserve=0.0):
+        """Ліміт, заданий не в RATE_GOVERNOR_LIMITS (бюджети оцінок сканера: 'scan_xt', 'scan_dex', ...)"""
+        with self.lock:
+            self.limits[name] = (rate_per_sec, burst, reserve)
+            limiter = self.limiters.get(name)
+        if limiter is not None:
+            limiter.set_rate(rate_per_sec, burst, reserve)
+        return self.limiter(name)
+
+    def acquire(self, name, priority=None, lane=None, timeout=None, stop_event=None, default_rate=None):
+        """Токен провайдера для поточного потоку (смуга і пріоритет - з контексту, якщо не передані)"""
+        return self.limiter(name, default_rate).acquire(
+            lane=lane if lane is not None else _lane.get(),
+            priority=priority if priority is not None else _priority.get(),
+            timeout=timeout,
+            stop_event=stop_event,
+        )
+
+    def throttle(self, name, seconds, default_rate=None):
+        logging.warning(f"⏱️ RATE GOVERNOR: {name} призупинено на {seconds:.1f}с (429)")
+        self.limiter(name, default_rate).throttle(seconds)
+
+    def get_stats(self):
+        with self.lock:
+            limiters = list(self.limiters.values())
+        return {limiter.name: limiter.get_stats() for limiter in limiters}
+
+
+def retry_after_seconds(response, default=5.0):
+    """Retry-After з відповіді 429 (секунди) або default"""
+    try:
+        return max(0.0, float(response.headers.get('Retry-After', default)))
+    except (TypeError, ValueError, AttributeError):
+        return default
+
+
+rate_governor = RateGovernor(RATE_GOVERNOR_LIMITS)
@@ -13,6 +13,8 @@ import os
 from datetime import datetime, timezone
 import time
 
+from adaptive_ttl import adaptive_ttl
+
 logger = logging.getLogger(__name__)
 
 class RealDexClient:
@@ -27,7 +29,7 @@ class RealDexClient:
         
         # Cache для цін
         self.price_cache = {}
-        self.cache_ttl = 30  # 30 секунд
+        self.cache_ttl = 30  # 30 секунд для символів без даних про волатильність (див. adaptive_ttl)
         
         # Основні токени для арбітражу
         self.token_addresses = {
@@ -234,14 +236,15 @@ class RealDexClient:
     def _get_cached_price(self, cache_key: str) -> Optional[Dict]:
         """Отримати закешовану ціну"""
         if cache_key in self.price_cache:
-            timestamp, price_data = self.price_cache[cache_key]
-            if time.time() - timestamp < self.cache_ttl:
+            timestamp, price_data, ttl = self.price_cache[cache_key]
+            if time.time() - timestamp < ttl:
                 return price_data
         return None
     
     def _cache_price(self, cache_key: str, price_data: Dict):
-        """Закешувати ціну"""
-        self.price_cache[cache_key] = (time.time(), price_data)
+        """Закешувати ціну (TTL за волатильністю символу)"""
+        ttl = adaptive_ttl.ttl(cache_key.split('_', 1)[1], self.cache_ttl)
+        self.price_cache[cache_key] = (time.time(), price_data, ttl)
     
     def _get_mock_price(self, symbol: str, chain: str) -> Dict:
         """Генерувати реалістичні мок-ціни"""
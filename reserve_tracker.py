@@ -0,0 +1,128 @@
+"""
+🔔 RESERVE TRACKER: Резерви Uniswap V2 / PancakeSwap V2 пулів за Sync подіями замість опитування getReserves
+Опитування по таймеру або витрачає RPC, коли нічого не змінилось, або віддає ціни до 60с давнини.
+Трекер мережі на кожен новий блок робить один eth_getLogs з фільтром по topic Sync і адресах наших пулів
+і оновлює тільки пули, резерви яких змінились. Початковий стан (і стан після великого розриву в блоках) -
+один Multicall знімок. Кожен запис несе номер блоку, з якого він відомий.
+"""
+import time
+import logging
+import threading
+
+from rate_governor import set_traffic_lane
+
+SYNC_TOPIC = '0x1c411e9a96e071241c2f21f7726b17ae89e3cab4c78be50e062b03a9fffbbad1'  # Sync(uint112,uint112)
+
+
+def decode_sync(data):
+    """(reserve0, reserve1) з data Sync події (два uint112 по 32 байти) або None"""
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:] if data.startswith('0x') else data)
+    if not data or len(data) < 64:
+        return None
+    return int.from_bytes(data[0:32], 'big'), int.from_bytes(data[32:64], 'big')
+
+
+class SyncReserveTracker:
+    """
+    🔔 Резерви пулів однієї мережі на останньому обробленому блоці:
+    - block_number_fn() -> поточний блок
+    - get_logs_fn(from_block, to_block, addresses, topic) -> Sync логи (dict з address, data, blockNumber, logIndex)
+    - snapshot_fn() -> (блок, {адреса_lower: (reserve0, reserve1)}) - Multicall знімок усіх пулів
+    - on_update(адреса_lower, reserve0, reserve1, блок) - викликається для кожного зміненого пулу
+    """
+
+    def __init__(self, chain, addresses, block_number_fn, get_logs_fn, snapshot_fn, on_update=None,
+                 poll_interval=3.0, max_block_range=500, stale_after=30.0):
+        self.chain = chain
+        self.addresses = [address.lower() for address in addresses]
+        self.block_number_fn = block_number_fn
+        self.get_logs_fn = get_logs_fn
+        self.snapshot_fn = snapshot_fn
+        self.on_update = on_update
+        self.poll_interval = poll_interval
+        self.max_block_range = max_block_range  # більший розрив (простій, збій RPC) - новий знімок замість логів
+        self.stale_after = stale_after          # без успішної синхронізації довше - дані трекера не віддаються
+        self.lock = threading.Lock()
+        self.reserves = {}  # адреса -> (reserve0, reserve1, блок)
+        self.last_block = None
+        self.synced_at = 0.0
+        self.thread = None
+        self.stats = {'blocks': 0, 'log_requests': 0, 'sync_events': 0, 'snapshots': 0, 'errors': 0}
+
+    def sync_once(self):
+        """Один крок: новий блок -> Sync логи з останнього обробленого блоку. Повертає кількість оновлених пулів"""
+        block = int(self.block_number_fn())
+        if self.last_block is not None and block <= self.last_block:
+            self.synced_at = time.time()
+            return 0
+
+        if self.last_block is None or block - self.last_block > self.max_block_range:
+            snapshot_block, snapshot = self.snapshot_fn()
+            self.stats['snapshots'] += 1
+            snapshot_block = int(snapshot_block or block)
+            for address, (reserve0, reserve1) in snapshot.items():
+                self._apply(address.lower(), reserve0, reserve1, snapshot_block)
+            updated = len(snapshot)
+            # Курсор - блок знімка, а не голова: eth_call за балансувальником (Ankr) може прийти з вузла,
+            # що відстає, і Sync події (snapshot_block, block] підтягне наступний getLogs
+            block = snapshot_block
+        else:
+            logs = self.get_logs_fn(self.last_block + 1, block, self.addresses, SYNC_TOPIC)
+            self.stats['log_requests'] += 1
+            latest = {}  # адреса -> останній Sync у діапазоні (проміжні не потрібні)
+            for log in sorted(logs, key=lambda l: (int(l['blockNumber']), int(l['logIndex']))):
+                reserves = decode_sync(log['data'])
+                if reserves is not None:
+                    latest[str(log['address']).lower()] = (reserves, int(log['blockNumber']))
+            self.stats['sync_events'] += len(logs)
+            for address, ((reserve0, reserve1), log_block) in latest.items():
+                self._apply(address, reserve0, reserve1, log_block)
+            updated = len(latest)
+
+        self.stats['blocks'] += block - self.last_block if self.last_block is not None else 1
+        self.last_block = block
+        self.synced_at = time.time()
+        return updated
+
+    def _apply(self, address, reserve0, reserve1, block):
+        with self.lock:
+            self.reserves[address] = (reserve0, reserve1, block)
+        if self.on_update is not None:
+            self.on_update(address, reserve0, reserve1, block)
+
+    def is_synced(self):
+        return self.last_block is not None and time.time() - self.synced_at <= self.stale_after
+
+    def get_reserves(self, address):
+        """(reserve0, reserve1, блок, на якому резерви актуальні) або None якщо трекер відстав"""
+        if not self.is_synced():
+            return None
+        with self.lock:
+            entry = self.reserves.get(address.lower())
+        if entry is None:
+            return None
+        return entry[0], entry[1], self.last_block  # без Sync події з того блоку резерви не змінювались
+
+    def start(self, stop_event):
+        """Фоновий потік: перевірка нового блоку кожні poll_interval секунд"""
+        if self.thread and self.thread.is_alive():
+            return
+
+        def _loop():
+            set_traffic_lane('reserve_tracker')
+            while not stop_event.is_set():
+                try:
+                    self.sync_once()
+                except Exception as e:
+                    self.stats['errors'] += 1
+                    logging.warning(f"⚠️ RESERVE TRACKER {self.chain}: {e}")
+                stop_event.wait(timeout=self.poll_interval)
+
+        self.thread = threading.Thread(target=_loop, name=f"reserve-tracker-{self.chain}", daemon=True)
+        self.thread.start()
+        logging.info(f"🔔 RESERVE TRACKER {self.chain}: {len(self.addresses)} пулів, перевірка блоку кожні {self.poll_interval}с")
+
+    def get_stats(self):
+        return dict(self.stats, chain=self.chain, pools=len(self.addresses), last_block=self.last_block,
+                    synced=self.is_synced(), sync_age_sec=round(time.time() - self.synced_at, 1) if self.synced_at else None)
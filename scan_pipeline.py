@@ -0,0 +1,196 @@
+"""
+🏭 SCAN PIPELINE: Сканування як конвеєр стадій з обмеженими чергами
+XT ціна -> DEX метрики -> фільтри -> рішення/виконання. Кожна стадія має власну кількість воркерів,
+тож повільні DEX запити не блокують ні отримання XT цін, ні рішення по вже збагачених символах.
+Повна черга наступної стадії зупиняє попередню (backpressure), диспетчер, пріоритети та дедлайни
+успадковано від ScanScheduler. Вмикається через SCAN_ENGINE=pipeline.
+"""
+import time
+import queue
+import logging
+import threading
+from collections import deque
+
+from deadline import DeadlineExceeded, deadline_scope
+from metrics import metrics
+from rate_governor import rate_governor, set_traffic_lane
+from scan_scheduler import ScanScheduler
+
+
+class PipelineStage:
+    """Одна стадія конвеєра: fn(item) -> item для наступної стадії або None (символ відсіяно/завершено)"""
+
+    def __init__(self, name, fn, workers, queue_size=64, rate_per_sec=None):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, int(workers))
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.rate_per_sec = rate_per_sec  # бюджет стадії - лімітер rate_governor 'scan_<стадія>'
+        if rate_per_sec:
+            rate_governor.configure(f"scan_{name}", rate_per_sec)
+        self.stats = {'processed': 0, 'passed': 0, 'dropped': 0, 'errors': 0, 'deadline_exceeded': 0, 'busy_sec': 0.0}
+        self.timestamps = deque(maxlen=5000)
+        self.lock = threading.Lock()
+
+    def record(self, duration, passed):
+        with self.lock:
+            self.stats['processed'] += 1
+            self.stats['passed' if passed else 'dropped'] += 1
+            self.stats['busy_sec'] += duration
+            self.timestamps.append(time.time())
+
+    def get_stats(self):
+        now = time.time()
+        with self.lock:
+            processed = self.stats['processed']
+            return {
+                'workers': self.workers,
+                'queue_depth': self.queue.qsize(),
+                'queue_capacity': self.queue.maxsize,
+                'processed': processed,
+                'passed': self.stats['passed'],
+                'dropped': self.stats['dropped'],
+                'errors': self.stats['errors'],
+                'deadline_exceeded': self.stats['deadline_exceeded'],
+                'throughput_per_min': sum(1 for t in self.timestamps if now - t <= 60),
+                'avg_ms': round(self.stats['busy_sec'] / processed * 1000, 2) if processed else 0.0,
+                'rate_limit': self.rate_per_sec or None,
+            }
+
+
+class ScanPipeline(ScanScheduler):
+    """
+    🏭 Конвеєр сканування:
+    - диспетчер (з ScanScheduler) подає символи в чергу першої стадії
+    - воркери кожної стадії передають item далі через обмежену чергу наступної стадії
+    - символ завершується (пріоритет, in_flight, sweep) коли його відсіяно або пройдено останню стадію
+    """
+
+    def __init__(self, stages, stop_event=None, on_sweep_complete=None, priority_tracker=None,
+                 deadline_sec=None, deadline_retry_sec=15.0):
+        super().__init__(
+            worker_fn=None,
+            num_workers=sum(stage.workers for stage in stages),
+            rate_budgets=None,  # бюджети запитів застосовуються на рівні стадій
+            stop_event=stop_event,
+            on_sweep_complete=on_sweep_complete,
+            priority_tracker=priority_tracker,
+            deadline_sec=deadline_sec,
+            deadline_retry_sec=deadline_retry_sec,
+        )
+        self.stages = list(stages)
+        self.work_queue = self.stages[0].queue  # диспетчер подає в першу стадію
+
+    # ------------------------------------------------------------------
+    # 🟢 Життєвий цикл
+    # ------------------------------------------------------------------
+    def start(self, symbols_provider):
+        self.stats['started_at'] = time.time()
+        for index, stage in enumerate(self.stages):
+            for i in range(stage.workers):
+                t = threading.Thread(target=self._stage_loop, args=(index,), name=f"pipeline-{stage.name}-{i}", daemon=True)
+                t.start()
+                self.workers.append(t)
+
+        self.dispatcher_thread = threading.Thread(
+            target=self._dispatch_loop, args=(symbols_provider,), name="pipeline-dispatcher", daemon=True
+        )
+        self.dispatcher_thread.start()
+        logging.info("🏭 SCAN PIPELINE: Запущено стадії " +
+                     " -> ".join(f"{stage.name}({stage.workers})" for stage in self.stages))
+
+    def stop(self, timeout=5):
+        self.stop_event.set()
+        for stage in self.stages:
+            for _ in range(stage.workers):
+                try:
+                    stage.queue.put_nowait(None)
+                except queue.Full:
+                    break
+        deadline = time.time() + timeout
+        for t in self.workers + ([self.dispatcher_thread] if self.dispatcher_thread else []):
+            t.join(timeout=max(0, deadline - time.time()))
+        logging.info("🔴 SCAN PIPELINE: Зупинено")
+
+    # ------------------------------------------------------------------
+    # 🏭 Стадії
+    # ------------------------------------------------------------------
+    def _put(self, symbol, sweep_id):
+        item = {
+            'symbol': symbol,
+            'sweep_id': sweep_id,
+            'started_at': time.time(),
+            'deadline': time.monotonic() + self.deadline_sec if self.deadline_sec else None,
+        }
+        return self._put_item(self.stages[0].queue, item)
+
+    def _put_item(self, target_queue, item):
+        """Блокуюча передача в обмежену чергу (backpressure) з перевіркою зупинки"""
+        while not self.stop_event.is_set():
+            try:
+                target_queue.put(item, timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _stage_loop(self, index):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        set_traffic_lane('scanner')
+        while not self.stop_event.is_set():
+            try:
+                item = stage.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+
+            symbol = item['symbol']
+            result = None
+            deadline_hit = False
+            started = time.perf_counter()
+            try:
+                left = item['deadline'] - time.monotonic() if item['deadline'] else None
+                if left is not None and left <= 0:
+                    raise DeadlineExceeded(f"в черзі стадії {stage.name}")
+                with deadline_scope(left):  # токен, що не з'явиться до дедлайну, - DeadlineExceeded
+                    if not stage.rate_per_sec or rate_governor.acquire(f"scan_{stage.name}", lane='scanner',
+                                                                       stop_event=self.stop_event):
+                        result = stage.fn(item)
+            except DeadlineExceeded as e:
+                deadline_hit = True
+                with stage.lock:
+                    stage.stats['deadline_exceeded'] += 1
+                with self.lock:
+                    self.stats['deadline_exceeded'] += 1
+                metrics.inc('scan_deadline_exceeded_total', engine='pipeline')
+                logging.warning(f"⏳ SCAN PIPELINE: {symbol} покинуто на стадії {stage.name} ({e})")
+            except Exception as e:
+                with stage.lock:
+                    stage.stats['errors'] += 1
+                with self.lock:
+                    self.stats['errors'] += 1
+                logging.error(f"❌ SCAN PIPELINE: Помилка стадії {stage.name} для {symbol}: {e}")
+            finally:
+                stage.queue.task_done()
+
+            duration = time.perf_counter() - started
+            # Остання стадія нічого не передає далі - відсіяним рахується лише явний None на проміжних
+            stage.record(duration, passed=result is not None or (next_stage is None and not deadline_hit))
+            metrics.observe('scan_stage_seconds', duration, stage=f"pipeline_{stage.name}")
+
+            if result is not None and next_stage is not None and self._put_item(next_stage.queue, result):
+                continue
+            self._complete(symbol, item['sweep_id'], item['started_at'], deadline_hit)
+
+    # ------------------------------------------------------------------
+    # 📊 Статистика
+    # ------------------------------------------------------------------
+    def get_stats(self):
+        stats = super().get_stats()
+        stage_stats = {stage.name: stage.get_stats() for stage in self.stages}
+        stats['engine'] = 'pipeline'
+        stats['queue_depth'] = sum(s['queue_depth'] for s in stage_stats.values())
+        stats['stages'] = stage_stats
+        return stats
@@ -0,0 +1,387 @@
+"""
+🔄 SCAN SCHEDULER: Постійний пул воркерів + безперервне сканування символів
+Замість створення 50 нових потоків на кожен батч - фіксований пул воркерів,
+черга символів та бюджет запитів (requests/sec) для кожного провайдера.
+Бюджети - лімітери спільного rate_governor ('scan_<провайдер>', смуга 'scanner').
+"""
+import time
+import queue
+import logging
+import threading
+import statistics
+from collections import deque
+
+from deadline import DeadlineExceeded, deadline_scope
+from metrics import metrics
+from rate_governor import rate_governor, set_traffic_lane
+
+
+class SymbolPriorityTracker:
+    """
+    🎯 Адаптивні інтервали повторного сканування символів:
+    - близько до порогу входу (MIN_SPREAD) або в best_opportunities -> кожні кілька секунд
+    - стабільно далеко від порогу -> раз на кілька хвилин
+    - волатильний спред зменшує інтервал (може швидко дійти до порогу)
+    """
+
+    def __init__(self, min_spread_fn, opportunity_lookup=None, min_interval=3.0, max_interval=300.0,
+                 no_data_interval=120.0, opportunity_ttl=120.0, history_size=20):
+        self.min_spread_fn = min_spread_fn
+        self.opportunity_lookup = opportunity_lookup
+        self.min_interval = float(min_interval)
+        self.max_interval = float(max_interval)
+        self.no_data_interval = float(no_data_interval)
+        self.opportunity_ttl = float(opportunity_ttl)
+        self.history_size = history_size
+
+        self.lock = threading.Lock()
+        self.history = {}      # symbol -> deque[(timestamp, spread_pct)]
+        self.next_due = {}     # symbol -> timestamp наступного сканування
+        self.assignments = {}  # symbol -> останнє рішення (для статус-ендпоінту)
+
+    def observe_spread(self, symbol, spread_pct):
+        """Записує спред, отриманий під час оцінки символу"""
+        with self.lock:
+            history = self.history.get(symbol)
+            if history is None:
+                history = self.history[symbol] = deque(maxlen=self.history_size)
+            history.append((time.time(), float(spread_pct)))
+
+    def _compute_interval(self, symbol, started_at, now):
+        """Повертає (інтервал, tier, деталі) за історією спреду"""
+        opportunity = self.opportunity_lookup(symbol) if self.opportunity_lookup else None
+        if opportunity and now - opportunity.get('timestamp', 0) < self.opportunity_ttl:
+            return self.min_interval, 'hot', {'reason': 'best_opportunity'}
+
+        history = self.history.get(symbol)
+        if not history or history[-1][0] < started_at:
+            return self.no_data_interval, 'no_data', {'reason': 'no_spread'}
+
+        min_spread = max(0.01, float(self.min_spread_fn()))
+        spreads = [spread for _, spread in history]
+        last_spread = spreads[-1]
+        volatility = statistics.pstdev(spreads) if len(spreads) > 1 else 0.0
+        distance = max(0.0, min_spread - abs(last_spread))
+        # Волатильний спред може "перестрибнути" відстань до порогу - враховуємо 2 сигми
+        effective_distance = max(0.0, distance - 2 * volatility)
+        ratio = min(1.0, effective_distance / min_spread)
+        interval = self.min_interval + (self.max_interval - self.min_interval) * ratio ** 2
+
+        if interval <= 10:
+            tier = 'hot'
+        elif interval <= 60:
+            tier = 'warm'
+        elif interval <= 180:
+            tier = 'cold'
+        else:
+            tier = 'dead'
+        return interval, tier, {
+            'last_spread': round(last_spread, 3),
+            'spread_volatility': round(volatility, 3),
+            'distance_to_threshold': round(distance, 3),
+        }
+
+    def finish(self, symbol, started_at):
+        """Викликається після оцінки символу - призначає час наступного сканування"""
+        now = time.time()
+        with self.lock:
+            interval, tier, details = self._compute_interval(symbol, started_at, now)
+            self.next_due[symbol] = now + interval
+            self.assignments[symbol] = dict(details, interval_sec=round(interval, 1), tier=tier, assigned_at=now)
+
+    def reschedule(self, symbol, delay):
+        """Повторна оцінка через delay секунд (оцінку покинуто по дедлайну)"""
+        now = time.time()
+        with self.lock:
+            self.next_due[symbol] = now + delay
+            self.assignments[symbol] = dict(self.assignments.get(symbol, {}), interval_sec=round(delay, 1),
+                                            tier='deadline_retry', assigned_at=now)
+
+    def tier(self, symbol):
+        """Останній tier символу ('hot', 'warm', ...) або None"""
+        assignment = self.assignments.get(symbol)
+        return assignment.get('tier') if assignment else None
+
+    def is_due(self, symbol, now=None):
+        now = now or time.time()
+        return self.next_due.get(symbol, 0) <= now
+
+    def due_symbols(self, symbols):
+        """Символи, яким час сканування настав, найбільш прострочені першими"""
+        now = time.time()
+        with self.lock:
+            due = [s for s in symbols if self.next_due.get(s, 0) <= now]
+            due.sort(key=lambda s: self.next_due.get(s, 0))
+        return due
+
+    def get_assignments(self, limit=None):
+        """Призначені інтервали для статус-ендпоінту (найгарячіші першими)"""
+        now = time.time()
+        with self.lock:
+            rows = [
+                dict(info, symbol=symbol, next_scan_in_sec=round(max(0.0, self.next_due.get(symbol, 0) - now), 1))
+                for symbol, info in self.assignments.items()
+            ]
+        rows.sort(key=lambda r: r['interval_sec'])
+        summary = {}
+        for row in rows:
+            summary[row['tier']] = summary.get(row['tier'], 0) + 1
+        return {'summary': summary, 'assignments': rows if limit is None else rows[:limit]}
+
+
+class ScanScheduler:
+    """
+    🚀 Безперервний планувальник сканування:
+    - N постійних воркерів беруть символи з черги
+    - диспетчер подає символи з урахуванням бюджету запитів провайдерів
+    - символ, який ще обробляється, не ставиться в чергу вдруге
+    - статистика: час повного проходу (sweep), глибина черги, пропускна здатність
+    """
+
+    def __init__(self, worker_fn, num_workers, rate_budgets, stop_event=None, on_sweep_complete=None,
+                 priority_tracker=None, deadline_sec=None, deadline_retry_sec=15.0):
+        self.worker_fn = worker_fn
+        self.priority_tracker = priority_tracker
+        self.deadline_sec = deadline_sec  # ⏳ бюджет часу на одну оцінку (None = без дедлайну)
+        self.deadline_retry_sec = deadline_retry_sec
+        self.num_workers = max(1, int(num_workers))
+        self.rate_budgets = dict(rate_budgets or {})  # provider -> оцінок/сек (лімітер rate_governor 'scan_<provider>')
+        for provider, rps in self.rate_budgets.items():
+            rate_governor.configure(f"scan_{provider}", rps)
+        self.stop_event = stop_event or threading.Event()
+        self.on_sweep_complete = on_sweep_complete
+
+        # Обмежена черга: диспетчер не випереджає воркерів більше ніж на 2 завдання на воркера
+        self.work_queue = queue.Queue(maxsize=self.num_workers * 2)
+        self.workers = []
+        self.dispatcher_thread = None
+
+        self.lock = threading.Lock()
+        self.in_flight = set()
+        self.sweep_id = 0
+        self.sweep_pending = {}  # sweep_id -> [started_at, pending_count, dispatched_done]
+
+        self.stats = {
+            'sweeps_completed': 0,
+            'last_sweep_duration': 0.0,
+            'last_sweep_symbols': 0,
+            'evaluations': 0,
+            'errors': 0,
+            'skipped_in_flight': 0,
+            'deadline_exceeded': 0,
+            'started_at': None,
+        }
+        self.sweep_durations = deque(maxlen=20)
+        self.eval_timestamps = deque(maxlen=1000)
+
+    # ------------------------------------------------------------------
+    # 🟢 Життєвий цикл
+    # ------------------------------------------------------------------
+    def start(self, symbols_provider):
+        """Запускає пул воркерів та диспетчер. symbols_provider() -> список символів"""
+        self.stats['started_at'] = time.time()
+        for i in range(self.num_workers):
+            t = threading.Thread(target=self._worker_loop, name=f"scan-worker-{i}", daemon=True)
+            t.start()
+            self.workers.append(t)
+
+        self.dispatcher_thread = threading.Thread(
+            target=self._dispatch_loop, args=(symbols_provider,), name="scan-dispatcher", daemon=True
+        )
+        self.dispatcher_thread.start()
+        logging.info(f"🔄 SCAN SCHEDULER: Запущено {self.num_workers} постійних воркерів, "
+                     f"бюджети: {', '.join(f'{p}={rps:g}/с' for p, rps in self.rate_budgets.items()) or 'без обмежень'}")
+
+    def stop(self, timeout=5):
+        """Зупиняє диспетчер та воркерів"""
+        self.stop_event.set()
+        # Будимо воркерів, які чекають на черзі
+        for _ in self.workers:
+            try:
+                self.work_queue.put_nowait(None)
+            except queue.Full:
+                break
+        deadline = time.time() + timeout
+        for t in self.workers + ([self.dispatcher_thread] if self.dispatcher_thread else []):
+            t.join(timeout=max(0, deadline - time.time()))
+        alive = [t.name for t in self.workers if t.is_alive()]
+        if alive:
+            logging.warning(f"⚠️ SCAN SCHEDULER: {len(alive)} воркерів ще завершують поточну оцінку")
+        logging.info("🔴 SCAN SCHEDULER: Зупинено")
+
+    def is_running(self):
+        return not self.stop_event.is_set() and any(t.is_alive() for t in self.workers)
+
+    # ------------------------------------------------------------------
+    # 📤 Диспетчер
+    # ------------------------------------------------------------------
+    def _acquire_budget(self):
+        """Кожна оцінка символу витрачає один запит кожного провайдера"""
+        for provider in self.rate_budgets:
+            if not rate_governor.acquire(f"scan_{provider}", lane='scanner', stop_event=self.stop_event):
+                return False
+        return True
+
+    def _dispatch_loop(self, symbols_provider):
+        while not self.stop_event.is_set():
+            try:
+                symbols = list(symbols_provider() or [])
+                if not symbols:
+                    self.stop_event.wait(timeout=5)
+                    continue
+                if self.priority_tracker is not None:
+                    # 🎯 Тільки символи, яким настав час повторного сканування (і які ще не в обробці)
+                    due = self.priority_tracker.due_symbols(symbols)
+                    with self.lock:
+                        symbols = [s for s in due if s not in self.in_flight]
+                    if not symbols:
+                        self.stop_event.wait(timeout=0.5)
+                        continue
+
+                with self.lock:
+                    self.sweep_id += 1
+                    sweep_id = self.sweep_id
+                    self.sweep_pending[sweep_id] = [time.time(), 0, False]
+
+                dispatched = 0
+                for symbol in symbols:
+                    if self.stop_event.is_set():
+                        break
+                    with self.lock:
+                        if symbol in self.in_flight:
+                            self.stats['skipped_in_flight'] += 1
+                            continue
+                    if self.priority_tracker is not None and not self.priority_tracker.is_due(symbol):
+                        continue  # воркер вже оцінив символ і призначив новий інтервал
+                    if not self._acquire_budget():
+                        break
+                    with self.lock:
+                        self.in_flight.add(symbol)
+                        self.sweep_pending[sweep_id][1] += 1
+                    if not self._put(symbol, sweep_id):
+                        with self.lock:
+                            self.in_flight.discard(symbol)
+                            self.sweep_pending[sweep_id][1] -= 1
+                        break
+                    dispatched += 1
+
+                if dispatched == 0:
+                    # Усі символи ще в обробці - порожній sweep не рахуємо завершеним
+                    with self.lock:
+                        self.sweep_pending.pop(sweep_id, None)
+                    self.stop_event.wait(timeout=0.5)
+                    continue
+
+                with self.lock:
+                    self.sweep_pending[sweep_id][2] = True
+                    self.stats['last_sweep_symbols'] = dispatched
+                self._maybe_finish_sweep(sweep_id)
+            except Exception as e:
+                logging.error(f"❌ SCAN SCHEDULER: Помилка диспетчера: {e}")
+                self.stop_event.wait(timeout=5)
+
+    def _put(self, symbol, sweep_id):
+        """Кладе завдання в обмежену чергу з перевіркою зупинки"""
+        while not self.stop_event.is_set():
+            try:
+                self.work_queue.put((symbol, sweep_id), timeout=1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    # ------------------------------------------------------------------
+    # 👷 Воркери
+    # ------------------------------------------------------------------
+    def _worker_loop(self):
+        set_traffic_lane('scanner')
+        while not self.stop_event.is_set():
+            try:
+                item = self.work_queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            if item is None:
+                break
+            symbol, sweep_id = item
+            started_at = time.time()
+            deadline_hit = False
+            try:
+                with deadline_scope(self.deadline_sec):
+                    self.worker_fn(symbol)
+            except DeadlineExceeded as e:
+                deadline_hit = True
+                with self.lock:
+                    self.stats['deadline_exceeded'] += 1
+                metrics.inc('scan_deadline_exceeded_total', engine='threads')
+                logging.warning(f"⏳ SCAN SCHEDULER: {symbol} покинуто після {time.time() - started_at:.1f}с ({e})")
+            except Exception as e:
+                with self.lock:
+                    self.stats['errors'] += 1
+                logging.error(f"❌ SCAN SCHEDULER: Помилка оцінки {symbol}: {e}")
+            finally:
+                self.work_queue.task_done()
+                self._complete(symbol, sweep_id, started_at, deadline_hit)
+
+    def _complete(self, symbol, sweep_id, started_at, deadline_hit=False):
+        """Оцінку символу завершено: новий інтервал, звільнення in_flight, облік sweep"""
+        if self.priority_tracker is not None:
+            if deadline_hit:
+                self.priority_tracker.reschedule(symbol, self.deadline_retry_sec)
+            else:
+                self.priority_tracker.finish(symbol, started_at)
+        with self.lock:
+            self.in_flight.discard(symbol)
+            self.stats['evaluations'] += 1
+            self.eval_timestamps.append(time.time())
+            if sweep_id in self.sweep_pending:
+                self.sweep_pending[sweep_id][1] -= 1
+        self._maybe_finish_sweep(sweep_id)
+
+    def _maybe_finish_sweep(self, sweep_id):
+        """Завершує sweep коли всі його символи подано та оброблено"""
+        with self.lock:
+            entry = self.sweep_pending.get(sweep_id)
+            if not entry or entry[1] > 0 or not entry[2]:
+                return
+            del self.sweep_pending[sweep_id]
+            duration = time.time() - entry[0]
+            self.sweep_durations.append(duration)
+            self.stats['sweeps_completed'] += 1
+            self.stats['last_sweep_duration'] = duration
+            symbols_count = self.stats['last_sweep_symbols']
+
+        logging.debug(f"✅ SWEEP #{sweep_id}: {symbols_count} символів за {duration:.1f}с, "
+                     f"черга {self.work_queue.qsize()}, в обробці {len(self.in_flight)}")
+        if self.on_sweep_complete:
+            try:
+                self.on_sweep_complete()
+            except Exception as e:
+                logging.error(f"❌ SCAN SCHEDULER: Помилка on_sweep_complete: {e}")
+
+    # ------------------------------------------------------------------
+    # 📊 Статистика
+    # ------------------------------------------------------------------
+    def get_stats(self):
+        """Поточні метрики планувальника (для логів та API)"""
+        now = time.time()
+        with self.lock:
+            recent = [t for t in self.eval_timestamps if now - t <= 60]
+            avg_sweep = sum(self.sweep_durations) / len(self.sweep_durations) if self.sweep_durations else 0.0
+            return {
+                'engine': 'threads',
+                'workers': self.num_workers,
+                'workers_alive': sum(1 for t in self.workers if t.is_alive()),
+                'queue_depth': self.work_queue.qsize(),
+                'in_flight': len(self.in_flight),
+                'sweeps_completed': self.stats['sweeps_completed'],
+                'last_sweep_duration_sec': round(self.stats['last_sweep_duration'], 2),
+                'avg_sweep_duration_sec': round(avg_sweep, 2),
+                'last_sweep_symbols': self.stats['last_sweep_symbols'],
+                'evaluations': self.stats['evaluations'],
+                'evaluations_per_min': len(recent),
+                'errors': self.stats['errors'],
+                'skipped_in_flight': self.stats['skipped_in_flight'],
+                'deadline_exceeded': self.stats['deadline_exceeded'],
+                'deadline_sec': self.deadline_sec,
+                'rate_budgets': dict(self.rate_budgets),
+            }
@@ -0,0 +1,517 @@
+"""
+🌐 SHARD CLUSTER: Розподіл символів XT futures між кількома процесами / хостами сканування
+Координатор (основний процес, SCAN_ENGINE=sharded) роздає сканерам непересічні підмножини символів
+з load_xt_futures_markets (rendezvous hashing - при підключенні чи відключенні сканера переїжджає
+мінімум символів). Сканери рахують XT ціну, DEX метрики та фільтри і надсилають назад тільки можливості;
+active_positions, MAX_OPEN_POSITIONS та розміщення ордерів належать виключно координатору.
+Транспорт: TCP, один JSON об'єкт на рядок.
+Сканер на іншому хості: SHARD_COORDINATOR_HOST=<ip> SHARD_ID=<id> python shard_cluster.py
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import hmac
+import socket
+import logging
+import threading
+import subprocess
+import socketserver
+from concurrent.futures import ThreadPoolExecutor
+
+from deadline import DeadlineExceeded, deadline_scope
+from metrics import metrics
+from scan_scheduler import ScanScheduler
+
+
+def assign_shards(symbols, shard_ids):
+    """Rendezvous hashing: символ належить шарду з найбільшою вагою hash(shard:symbol)"""
+    shard_ids = sorted(shard_ids)
+    assignments = {shard_id: [] for shard_id in shard_ids}
+    if not shard_ids:
+        return assignments
+    for symbol in symbols:
+        owner = max(shard_ids, key=lambda shard_id: hashlib.blake2b(f"{shard_id}:{symbol}".encode(), digest_size=8).digest())
+        assignments[owner].append(symbol)
+    return assignments
+
+
+def send_message(sock, message):
+    sock.sendall((json.dumps(message, default=str) + '\n').encode('utf-8'))
+
+
+def read_messages(stream):
+    """Генератор повідомлень з потоку рядків (пошкоджені рядки і не-об'єкти JSON пропускаються)"""
+    for line in stream:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8', errors='replace')
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            message = json.loads(line)
+        except ValueError:
+            logging.warning(f"⚠️ SHARD: Пошкоджене повідомлення ({len(line)} байт) пропущено")
+            continue
+        if not isinstance(message, dict):
+            logging.warning(f"⚠️ SHARD: Повідомлення не є JSON об'єктом ({type(message).__name__}) - пропущено")
+            continue
+        yield message
+
+
+def is_loopback(host):
+    """Координатор доступний тільки з цього хоста (127.0.0.0/8, ::1, localhost)"""
+    return host in ('localhost', '::1') or str(host).startswith('127.')
+
+
+def _authorized(expected, token, allow_open=False):
+    """Без токена підключення приймаються тільки на loopback координаторі (allow_open)"""
+    if not expected:
+        return allow_open
+    return hmac.compare_digest(str(expected), str(token or ''))
+
+
+class _ScannerConnection:
+    """Підключений сканер з точки зору координатора"""
+
+    def __init__(self, shard_id, sock, address):
+        self.shard_id = shard_id
+        self.sock = sock
+        self.address = f"{address[0]}:{address[1]}"
+        self.send_lock = threading.Lock()
+        self.symbols = None  # None = ще не отримав призначення
+        self.open_symbols = None
+        self.params = None
+        self.connected_at = time.time()
+        self.last_seen = time.time()
+        self.opportunities = 0
+        self.report = {}
+
+    def send(self, message):
+        with self.send_lock:
+            send_message(self.sock, message)
+
+    def close(self):
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+
+
+class _CoordinatorServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+class _ScannerHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        self.server.coordinator._handle_connection(self.request, self.rfile, self.client_address)
+
+
+class ShardCoordinator:
+    """
+    🌐 Координатор шардів:
+    - приймає сканери по TCP і роздає їм символи (перерозподіл при зміні складу чи universe)
+    - разом з призначенням надсилає відкриті позиції (сканер їх не відсіює) та поточний MIN_SPREAD
+    - можливості від сканерів йдуть в on_opportunity в пулі потоків (один символ - одне рішення за раз)
+    """
+
+    def __init__(self, universe_fn, on_opportunity, host, port, auth_token='', decide_workers=8,
+                 heartbeat_timeout=30, rebalance_interval=10, open_symbols_fn=None, params_fn=None,
+                 stop_event=None, deadline_sec=None):
+        self.universe_fn = universe_fn
+        self.on_opportunity = on_opportunity
+        self.host = host
+        self.port = port
+        self.auth_token = auth_token
+        self.heartbeat_timeout = heartbeat_timeout
+        self.rebalance_interval = rebalance_interval
+        self.open_symbols_fn = open_symbols_fn
+        self.params_fn = params_fn
+        self.stop_event = stop_event or threading.Event()
+        self.deadline_sec = deadline_sec
+
+        self.scanners = {}  # shard_id -> _ScannerConnection
+        self.lock = threading.Lock()
+        self.rebalance_lock = threading.Lock()
+        self.decide_executor = ThreadPoolExecutor(max_workers=decide_workers, thread_name_prefix="shard-decide")
+        self.decide_pending = set()
+        self.universe = []
+        self.local_processes = {}  # shard_id -> subprocess.Popen
+        self.server = None
+        self.workers = []
+        self.stats = {
+            'started_at': None,
+            'opportunities': 0,
+            'duplicates': 0,
+            'decisions': 0,
+            'errors': 0,
+            'deadline_exceeded': 0,
+            'rebalances': 0,
+            'rejected': 0,
+            'disconnects': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # 🟢 Життєвий цикл
+    # ------------------------------------------------------------------
+    def start(self):
+        if not self.auth_token and not is_loopback(self.host):
+            # Рішення координатора відкривають реальні позиції за метриками сканера - без токена їх міг би
+            # надіслати будь-хто, хто бачить порт
+            raise ValueError(f"❌ SHARD COORDINATOR: SHARD_AUTH_TOKEN обов'язковий для {self.host} "
+                             f"(без токена - тільки 127.0.0.1)")
+        self.stats['started_at'] = time.time()
+        self.server = _CoordinatorServer((self.host, self.port), _ScannerHandler)
+        self.server.coordinator = self
+        self.port = self.server.server_address[1]  # port=0 -> вибраний ОС
+
+        server_thread = threading.Thread(target=self.server.serve_forever, name="shard-coordinator", daemon=True)
+        maintenance_thread = threading.Thread(target=self._maintenance_loop, name="shard-maintenance", daemon=True)
+        server_thread.start()
+        maintenance_thread.start()
+        self.workers = [server_thread, maintenance_thread]
+        logging.info(f"🌐 SHARD COORDINATOR: Очікую сканери на {self.host}:{self.port}")
+
+    def spawn_local_scanners(self, count):
+        """Запускає count сканерів на цьому хості (окремі процеси - окремий GIL)"""
+        for i in range(count):
+            self._spawn_local(f"local-{i + 1}")
+
+    def _spawn_local(self, shard_id):
+        connect_host = '127.0.0.1' if self.host in ('', '0.0.0.0') else self.host
+        env = dict(os.environ, SHARD_ID=shard_id, SHARD_COORDINATOR_HOST=connect_host,
+                   SHARD_COORDINATOR_PORT=str(self.port))
+        self.local_processes[shard_id] = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__)], env=env, cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        logging.info(f"🚀 SHARD COORDINATOR: Запущено локальний сканер {shard_id} (pid {self.local_processes[shard_id].pid})")
+
+    def stop(self, timeout=5):
+        self.stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        with self.lock:
+            connections = list(self.scanners.values())
+        for conn in connections:
+            conn.close()
+        for process in self.local_processes.values():
+            process.terminate()
+        for process in self.local_processes.values():
+            try:
+                process.wait(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self.decide_executor.shutdown(wait=False)
+        logging.info("🔴 SHARD COORDINATOR: Зупинено")
+
+    def is_running(self):
+        return not self.stop_event.is_set() and any(t.is_alive() for t in self.workers)
+
+    # ------------------------------------------------------------------
+    # 🔌 З'єднання сканерів
+    # ------------------------------------------------------------------
+    def _handle_connection(self, sock, stream, address):
+        messages = read_messages(stream)
+        try:
+            hello = next(messages, None)
+        except OSError:
+            return
+        authorized = hello and _authorized(self.auth_token, hello.get('token'), allow_open=is_loopback(self.host))
+        if not hello or hello.get('type') != 'hello' or not authorized:
+            with self.lock:
+                self.stats['rejected'] += 1
+            logging.warning(f"⛔ SHARD COORDINATOR: Відхилено підключення {address[0]}:{address[1]}")
+            return
+
+        shard_id = str(hello.get('shard_id') or f"{address[0]}:{address[1]}")
+        conn = _ScannerConnection(shard_id, sock, address)
+        with self.lock:
+            previous = self.scanners.get(shard_id)
+            self.scanners[shard_id] = conn
+        if previous:
+            previous.close()
+        logging.info(f"🔌 SHARD COORDINATOR: Сканер {shard_id} підключено ({conn.address})")
+        self.rebalance()
+
+        try:
+            for message in messages:
+                conn.last_seen = time.time()
+                kind = message.get('type')
+                if kind == 'opportunity':
+                    self._on_opportunity(conn, message)
+                elif kind == 'heartbeat':
+                    conn.report = message.get('stats') or {}
+        except OSError as e:
+            logging.warning(f"⚠️ SHARD COORDINATOR: З'єднання зі сканером {shard_id} обірвано: {e}")
+        finally:
+            with self.lock:
+                removed = self.scanners.get(shard_id) is conn
+                if removed:
+                    del self.scanners[shard_id]
+                    self.stats['disconnects'] += 1
+            if removed and not self.stop_event.is_set():
+                logging.warning(f"🔌 SHARD COORDINATOR: Сканер {shard_id} відключився - перерозподіл символів")
+                self.rebalance()
+
+    def _on_opportunity(self, conn, message):
+        symbol = message.get('symbol')
+        if not symbol or self.stop_event.is_set():
+            return  # координатор зупиняється - пул рішень вже закритий
+        with self.lock:
+            self.stats['opportunities'] += 1
+            conn.opportunities += 1
+            if symbol in self.decide_pending:
+                self.stats['duplicates'] += 1  # рішення по символу вже в черзі
+                return
+            self.decide_pending.add(symbol)
+        try:
+            self.decide_executor.submit(self._decide, symbol, message)
+        except RuntimeError:  # stop() закрив пул між перевіркою і submit
+            with self.lock:
+                self.decide_pending.discard(symbol)
+
+    def _decide(self, symbol, message):
+        started = time.perf_counter()
+        try:
+            with deadline_scope(self.deadline_sec):
+                self.on_opportunity(message)
+        except DeadlineExceeded as e:
+            with self.lock:
+                self.stats['deadline_exceeded'] += 1
+            metrics.inc('scan_deadline_exceeded_total', engine='sharded')
+            logging.warning(f"⏳ SHARD COORDINATOR: Рішення по {symbol} покинуто ({e})")
+        except Exception as e:
+            with self.lock:
+                self.stats['errors'] += 1
+            logging.error(f"❌ SHARD COORDINATOR: Помилка рішення для {symbol}: {e}")
+        finally:
+            with self.lock:
+                self.decide_pending.discard(symbol)
+                self.stats['decisions'] += 1
+            metrics.observe('scan_stage_seconds', time.perf_counter() - started, stage='shard_decide')
+
+    # ------------------------------------------------------------------
+    # ⚖️ Розподіл символів
+    # ------------------------------------------------------------------
+    def rebalance(self):
+        """Надсилає кожному сканеру його частину universe (тільки якщо щось змінилось)"""
+        with self.rebalance_lock:
+            try:
+                universe = sorted(self.universe_fn())
+            except Exception as e:
+                logging.error(f"❌ SHARD COORDINATOR: Помилка отримання символів: {e}")
+                universe = self.universe
+            open_symbols = sorted(self.open_symbols_fn()) if self.open_symbols_fn else []
+            params = self.params_fn() if self.params_fn else {}
+
+            with self.lock:
+                self.universe = universe
+                connections = dict(self.scanners)
+            assignments = assign_shards(universe, connections.keys())
+
+            changed = False
+            for shard_id, conn in connections.items():
+                symbols = assignments.get(shard_id, [])
+                if symbols == conn.symbols and open_symbols == conn.open_symbols and params == conn.params:
+                    continue
+                try:
+                    conn.send({'type': 'assign', 'symbols': symbols, 'open_symbols': open_symbols, 'params': params})
+                    changed = changed or symbols != conn.symbols
+                    conn.symbols, conn.open_symbols, conn.params = symbols, open_symbols, params
+                except OSError as e:
+                    logging.warning(f"⚠️ SHARD COORDINATOR: Не вдалося надіслати призначення {shard_id}: {e}")
+                    conn.close()
+            if changed:
+                with self.lock:
+                    self.stats['rebalances'] += 1
+                logging.info(f"⚖️ SHARD COORDINATOR: {len(universe)} символів розподілено між {len(connections)} сканерами: " +
+                             ", ".join(f"{shard_id}={len(symbols)}" for shard_id, symbols in assignments.items()))
+
+    def _maintenance_loop(self):
+        while not self.stop_event.wait(timeout=self.rebalance_interval):
+            now = time.time()
+            with self.lock:
+                stale = [conn for conn in self.scanners.values() if now - conn.last_seen > self.heartbeat_timeout]
+            for conn in stale:
+                logging.warning(f"💤 SHARD COORDINATOR: Сканер {conn.shard_id} мовчить {now - conn.last_seen:.0f}с - відключаю")
+                conn.close()
+
+            for shard_id, process in list(self.local_processes.items()):
+                if process.poll() is not None and not self.stop_event.is_set():
+                    logging.error(f"❌ SHARD COORDINATOR: Локальний сканер {shard_id} завершився (код {process.returncode}) - перезапуск")
+                    self._spawn_local(shard_id)
+
+            try:
+                self.rebalance()
+            except Exception as e:
+                logging.error(f"❌ SHARD COORDINATOR: Помилка перерозподілу: {e}")
+
+    # ------------------------------------------------------------------
+    # 📊 Статистика
+    # ------------------------------------------------------------------
+    def get_stats(self):
+        now = time.time()
+        with self.lock:
+            stats = dict(self.stats)
+            connections = list(self.scanners.values())
+            stats['decide_pending'] = len(self.decide_pending)
+            stats['universe'] = len(self.universe)
+        started_at = stats.pop('started_at')
+        shards = {
+            conn.shard_id: {
+                'address': conn.address,
+                'symbols': len(conn.symbols or []),
+                'opportunities': conn.opportunities,
+                'last_seen_sec': round(now - conn.last_seen, 1),
+                'connected_sec': round(now - conn.connected_at, 1),
+                'report': conn.report,
+            }
+            for conn in connections
+        }
+        stats.update({
+            'engine': 'sharded',
+            'address': f"{self.host}:{self.port}",
+            'uptime_sec': round(now - started_at, 1) if started_at else 0,
+            'scanners': len(shards),
+            'local_processes': len(self.local_processes),
+            'evaluations_per_min': sum(shard['report'].get('evaluations_per_min', 0) for shard in shards.values()),
+            'shards': shards,
+        })
+        return stats
+
+
+class ShardScanner:
+    """
+    🛰️ Сканер: отримує свою частину символів від координатора, сканує їх власним ScanScheduler
+    і надсилає координатору символи, що пройшли фільтри (можливості та символи з відкритими позиціями).
+    evaluate_fn(symbol, has_position, params) -> dict з даними для рішення або None.
+    """
+
+    def __init__(self, host, port, shard_id, evaluate_fn, auth_token='', num_workers=20, rate_budgets=None,
+                 universe_filter=None, priority_tracker=None, deadline_sec=None, deadline_retry_sec=15.0,
+                 heartbeat_interval=5, stop_event=None):
+        self.host = host
+        self.port = port
+        self.shard_id = shard_id
+        self.evaluate_fn = evaluate_fn
+        self.auth_token = auth_token
+        self.universe_filter = universe_filter
+        self.heartbeat_interval = heartbeat_interval
+        self.stop_event = stop_event or threading.Event()
+
+        self.symbols = []
+        self.open_symbols = frozenset()
+        self.params = {}
+        self.sock = None
+        self.send_lock = threading.Lock()
+        self.stats = {'connects': 0, 'assignments': 0, 'opportunities_sent': 0, 'send_errors': 0}
+        self.scheduler = ScanScheduler(
+            worker_fn=self._evaluate,
+            num_workers=num_workers,
+            rate_budgets=rate_budgets,
+            stop_event=self.stop_event,
+            priority_tracker=priority_tracker,
+            deadline_sec=deadline_sec,
+            deadline_retry_sec=deadline_retry_sec,
+        )
+
+    def _universe(self):
+        symbols = list(self.symbols)
+        if self.universe_filter and symbols:
+            return self.universe_filter(symbols, self.open_symbols, self.params)
+        return symbols
+
+    def _evaluate(self, symbol):
+        item = self.evaluate_fn(symbol, symbol in self.open_symbols, self.params)
+        if item is None:
+            return
+        message = dict(item, type='opportunity', symbol=symbol, shard_id=self.shard_id, scanned_at=time.time())
+        if self._send(message):
+            self.stats['opportunities_sent'] += 1
+
+    def _send(self, message):
+        sock = self.sock
+        if sock is None:
+            return False
+        try:
+            with self.send_lock:
+                send_message(sock, message)
+            return True
+        except OSError as e:
+            self.stats['send_errors'] += 1
+            logging.warning(f"⚠️ SHARD SCANNER {self.shard_id}: Помилка надсилання: {e}")
+            return False
+
+    def _heartbeat_loop(self):
+        while not self.stop_event.wait(timeout=self.heartbeat_interval):
+            scheduler_stats = self.scheduler.get_stats()
+            self._send({'type': 'heartbeat', 'stats': {
+                'symbols': len(self.symbols),
+                'evaluations_per_min': scheduler_stats['evaluations_per_min'],
+                'in_flight': scheduler_stats['in_flight'],
+                'last_sweep_duration_sec': scheduler_stats['last_sweep_duration_sec'],
+                'deadline_exceeded': scheduler_stats['deadline_exceeded'],
+                **self.stats,
+            }})
+
+    def run(self):
+        """Блокуючий цикл: підключення (з повторами), отримання призначень, сканування"""
+        self.scheduler.start(self._universe)
+        threading.Thread(target=self._heartbeat_loop, name="shard-heartbeat", daemon=True).start()
+        backoff = 1
+        while not self.stop_event.is_set():
+            try:
+                sock = self.sock = socket.create_connection((self.host, self.port), timeout=10)
+                sock.settimeout(None)
+                send_message(sock, {'type': 'hello', 'shard_id': self.shard_id, 'token': self.auth_token})
+                self.stats['connects'] += 1
+                backoff = 1
+                logging.info(f"🔌 SHARD SCANNER {self.shard_id}: Підключено до координатора {self.host}:{self.port}")
+                for message in read_messages(sock.makefile('rb')):
+                    if message.get('type') == 'assign':
+                        self.symbols = list(message.get('symbols') or [])
+                        self.open_symbols = frozenset(message.get('open_symbols') or [])
+                        self.params = message.get('params') or {}
+                        self.stats['assignments'] += 1
+                        logging.info(f"📦 SHARD SCANNER {self.shard_id}: Призначено {len(self.symbols)} символів")
+                if not self.stop_event.is_set():
+                    logging.warning(f"🔌 SHARD SCANNER {self.shard_id}: Координатор закрив з'єднання")
+            except OSError as e:
+                if not self.stop_event.is_set():
+                    logging.warning(f"⚠️ SHARD SCANNER {self.shard_id}: Координатор недоступний: {e}")
+            finally:
+                # Без координатора символи вже можуть належати іншим сканерам - не скануємо їх
+                self.symbols = []
+                self._close()
+            self.stop_event.wait(timeout=backoff)
+            backoff = min(backoff * 2, 30)
+        self.scheduler.stop(timeout=5)
+
+    def _close(self):
+        sock, self.sock = self.sock, None
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def stop(self):
+        self.stop_event.set()
+        self._close()
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['symbols'] = len(self.symbols)
+        stats['connected'] = self.sock is not None
+        return stats
+
+
+if __name__ == "__main__":
+    # 🛰️ Процес-сканер: імпортує bot тільки тут (координатору модуль bot не потрібен для роботи сервера)
+    import bot
+    bot.run_shard_scanner()
@@ -4,6 +4,7 @@ from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
 from signal_parser import ArbitrageSignal
+from metrics import metrics
 # Simple fallback for price dynamics
 class DynamicsAnalysis:
     def __init__(self):
@@ -78,6 +79,7 @@ class SignalVerification:
     def __init__(self):
         self.cooldown_cache = {}  # Кеш для анти-дубль кулдауну
         
+    @metrics.timed('scan_stage_seconds', stage='verify_signal')
     def verify_signal(self, signal: ArbitrageSignal) -> VerificationResult:
         """
         Повна верифікація сигналу згідно з вашими вимогами
@@ -310,8 +312,8 @@ class SignalVerification:
             if not dex_client:
                 return {'found': False, 'error': 'DEX клієнт недоступний'}
             
-            # Отримуємо найкращу пару
-            best_pair = dex_client.resolve_best_pair(signal.asset)
+            # Отримуємо найкращу пару (перед угодою - тільки свіжі дані, без stale кешу)
+            best_pair = dex_client.resolve_best_pair(signal.asset, allow_stale=False)
             if not best_pair:
                 return {'found': False, 'error': 'DEX пара не знайдена'}
             
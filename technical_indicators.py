@@ -10,6 +10,8 @@ import logging
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 
+from ttl_cache import TTLCache
+
 logger = logging.getLogger(__name__)
 
 # Спробуємо імпортувати TA-Lib, якщо недоступний - використовуємо власні розрахунки
@@ -25,20 +27,17 @@ class TechnicalIndicators:
     """Клас для розрахунку технічних індикаторів"""
     
     def __init__(self):
-        self.cache = {}
         self.cache_ttl = 300  # 5 хвилин
+        # Ключ містить hash цін, тому без ліміту кеш ріс би з кожним новим набором цін
+        self.cache = TTLCache('technical_indicators', default_ttl=self.cache_ttl, max_entries=2000)
     
     def _get_cached_result(self, cache_key: str) -> Optional[dict]:
         """Отримати закешований результат"""
-        if cache_key in self.cache:
-            timestamp, result = self.cache[cache_key]
-            if datetime.now().timestamp() - timestamp < self.cache_ttl:
-                return result
-        return None
+        return self.cache.get(cache_key)
     
     def _cache_result(self, cache_key: str, result: dict):
         """Закешувати результат"""
-        self.cache[cache_key] = (datetime.now().timestamp(), result)
+        self.cache.set(cache_key, result)
     
     def calculate_rsi(self, prices: List[float], period: int = 14) -> float:
         """Розрахунок RSI (Relative Strength Index)"""
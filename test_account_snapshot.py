@@ -0,0 +1,49 @@
+"""
+Тестовий скрипт для перевірки резервування маржі в знімку балансів XT акаунтів
+"""
+import sys
+import time
+
+sys.path.insert(0, '/app')
+
+import account_snapshot as snapshot_module
+from account_snapshot import AccountSnapshotService
+
+def test_reservation_survives_refresh_before_fill():
+    """Тест: знімок, що почався до підтвердження ордера, не знімає резерв; підтверджений - знімає"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Резерв маржі до підтвердження ордера")
+    print("="*60)
+
+    exchange = {'free': 100.0}
+    original = snapshot_module.get_xt_futures_balance, snapshot_module.get_xt_open_positions
+    snapshot_module.get_xt_futures_balance = lambda client: {'total': 100.0, 'free': exchange['free'], 'used': 0.0}
+    snapshot_module.get_xt_open_positions = lambda client: []
+    try:
+        service = AccountSnapshotService(refresh_interval=60)
+        service.bind({'account_1': object()})
+        assert service.refresh()
+
+        first = service.reserve('account_1', 60)
+        assert first and service.reserve('account_1', 60) is None  # другий воркер не бачить зайняту маржу
+
+        service.refresh()  # ордер ще в дорозі - баланс біржі до fill
+        assert service.view()['accounts']['account_1']['available'] == 40.0
+
+        service.settle(first, filled=True)
+        time.sleep(0.01)
+        exchange['free'] = 40.0
+        service.refresh()  # знімок після підтвердження вже містить fill
+        available = service.view()['accounts']['account_1']['available']
+        print(f"   • доступно після fill: {available}, резервів: {len(service.reservations)}")
+        assert available == 40.0 and not service.reservations
+
+        failed = service.reserve('account_1', 30)
+        service.settle(failed, filled=False)  # ордер не відкрився - маржа повертається одразу
+        assert service.view()['accounts']['account_1']['available'] == 40.0
+    finally:
+        snapshot_module.get_xt_futures_balance, snapshot_module.get_xt_open_positions = original
+    print("\n✅ Резервування маржі працює правильно!")
+
+if __name__ == "__main__":
+    test_reservation_survives_refresh_before_fill()
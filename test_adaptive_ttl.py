@@ -0,0 +1,49 @@
+"""
+Тестовий скрипт для перевірки адаптивних TTL кешів цін
+"""
+import sys
+
+sys.path.insert(0, '/app')
+
+from adaptive_ttl import VolatilityTTL
+
+def test_ttl_follows_volatility():
+    """Тест: стабільний символ кешується довго, волатильний - коротко, без даних - базовий TTL"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: TTL за волатильністю")
+    print("="*60)
+
+    ttl = VolatilityTTL(min_ttl=10, max_ttl=600, target_move_pct=0.3)
+    ttl.observe('STABLE', 1.0, m5=0.01, h1=0.05)
+    ttl.observe('PUMP/USDT:USDT', 1.0, m5=10.0, h1=25.0)
+
+    stable, pump, unknown = ttl.ttl('STABLE', 180), ttl.ttl('PUMP', 180), ttl.ttl('NEW', 180)
+    print(f"   • STABLE: {stable}с, PUMP: {pump}с, NEW: {unknown}с")
+    assert stable == 600 and pump == 10 and unknown == 180
+
+    ttl.observe('MID', m5=0.6)  # 0.6% за 5 хв -> 300 * (0.3/0.6)^2 = 75с
+    assert abs(ttl.ttl('MID', 180) - 75) < 0.01
+    print("\n✅ TTL за волатильністю працює правильно!")
+
+def test_positions_and_near_entry():
+    """Тест: відкрита позиція і близькість до порогу входу обмежують TTL"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Позиції та поріг входу")
+    print("="*60)
+
+    ttl = VolatilityTTL(min_ttl=10, max_ttl=600, position_ttl=5, near_entry_ttl=20)
+    ttl.configure(open_positions_fn=lambda: {'HELD/USDT:USDT'}, near_entry_fn=lambda symbol: symbol == 'NEAR')
+    for symbol in ('HELD', 'NEAR', 'CALM'):
+        ttl.observe(symbol, 1.0, m5=0.0)
+    assert ttl.ttl('HELD', 180) == 5
+    assert ttl.ttl('NEAR', 180) == 20
+    assert ttl.ttl('CALM', 180) == 600
+
+    stats = ttl.get_stats()
+    print(f"   • причини: {stats['summary']}, найкоротший: {stats['symbols'][0]}")
+    assert stats['symbols'][0]['symbol'] == 'HELD' and stats['summary']['open_position'] == 1
+    print("\n✅ Обмеження TTL працюють правильно!")
+
+if __name__ == "__main__":
+    test_ttl_follows_volatility()
+    test_positions_and_near_entry()
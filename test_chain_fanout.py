@@ -0,0 +1,71 @@
+"""
+Тестовий скрипт для перевірки паралельних запитів до мереж у BlockchainPoolsClient
+"""
+import sys
+import time
+
+sys.path.insert(0, '/app')
+
+import config
+from blockchain_pools_client import BlockchainPoolsClient
+
+def _client(eth_delay, bsc_delay):
+    client = BlockchainPoolsClient()
+    calls = []
+
+    def fake_getter(network, price, delay):
+        def getter(symbol):
+            calls.append(network)
+            time.sleep(delay)
+            return price
+        return getter
+
+    client.get_ethereum_price = fake_getter('ethereum', 100.0, eth_delay)
+    client.get_bsc_price = fake_getter('bsc', 110.0, bsc_delay)
+    client.get_solana_price = fake_getter('solana', 50.0, 0.0)
+    return client, calls
+
+def test_first_valid_price_wins():
+    """Тест: ETH є в Ethereum і BSC - швидша мережа відповідає, повільна не блокує"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Перша валідна ціна")
+    print("="*60)
+
+    client, calls = _client(eth_delay=0.6, bsc_delay=0.05)
+    started = time.monotonic()
+    price = client.get_token_price('ETH/USDT:USDT')
+    elapsed = time.monotonic() - started
+    print(f"   • ціна ${price} за {elapsed:.2f}с, відповідь: {client.last_answers['ETH']}")
+    assert price == 110.0 and elapsed < 0.4
+    assert client.last_answers['ETH']['network'] == 'bsc' and client.stats['network_answers']['bsc'] == 1
+    assert sorted(calls) == ['bsc', 'ethereum']
+
+    time.sleep(0.8)  # пізня відповідь Ethereum звіряється з BSC: 10% розбіжності
+    assert client.stats['cross_chain_mismatches'] == 1
+
+    assert client.get_token_price('SOL') == 50.0 and calls[-1] == 'solana'  # пул тільки в Solana - без інших мереж
+    print("\n✅ Паралельні запити до мереж працюють правильно!")
+
+def test_liquidity_weighted():
+    """Тест: режим weighted чекає всі мережі і зважує ціни за ліквідністю пулів"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Зважена за ліквідністю ціна")
+    print("="*60)
+
+    client, _ = _client(eth_delay=0.05, bsc_delay=0.1)
+    client.pool_liquidity[('ethereum', 'ETH')] = 3_000_000
+    client.pool_liquidity[('bsc', 'ETH')] = 1_000_000
+    original = config.BLOCKCHAIN_PRICE_COMBINE
+    config.BLOCKCHAIN_PRICE_COMBINE = 'weighted'
+    try:
+        price = client.get_token_price('ETH')
+    finally:
+        config.BLOCKCHAIN_PRICE_COMBINE = original
+    print(f"   • зважена ціна ${price}, мережі: {client.last_answers['ETH']['networks']}")
+    assert abs(price - 102.5) < 1e-9
+    assert client.last_answers['ETH']['network'] == 'ethereum'
+    print("\n✅ Зважена ціна працює правильно!")
+
+if __name__ == "__main__":
+    test_first_valid_price_wins()
+    test_liquidity_weighted()
@@ -0,0 +1,102 @@
+"""
+Тестовий скрипт для перевірки пакетних запитів до DEX провайдерів
+"""
+import sys
+
+sys.path.insert(0, '/app')
+
+from dex_client import DexCheckClient, SYMBOL_TO_COINGECKO
+from pair_index import PairIndex
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200):
+        self.payload = payload
+        self.status_code = status_code
+        self.text = str(payload)
+
+    def json(self):
+        return self.payload
+
+
+class FakeCoinGeckoSession:
+    """Відповідає на simple/price для всіх ids, крім 'unknown'"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        ids = params['ids'].split(',')
+        self.calls.append(ids)
+        return FakeResponse({cid: {'usd': 2.0, 'usd_24h_vol': 1000.0} for cid in ids if cid != 'cardano'})
+
+
+class FakeDexScreenerSession:
+    """/tokens: повертає пари для переданих адрес (якісна пара тільки для першої)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        addresses = url.rsplit('/', 1)[1].split(',')
+        self.calls.append(addresses)
+        pairs = []
+        for i, address in enumerate(addresses):
+            pairs.append({
+                'chainId': 'ethereum', 'dexId': 'uniswap', 'pairAddress': f"0xpair{i}",
+                'baseToken': {'address': address.lower(), 'symbol': f"TKN{address[-4:]}"},
+                'priceUsd': '1.5', 'liquidity': {'usd': 50000 if i == 0 else 10}, 'volume': {'h24': 20000},
+            })
+        return FakeResponse({'pairs': pairs})
+
+
+def test_dexscreener_address_batch():
+    """Тест пакетного DexScreener: 75 відомих адрес - 3 запити, фільтри ліквідності застосовуються"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Пакетний DexScreener по адресах")
+    print("="*60)
+
+    client = DexCheckClient()
+    client.pair_index = PairIndex(':memory:')  # фейкові пари не потрапляють в індекс на диску
+    client.dexscreener_session = FakeDexScreenerSession()
+    client._apply_rate_limit = lambda provider, min_interval: None
+    client.has_direct_pool = lambda clean_symbol: False
+    client.token_addresses = {f"TKN{i:04d}": {'address': f"0xABC{i:04d}", 'chain': 'ethereum'} for i in range(75)}
+
+    found = client.prefetch_dexscreener_addresses([f"{s}/USDT:USDT" for s in client.token_addresses])
+    calls = client.dexscreener_session.calls
+    print(f"   • запитів: {len(calls)}, знайдено пар: {found}")
+    assert len(calls) == 3 and all(len(chunk) <= 30 for chunk in calls)
+    assert found == 3  # лише перша адреса кожного запиту має достатню ліквідність
+    assert client.get_cached_best_pair('TKN0000')['provider'] == 'dexscreener_batch'
+    assert client.negative_cache.should_skip('dexscreener', client._best_pair_cache_key('TKN0001'))
+    print("\n✅ Пакетний DexScreener працює правильно!")
+
+def test_coingecko_batch():
+    """Тест пакетного CoinGecko: запит на кожні 100 ids замість запиту на символ, поодинокий шлях читає кеш"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Пакетний CoinGecko")
+    print("="*60)
+
+    client = DexCheckClient()
+    client.coingecko_session = FakeCoinGeckoSession()
+    client._apply_rate_limit = lambda provider, min_interval: None
+    symbols = [f"{s}/USDT:USDT" for s in SYMBOL_TO_COINGECKO]
+
+    fetched = client.prefetch_coingecko(symbols)
+    calls = client.coingecko_session.calls
+    print(f"   • запитів: {len(calls)}, символів з ціною: {fetched}")
+    assert len(calls) == -(-len(set(SYMBOL_TO_COINGECKO[s.split('/')[0]] for s in symbols)) // 100)
+    assert all(len(ids) <= 100 for ids in calls)
+
+    assert client._try_coingecko('BTC')['price_usd'] == 2.0
+    assert client._try_coingecko('ADA') is None  # id відсутній у відповіді - без окремого запиту
+    assert len(client.coingecko_session.calls) == len(calls)
+
+    client.prefetch_coingecko(symbols)  # свіжий кеш - повторних запитів немає
+    assert len(client.coingecko_session.calls) == len(calls)
+    print("\n✅ Пакетний CoinGecko працює правильно!")
+
+if __name__ == "__main__":
+    test_coingecko_batch()
+    test_dexscreener_address_batch()
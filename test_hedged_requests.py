@@ -0,0 +1,66 @@
+"""
+Тестовий скрипт для перевірки hedged запитів до DEX провайдерів
+"""
+import sys
+import time
+
+sys.path.insert(0, '/app')
+
+from dex_client import DexCheckClient
+from provider_latency import ProviderLatencyTracker
+
+def test_latency_ordering():
+    """Тест порядку: швидкий і успішний для символу провайдер йде першим, холодні - в статичному порядку"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Порядок провайдерів за латентністю")
+    print("="*60)
+
+    tracker = ProviderLatencyTracker(min_samples=3)
+    for _ in range(5):
+        tracker.record('blockchain', 'ABC', 0.8, True)
+        tracker.record('coingecko', 'ABC', 0.2, True)
+        tracker.record('dexscreener', 'ABC', 0.1, False)
+    order = tracker.order(['blockchain', 'coingecko', 'dexscreener', 'cold'], 'ABC')
+    print(f"   • порядок: {order}, p95 blockchain: {tracker.hedge_delay('blockchain')}")
+    assert order == ['cold', 'coingecko', 'blockchain', 'dexscreener']
+    assert tracker.hedge_delay('blockchain') == 0.8 and tracker.hedge_delay('cold') == tracker.default_delay
+    print("\n✅ Порядок провайдерів працює правильно!")
+
+def test_hedge_fires_after_p95():
+    """Тест hedge: первинний провайдер завис - через його p95 запускається наступний і перемагає"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Hedge після p95")
+    print("="*60)
+
+    client = DexCheckClient()
+    client.latency_tracker = ProviderLatencyTracker(min_samples=3, min_delay=0.05)
+    for _ in range(5):
+        client.latency_tracker.record('blockchain', 'HDG', 0.1, True)  # зазвичай швидкий: p95 = 0.1с
+        client.latency_tracker.record('coingecko', 'HDG', 0.3, True)
+
+    def stuck(symbol, for_convergence):
+        time.sleep(1.0)
+        return {'price_usd': 1.0}
+
+    def normal(symbol):
+        time.sleep(0.05)
+        return {'price_usd': 2.0}
+
+    started = time.monotonic()
+    provider, data = client._race_providers('HDG', [('blockchain', stuck, ('HDG', False)),
+                                                    ('coingecko', normal, ('HDG',))], 'HDG_best_pair')
+    elapsed = time.monotonic() - started
+    print(f"   • переміг {provider} за {elapsed:.2f}с, статистика: {client.latency_tracker.get_stats()['hedge_won']}")
+    assert provider == 'coingecko' and data['price_usd'] == 2.0
+    assert elapsed < 0.5
+    assert client.latency_tracker.get_stats()['hedge_won'] == 1
+
+    client.hedging_enabled = False  # без hedge - чекаємо первинного
+    provider, _ = client._race_providers('HDG', [('blockchain', stuck, ('HDG', False)),
+                                                 ('coingecko', normal, ('HDG',))], 'HDG2_best_pair')
+    assert provider == 'blockchain'
+    print("\n✅ Hedged запити працюють правильно!")
+
+if __name__ == "__main__":
+    test_latency_ordering()
+    test_hedge_fires_after_p95()
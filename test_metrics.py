@@ -0,0 +1,42 @@
+"""
+Тестовий скрипт для перевірки гістограм латентності та Prometheus експорту
+"""
+import sys
+import time
+
+sys.path.insert(0, '/app')
+
+from metrics import MetricsRegistry
+
+def test_stage_histograms():
+    """Тест гістограм: p50/p99 в межах похибки кошика, коректний Prometheus текст"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ: Гістограми етапів")
+    print("="*60)
+
+    registry = MetricsRegistry()
+    for i in range(1, 101):
+        registry.observe('scan_stage_seconds', i / 1000.0, stage='dex_resolution')  # 1..100 мс
+    with registry.timer('scan_stage_seconds', stage='xt_ticker'):
+        time.sleep(0.01)
+    registry.inc('dex_provider_requests_total', provider='coingecko', result='hit')
+    registry.inc('dex_provider_requests_total', provider='coingecko', result='hit')
+
+    summary = registry.summary()
+    dex_stage = summary['scan_stage_seconds']['stage=dex_resolution']
+    print(f"   • dex_resolution: {dex_stage}")
+    assert dex_stage['count'] == 100
+    assert 50 <= dex_stage['p50_ms'] <= 60, "p50 має бути ~50мс (похибка кошика < 20%)"
+    assert 99 <= dex_stage['p99_ms'] <= 100
+    assert summary['scan_stage_seconds']['stage=xt_ticker']['count'] == 1
+    assert summary['dex_provider_requests_total']['provider=coingecko,result=hit'] == 2
+
+    text = registry.render_prometheus()
+    assert '# TYPE scan_stage_seconds histogram' in text
+    assert 'scan_stage_seconds_count{stage="dex_resolution"} 100' in text
+    assert 'scan_stage_seconds_bucket{stage="dex_resolution",le="+Inf"} 100' in text
+    assert 'dex_provider_requests_total{provider="coingecko",result="hit"} 2' in text
+    print("\n✅ Метрики працюють правильно!")
+
+if __name__ == "__main__":
+    test_stage_histograms()
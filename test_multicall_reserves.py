@@ -0,0 +1,91 @@
+"""
+Тестовий скрипт для перевірки пакетного читання резервів пулів через Multicall3
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, '/app')
+
+import config
+from blockchain_pools_client import BlockchainPoolsClient, GET_RESERVES_SELECTOR, Web3
+from pool_registry import PoolRegistry, TOKEN0_SELECTOR, TOKEN1_SELECTOR, DECIMALS_SELECTOR
+
+TOKEN = '0x' + '11' * 20
+USDT = '0x' + '55' * 20
+
+def _encode_reserves(reserve0, reserve1):
+    return reserve0.to_bytes(32, 'big') + reserve1.to_bytes(32, 'big') + (0).to_bytes(32, 'big')
+
+def _answer(call_data, address):
+    """Кожен пул - TOKEN(18)/USDT(18) з резервами 1000 / 2500"""
+    if call_data == GET_RESERVES_SELECTOR:
+        return _encode_reserves(1000 * 10**18, 2500 * 10**18)
+    if call_data in (TOKEN0_SELECTOR, TOKEN1_SELECTOR):
+        token = TOKEN if call_data == TOKEN0_SELECTOR else USDT
+        return bytes(12) + bytes.fromhex(token[2:])
+    if call_data == DECIMALS_SELECTOR:
+        return (18).to_bytes(32, 'big')
+    symbol = b'USDT' if address.lower() == USDT else b'TKN'
+    return symbol.ljust(32, b'\x00')
+
+class FakeMulticall:
+    """Контракт Multicall3: рахує пакети getReserves окремо від пакетів метаданих пулів"""
+
+    def __init__(self, failing=()):
+        self.requests = []
+        self.metadata_requests = []
+        self.failing = set(failing)
+        self.functions = self
+
+    def tryBlockAndAggregate(self, require_success, calls):
+        calls = list(calls)
+        is_reserves = all(call_data == GET_RESERVES_SELECTOR for _, call_data in calls)
+        (self.requests if is_reserves else self.metadata_requests).append(calls)
+        results = [(address not in self.failing, _answer(call_data, address)) for address, call_data in calls]
+        return type('Call', (), {'call': lambda _self: (123, b'\x00' * 32, results)})()
+
+def test_one_multicall_per_chain():
+    """Тест: промах кешу одного символу оновлює ціни всіх пулів мережі одним запитом"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Multicall getReserves для всіх пулів BSC")
+    print("="*60)
+
+    client = BlockchainPoolsClient()
+    client.pool_registry = PoolRegistry(os.path.join(tempfile.mkdtemp(), 'pool_registry.json'))
+    client.w3_bsc = client.w3_bsc or object()
+    client.multicall_enabled = True
+    failing = Web3.to_checksum_address(client.pools['bsc']['XVS']['address'])
+    fake = FakeMulticall(failing=[failing])
+    client.contracts[('bsc', Web3.to_checksum_address(config.MULTICALL3_ADDRESS))] = fake
+
+    price = client.get_bsc_price('CAKE')
+    print(f"   • CAKE: ${price}, запитів Multicall: {len(fake.requests)}, пулів у запиті: {len(fake.requests[0])}")
+    assert price == 2.5
+    assert len(fake.metadata_requests) == 2  # token0/token1 пулів + decimals/symbol токенів - один раз
+    pool_addresses = {info['address'].lower() for info in client.pools['bsc'].values()}
+    assert len(fake.requests) == 1 and len(fake.requests[0]) == len(pool_addresses)  # BTC і BTCB ділять пул
+    assert all(call_data == GET_RESERVES_SELECTOR for _, call_data in fake.requests[0])
+
+    # Інші пули вже в кеші - жодного нового RPC
+    assert client.get_bsc_price('BNB') == 2.5 and client.get_bsc_price('DOGE') == 2.5
+    assert len(fake.requests) == 1
+    assert client.stats['multicall_prices'] == len(client.pools['bsc']) - 1  # XVS повернув помилку
+    assert client._peek_cache(client._get_cache_key('XVS', 'bsc')) is None
+
+    # Prefetch кожного циклу диспетчера: свіжа мережа пропускається
+    client.w3_eth = None  # тільки BSC
+    client.multicall_refreshed_at.pop('bsc')
+    client.refresh_all_reserves()
+    client.refresh_all_reserves()
+    assert len(fake.requests) == 2
+
+    # Синхронізований трекер Sync подій сам оновлює кеш - пакет не потрібен
+    client.multicall_refreshed_at.pop('bsc')
+    client.reserve_trackers['bsc'] = type('Tracker', (), {'is_synced': lambda self: True})()
+    client.refresh_all_reserves()
+    assert len(fake.requests) == 2
+    print("\n✅ Multicall getReserves працює правильно!")
+
+if __name__ == "__main__":
+    test_one_multicall_per_chain()
@@ -0,0 +1,39 @@
+"""
+Тестовий скрипт для перевірки негативного кешу DEX провайдерів
+"""
+import sys
+import time
+
+sys.path.insert(0, '/app')
+
+from negative_cache import NegativeResultCache
+
+def test_negative_cache_backoff():
+    """Тест негативного кешу: інтервал подвоюється з кожним промахом, успіх скидає запис"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ: Негативний кеш з експоненційним backoff")
+    print("="*60)
+
+    cache = NegativeResultCache(base_interval=10, max_interval=35, jitter=0)
+    intervals = [cache.record_miss('coingecko', 'NOPE_best_pair') for _ in range(4)]
+    print(f"   • інтервали: {intervals}")
+    assert intervals == [10, 20, 35, 35]
+    assert cache.should_skip('coingecko', 'NOPE_best_pair')
+    assert not cache.should_skip('dexscreener', 'NOPE_best_pair')
+    assert not cache.backing_off('NOPE_best_pair', ['coingecko', 'dexscreener'])
+
+    cache.record_miss('dexscreener', 'NOPE_best_pair')
+    assert cache.backing_off('NOPE_best_pair', ['coingecko', 'dexscreener'])
+
+    cache.entries[('coingecko', 'NOPE_best_pair')]['retry_at'] = time.time() - 1  # час повторної перевірки
+    assert not cache.should_skip('coingecko', 'NOPE_best_pair')
+    cache.record_hit('coingecko', 'NOPE_best_pair')
+    cache.forget('NOPE_best_pair', providers=('dexscreener',))
+
+    stats = cache.get_stats()
+    print(f"   • статистика: {stats}")
+    assert stats['entries'] == 0 and stats['recovered'] == 1
+    print("\n✅ Негативний кеш працює правильно!")
+
+if __name__ == "__main__":
+    test_negative_cache_backoff()
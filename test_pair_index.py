@@ -0,0 +1,86 @@
+"""
+Тестовий скрипт для перевірки постійного індексу DEX пар
+"""
+import os
+import sys
+import time
+import tempfile
+
+sys.path.insert(0, '/app')
+
+from pair_index import PairIndex
+from dex_client import DexCheckClient
+
+def test_pair_index_warm_start():
+    """Тест індексу: пари переживають перезапуск, старі записи видаляються, адреси доповнюють мапінг"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ: Індекс пар і теплий старт")
+    print("="*60)
+
+    path = os.path.join(tempfile.mkdtemp(), 'pairs.sqlite3')
+    index = PairIndex(path, max_age=3600, write_interval=300)
+    pair = {'chain': 'bsc', 'pair_address': '0xpair', 'token_address': '0xToken', 'dex_id': 'pancakeswap',
+            'quote_token_symbol': 'WBNB', 'pair_created_at': 1700000000000, 'liquidity_usd': 50000.0,
+            'volume_24h': 20000.0, 'provider': 'dexscreener_fallback'}
+    assert index.record('NEWTKN', pair)
+    assert not index.record('NEWTKN', pair)  # та сама пара - запис не частіше write_interval
+    assert not index.record('CGONLY', {'price_usd': 1.0, 'chain': 'multi'})  # без адрес не індексується
+    assert index.record('OLDTKN', dict(pair, token_address='0xOld'))
+    index.connection.execute("UPDATE pairs SET verified_at = ? WHERE symbol = 'OLDTKN'", (time.time() - 7200,))
+    index.connection.commit()
+    index.close()
+
+    reopened = PairIndex(path, max_age=3600)
+    entries = reopened.load()
+    print(f"   • записів після перезапуску: {list(entries)}, статистика: {reopened.get_stats()}")
+    assert list(entries) == ['NEWTKN'] and entries['NEWTKN']['quote_symbol'] == 'WBNB'
+    assert reopened.get_stats()['pruned'] == 1
+
+    client = DexCheckClient()
+    client.indexed_pairs = entries
+    mappings = client._with_indexed_addresses({'BTC': {'address': '0xbtc', 'chain': 'ethereum'}})
+    assert mappings['NEWTKN']['address'] == '0xToken' and mappings['NEWTKN']['source'] == 'pair_index'
+    print("\n✅ Індекс пар працює правильно!")
+
+class FakeTokensSession:
+    """/tokens: якісна пара для кожної переданої адреси"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get(self, url, params=None, timeout=None):
+        addresses = url.rsplit('/', 1)[1].split(',')
+        self.calls.append(addresses)
+        pairs = [{'chainId': 'bsc', 'dexId': 'pancakeswap', 'pairAddress': '0xpair',
+                  'baseToken': {'address': address.lower(), 'symbol': 'AGED'}, 'priceUsd': '1.5',
+                  'liquidity': {'usd': 50000}, 'volume': {'h24': 20000}} for address in addresses]
+        return type('Response', (), {'status_code': 200, 'json': lambda self: {'pairs': pairs}})()
+
+def test_background_reverification():
+    """Тест: записи, що старіють, перевіряються пакетним /tokens запитом без сканування символу"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Фонова перевірка індексу пар")
+    print("="*60)
+
+    index = PairIndex(os.path.join(tempfile.mkdtemp(), 'pairs.sqlite3'), max_age=7 * 86400, write_interval=300)
+    pair = {'chain': 'bsc', 'pair_address': '0xpair', 'token_address': '0xAged', 'liquidity_usd': 50000.0}
+    assert index.record('AGED', pair) and index.record('FRESH', dict(pair, token_address='0xFresh'))
+    aged_at = time.time() - 2 * 86400
+    index.connection.execute("UPDATE pairs SET verified_at = ? WHERE symbol = 'AGED'", (aged_at,))
+    index.connection.commit()
+    index.load()
+    assert [entry['symbol'] for entry in index.stale(86400)] == ['AGED']
+
+    client = DexCheckClient()
+    client.pair_index = index
+    client.dexscreener_session = FakeTokensSession()
+    client._apply_rate_limit = lambda provider, min_interval: None
+    assert client.refresh_pair_index() == 1
+    print(f"   • запити /tokens: {client.dexscreener_session.calls}")
+    assert client.dexscreener_session.calls == [['0xAged']]  # свіжий запис не перевіряється
+    assert not index.stale(86400)  # verified_at оновлено
+    print("\n✅ Фонова перевірка індексу пар працює правильно!")
+
+if __name__ == "__main__":
+    test_pair_index_warm_start()
+    test_background_reverification()
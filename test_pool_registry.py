@@ -0,0 +1,85 @@
+"""
+Тестовий скрипт для перевірки реєстру метаданих пулів (token0/token1, decimals, орієнтація, USD курс котирування)
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, '/app')
+
+import config
+from blockchain_pools_client import BlockchainPoolsClient, GET_RESERVES_SELECTOR, Web3
+from pool_registry import PoolRegistry, TOKEN0_SELECTOR, TOKEN1_SELECTOR, DECIMALS_SELECTOR
+
+def _address(n):
+    return '0x' + f'{n:02x}' * 20
+
+WETH, USDT, UNI, PEPE, MATIC = _address(1), _address(2), _address(3), _address(4), _address(5)
+TOKENS = {WETH: (b'WETH', 18), USDT: (b'USDT', 6), UNI: (b'UNI', 18), PEPE: (b'PEPE', 18), MATIC: (b'MATIC', 18)}
+POOLS = {  # адреса пулу -> (token0, token1, reserve0, reserve1)
+    _address(0x10): (WETH, USDT, 1000 * 10**18, 3_000_000 * 10**6),   # ETH = $3000
+    _address(0x11): (UNI, WETH, 10_000 * 10**18, 20 * 10**18),        # UNI = 0.002 ETH
+    _address(0x12): (WETH, PEPE, 10 * 10**18, 3 * 10**12 * 10**18),   # PEPE/WETH з WETH як token0
+    _address(0x13): (USDT, MATIC, 500_000 * 10**6, 1_000_000 * 10**18),  # USDT(6) як token0
+}
+
+class FakeMulticall:
+    def __init__(self):
+        self.requests = []
+        self.functions = self
+
+    def _answer(self, address, call_data):
+        address = address.lower()
+        if call_data == GET_RESERVES_SELECTOR:
+            _, _, reserve0, reserve1 = POOLS[address]
+            return reserve0.to_bytes(32, 'big') + reserve1.to_bytes(32, 'big') + bytes(32)
+        if call_data in (TOKEN0_SELECTOR, TOKEN1_SELECTOR):
+            token = POOLS[address][0 if call_data == TOKEN0_SELECTOR else 1]
+            return bytes(12) + bytes.fromhex(token[2:])
+        symbol, decimals = TOKENS[address]
+        if call_data == DECIMALS_SELECTOR:
+            return decimals.to_bytes(32, 'big')
+        return (32).to_bytes(32, 'big') + len(symbol).to_bytes(32, 'big') + symbol.ljust(32, b'\x00')
+
+    def tryBlockAndAggregate(self, require_success, calls):
+        calls = list(calls)
+        self.requests.append([call_data for _, call_data in calls])
+        results = [(True, self._answer(address, call_data)) for address, call_data in calls]
+        return type('Call', (), {'call': lambda _self: (777, b'\x00' * 32, results)})()
+
+def _client(path):
+    client = BlockchainPoolsClient()
+    client.pool_registry = PoolRegistry(path)
+    client.w3_eth = client.w3_eth or object()
+    client.multicall_enabled = True
+    client.pools['ethereum'] = {'ETH': {'address': _address(0x10)}, 'UNI': {'address': _address(0x11)},
+                                'PEPE': {'address': _address(0x12)}, 'MATIC': {'address': _address(0x13)}}
+    fake = FakeMulticall()
+    client.contracts[('ethereum', Web3.to_checksum_address(config.MULTICALL3_ADDRESS))] = fake
+    return client, fake
+
+def test_orientation_and_quote_rates():
+    """Тест: TOKEN/WETH і USDT/TOKEN пули дають правильну ціну в USD, метадані - один раз і з диска"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Орієнтація пулів, decimals і курс WETH")
+    print("="*60)
+
+    path = os.path.join(tempfile.mkdtemp(), 'pool_registry.json')
+    client, fake = _client(path)
+    assert client.refresh_chain_reserves('ethereum') == 4
+    prices = {s: client._peek_cache(client._get_cache_key(s, 'ethereum')) for s in ('ETH', 'UNI', 'PEPE', 'MATIC')}
+    print(f"   • ціни: {prices}")
+    print(f"   • курси котирувань: {client.quote_rates.get_stats()}")
+    assert abs(prices['ETH'] - 3000) < 1e-6 and abs(prices['UNI'] - 6.0) < 1e-9
+    assert abs(prices['PEPE'] - 1e-8) < 1e-15 and abs(prices['MATIC'] - 0.5) < 1e-12
+    assert client.pool_registry.get('ethereum', _address(0x13))['base_symbol'] == 'MATIC'
+    assert abs(client.pool_liquidity[('ethereum', 'UNI')] - 2 * 20 * 3000) < 1e-6
+    assert len(fake.requests) == 3  # token0/token1 + decimals/symbol + getReserves
+
+    restarted, fake = _client(path)  # новий процес: метадані з файла, тільки getReserves
+    assert restarted.refresh_chain_reserves('ethereum') == 4
+    assert len(fake.requests) == 1 and set(fake.requests[0]) == {GET_RESERVES_SELECTOR}
+    print("\n✅ Реєстр метаданих пулів працює правильно!")
+
+if __name__ == "__main__":
+    test_orientation_and_quote_rates()
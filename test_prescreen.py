@@ -0,0 +1,42 @@
+"""
+Тестовий скрипт для перевірки векторного пре-скрину символів
+"""
+import sys
+import time
+
+sys.path.insert(0, '/app')
+
+from prescreen import SpreadPrescreener
+
+def test_prescreen_filters():
+    """Тест пре-скрину: відсіюються тільки символи зі свіжою DEX ціною без шансу на спред"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ: Векторний пре-скрин")
+    print("="*60)
+
+    prescreener = SpreadPrescreener(spread_fraction=0.5, dex_price_max_age=300)
+    prescreener.record_dex_price('WIDE/USDT:USDT', 1.05)     # ~4.7% спред - кандидат
+    prescreener.record_dex_price('FLAT/USDT:USDT', 1.0)      # ~0% спред - відсів
+    prescreener.record_dex_price('FAKE/USDT:USDT', 10.0)     # 10x кратність - фейк
+    prescreener.record_dex_price('ETH/USDT:USDT', 1500.0)    # поза очікуваним діапазоном
+    prescreener.record_dex_price('OLD/USDT:USDT', 1.0)
+    prescreener.dex_prices['OLD/USDT:USDT'] = (1.0, time.time() - 3600)  # застаріла DEX ціна
+
+    xt_prices = {
+        'WIDE/USDT:USDT': 1.0,
+        'FLAT/USDT:USDT': 1.0,
+        'FAKE/USDT:USDT': 1.0,
+        'ETH/USDT:USDT': 1450.0,
+        'OLD/USDT:USDT': 1.0,
+        'NEW/USDT:USDT': 2.0,
+        'NOXT/USDT:USDT': None,
+    }
+    passed = prescreener.screen(list(xt_prices.keys()), xt_prices, min_spread=2.0)
+    print(f"   • пройшли: {passed}")
+    print(f"   • статистика: {prescreener.get_stats()}")
+    assert passed == ['WIDE/USDT:USDT', 'OLD/USDT:USDT', 'NEW/USDT:USDT']
+    assert prescreener.screen(['A/USDT'], {}, min_spread=2.0) == ['A/USDT'], "Без знімка XT нічого не відсіюємо"
+    print("\n✅ Пре-скрин працює правильно!")
+
+if __name__ == "__main__":
+    test_prescreen_filters()
@@ -0,0 +1,89 @@
+"""
+Тестовий скрипт для перевірки спільного rate governor
+"""
+import sys
+import time
+import threading
+
+sys.path.insert(0, '/app')
+
+from rate_governor import RateGovernor, PRIORITY_CRITICAL, set_traffic_lane, traffic_priority
+from deadline import DeadlineExceeded, deadline_scope
+
+def test_burst_and_rate():
+    """Тест відра: burst без очікування, далі рівно rate запитів/сек, 429 призупиняє провайдера"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Burst, ліміт і throttle")
+    print("="*60)
+
+    governor = RateGovernor({'api': (20.0, 5, 0)})
+    started = time.monotonic()
+    for _ in range(5):
+        governor.acquire('api')
+    burst_time = time.monotonic() - started
+    for _ in range(10):
+        governor.acquire('api')
+    total = time.monotonic() - started
+    print(f"   • burst: {burst_time:.3f}с, 15 запитів: {total:.2f}с")
+    assert burst_time < 0.05 and 0.45 <= total < 0.8
+
+    governor.throttle('api', 0.3)
+    started = time.monotonic()
+    governor.acquire('api')
+    assert time.monotonic() - started >= 0.3
+    assert not governor.acquire('api', timeout=0.01)
+
+    with deadline_scope(0.05):
+        governor.throttle('api', 1.0)
+        try:
+            governor.acquire('api')
+            assert False, "Має бути DeadlineExceeded"
+        except DeadlineExceeded:
+            pass
+    stats = governor.get_stats()['api']
+    print(f"   • статистика: {stats}")
+    assert stats['throttled'] == 2 and stats['timeouts'] == 1
+    print("\n✅ Burst і ліміт працюють правильно!")
+
+def test_priority_and_fairness():
+    """Тест черги: ордери обходять сканер, монітор отримує токени нарівні з 8 воркерами сканера"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Пріоритет ордерів і чесна черга")
+    print("="*60)
+
+    governor = RateGovernor({'xt_private': (20.0, 3, 2)})
+    governor.acquire('xt_private')  # резерв 2 токени: сканер вже чекає, ордер - ні
+    started = time.monotonic()
+    with traffic_priority(PRIORITY_CRITICAL):
+        governor.acquire('xt_private:Account 1')
+        governor.acquire('xt_private:Account 1')
+    assert time.monotonic() - started < 0.02
+
+    granted = []
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    def client(lane):
+        set_traffic_lane(lane)
+        while not stop.is_set():
+            if governor.acquire('xt_private', stop_event=stop):
+                with lock:
+                    granted.append(lane)
+
+    threads = [threading.Thread(target=client, args=('scanner',)) for _ in range(8)]
+    threads.append(threading.Thread(target=client, args=('monitor',)))
+    for t in threads:
+        t.start()
+    time.sleep(1.0)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    monitor_share = granted.count('monitor') / len(granted)
+    print(f"   • видано токенів: {len(granted)}, частка монітора: {monitor_share:.0%}")
+    assert 0.35 <= monitor_share <= 0.65
+    print("\n✅ Пріоритети і чесна черга працюють правильно!")
+
+if __name__ == "__main__":
+    test_burst_and_rate()
+    test_priority_and_fairness()
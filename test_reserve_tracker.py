@@ -0,0 +1,87 @@
+"""
+Тестовий скрипт для перевірки трекера резервів пулів за Sync подіями
+"""
+import sys
+
+sys.path.insert(0, '/app')
+
+from reserve_tracker import SyncReserveTracker, SYNC_TOPIC
+
+POOL_A = '0x' + 'aa' * 20
+POOL_B = '0x' + 'bb' * 20
+
+def _sync_log(address, reserve0, reserve1, block, index=0):
+    data = reserve0.to_bytes(32, 'big') + reserve1.to_bytes(32, 'big')
+    return {'address': address, 'data': data, 'blockNumber': block, 'logIndex': index}
+
+def test_incremental_sync():
+    """Тест: знімок на старті, далі один getLogs на новий блок і оновлення тільки змінених пулів"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Інкрементальні резерви по Sync подіях")
+    print("="*60)
+
+    chain = {'block': 100, 'logs': [], 'log_requests': [], 'snapshots': 0}
+    updates = []
+
+    def snapshot():
+        chain['snapshots'] += 1
+        return chain['block'], {POOL_A: (10, 20), POOL_B: (30, 40)}
+
+    def get_logs(from_block, to_block, addresses, topic):
+        assert topic == SYNC_TOPIC and set(addresses) == {POOL_A, POOL_B}
+        chain['log_requests'].append((from_block, to_block))
+        return chain['logs']
+
+    tracker = SyncReserveTracker('bsc', [POOL_A, POOL_B], lambda: chain['block'], get_logs, snapshot,
+                                 on_update=lambda *args: updates.append(args), max_block_range=50)
+    assert tracker.sync_once() == 2 and chain['snapshots'] == 1
+    assert tracker.get_reserves(POOL_A) == (10, 20, 100)
+
+    tracker.sync_once()  # блок не змінився - жодного getLogs
+    assert chain['log_requests'] == []
+
+    chain['block'] = 102
+    chain['logs'] = [_sync_log(POOL_A, 11, 21, 101), _sync_log(POOL_A, 12, 22, 102, 3)]
+    updates.clear()
+    assert tracker.sync_once() == 1
+    print(f"   • getLogs: {chain['log_requests']}, оновлення: {updates}")
+    assert chain['log_requests'] == [(101, 102)]
+    assert updates == [(POOL_A, 12, 22, 102)]  # тільки останній Sync змінених пулів
+    assert tracker.get_reserves(POOL_B) == (30, 40, 102)  # незмінний пул актуальний на останньому блоці
+
+    chain['block'] = 500  # великий розрив - знімок замість логів
+    tracker.sync_once()
+    assert chain['snapshots'] == 2 and len(chain['log_requests']) == 1
+
+    tracker.synced_at -= tracker.stale_after + 1  # трекер відстав - дані не віддаються
+    assert tracker.get_reserves(POOL_A) is None
+    print("\n✅ Трекер Sync подій працює правильно!")
+
+def test_snapshot_behind_head():
+    """Тест: знімок з вузла, що відстає від голови - Sync події після блоку знімка не губляться"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Знімок відстає від eth_blockNumber")
+    print("="*60)
+
+    log_requests = []
+
+    def get_logs(from_block, to_block, addresses, topic):
+        log_requests.append((from_block, to_block))
+        return [_sync_log(POOL_A, 15, 25, 99)]
+
+    head = {'block': 100}
+    tracker = SyncReserveTracker('eth', [POOL_A, POOL_B], lambda: head['block'], get_logs,
+                                 lambda: (97, {POOL_A: (10, 20), POOL_B: (30, 40)}))
+    tracker.sync_once()
+    assert tracker.last_block == 97
+    assert tracker.get_reserves(POOL_A) == (10, 20, 97)  # актуальні на блоці знімка, не на голові
+
+    assert tracker.sync_once() == 1
+    print(f"   • getLogs: {log_requests}, резерви: {tracker.get_reserves(POOL_A)}")
+    assert log_requests == [(98, 100)]
+    assert tracker.get_reserves(POOL_A) == (15, 25, 100)
+    print("\n✅ Курсор трекера після знімка працює правильно!")
+
+if __name__ == "__main__":
+    test_incremental_sync()
+    test_snapshot_behind_head()
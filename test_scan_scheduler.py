@@ -0,0 +1,189 @@
+"""
+Тестовий скрипт для перевірки планувальника сканування (постійний пул воркерів)
+"""
+import sys
+import time
+import threading
+
+sys.path.insert(0, '/app')
+
+from scan_scheduler import ScanScheduler, SymbolPriorityTracker
+from rate_governor import rate_governor
+from scan_pipeline import PipelineStage, ScanPipeline
+from deadline import call_with_deadline, check_deadline
+
+def test_token_bucket_rate():
+    """Тест бюджету запитів сканера (лімітер rate_governor): 20 токенів при 50/с займають ~0.2-0.4с"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Бюджет сканера через rate governor")
+    print("="*60)
+
+    rate_governor.configure('scan_test', 50, burst=1)
+    start = time.monotonic()
+    for _ in range(20):
+        assert rate_governor.acquire('scan_test', lane='scanner')
+    elapsed = time.monotonic() - start
+    print(f"   • 20 токенів за {elapsed:.2f}с")
+    assert 0.3 <= elapsed < 1.0, "Бюджет запитів не дотримано"
+
+    stop_event = threading.Event()
+    stop_event.set()
+    rate_governor.configure('scan_test_slow', 0.1, burst=1)
+    assert rate_governor.acquire('scan_test_slow', lane='scanner', stop_event=stop_event)
+    assert not rate_governor.acquire('scan_test_slow', lane='scanner', stop_event=stop_event), "Зупинка має перервати очікування"
+    print("\n✅ Бюджет сканера працює правильно!")
+
+def test_scheduler_sweeps():
+    """Тест безперервного сканування: кілька sweep'ів постійними воркерами"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Безперервні sweep'и")
+    print("="*60)
+
+    seen = {}
+    seen_lock = threading.Lock()
+    thread_names = set()
+
+    def worker(symbol):
+        with seen_lock:
+            seen[symbol] = seen.get(symbol, 0) + 1
+            thread_names.add(threading.current_thread().name)
+        if symbol == 'BAD/USDT':
+            raise RuntimeError("тестова помилка")
+        time.sleep(0.01)
+
+    symbols = [f"T{i}/USDT" for i in range(20)] + ['BAD/USDT']
+    scheduler = ScanScheduler(worker, num_workers=4, rate_budgets={'xt': 500}, stop_event=threading.Event())
+    scheduler.start(lambda: symbols)
+
+    deadline = time.time() + 10
+    while scheduler.get_stats()['sweeps_completed'] < 2 and time.time() < deadline:
+        time.sleep(0.05)
+    stats = scheduler.get_stats()
+    scheduler.stop(timeout=2)
+
+    print(f"   • sweep'ів: {stats['sweeps_completed']}, останній {stats['last_sweep_duration_sec']}с")
+    print(f"   • оцінок: {stats['evaluations']}, помилок: {stats['errors']}")
+    assert stats['sweeps_completed'] >= 2, "Має завершитись щонайменше 2 sweep'и"
+    assert all(seen.get(s, 0) >= 2 for s in symbols), "Кожен символ має бути оброблений в кожному sweep"
+    assert stats['errors'] >= 2, "Помилки воркера мають рахуватись, а не зупиняти пул"
+    assert len(thread_names) <= 4, "Мають використовуватись тільки постійні воркери"
+    print("\n✅ Планувальник працює правильно!")
+
+def test_priority_intervals():
+    """Тест пріоритету: символ біля порогу сканується частіше за "мертвий" """
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 3: Пріоритетні інтервали")
+    print("="*60)
+
+    opportunities = {'OPP/USDT': {'timestamp': time.time()}}
+    tracker = SymbolPriorityTracker(min_spread_fn=lambda: 2.0, opportunity_lookup=opportunities.get,
+                                    min_interval=3, max_interval=300, no_data_interval=120)
+    started_at = time.time()
+    for _ in range(5):
+        tracker.observe_spread('NEAR/USDT', 1.9)
+        tracker.observe_spread('DEAD/USDT', 0.01)
+    for symbol in ('NEAR/USDT', 'DEAD/USDT', 'NODATA/USDT', 'OPP/USDT'):
+        tracker.finish(symbol, started_at)
+
+    schedule = tracker.get_assignments()
+    intervals = {row['symbol']: row['interval_sec'] for row in schedule['assignments']}
+    print(f"   • інтервали: {intervals}")
+    print(f"   • tiers: {schedule['summary']}")
+    assert intervals['OPP/USDT'] == 3, "Свіжа можливість має найвищий пріоритет"
+    assert intervals['NEAR/USDT'] < 10, "Символ біля порогу - кожні кілька секунд"
+    assert intervals['DEAD/USDT'] > 250, "Мертвий символ - раз на кілька хвилин"
+    assert intervals['NODATA/USDT'] == 120
+    assert tracker.due_symbols(['NEAR/USDT', 'DEAD/USDT', 'NEW/USDT']) == ['NEW/USDT'], \
+        "Новий символ має бути в черзі одразу"
+    print("\n✅ Пріоритети сканування працюють правильно!")
+
+def test_evaluation_deadline():
+    """Тест дедлайну: завислий виклик покидається, оцінка рахується і перепланується"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 4: Дедлайн оцінки")
+    print("="*60)
+
+    tracker = SymbolPriorityTracker(min_spread_fn=lambda: 2.0, min_interval=0.1, max_interval=300)
+
+    def worker(symbol):
+        if symbol == 'SLOW/USDT':
+            call_with_deadline(time.sleep, 5, what='завислий RPC')  # покидається по дедлайну
+            check_deadline()
+        tracker.observe_spread(symbol, 0.0)
+
+    stop_event = threading.Event()
+    scheduler = ScanScheduler(worker, num_workers=2, rate_budgets={"xt": 100.0}, stop_event=stop_event,
+                              priority_tracker=tracker, deadline_sec=0.3, deadline_retry_sec=30)
+    started = time.monotonic()
+    scheduler.start(lambda: ['SLOW/USDT', 'FAST/USDT'])
+    while scheduler.get_stats()['deadline_exceeded'] < 1 and time.monotonic() - started < 5:
+        time.sleep(0.05)
+    elapsed = time.monotonic() - started
+    stop_event.set()
+    scheduler.stop(timeout=2)
+
+    stats = scheduler.get_stats()
+    assignment = {row['symbol']: row for row in tracker.get_assignments()['assignments']}
+    print(f"   • покинуто за {elapsed:.2f}с, deadline_exceeded={stats['deadline_exceeded']}")
+    assert stats['deadline_exceeded'] == 1
+    assert elapsed < 2, "Оцінка має бути покинута по дедлайну, а не після 5с сну"
+    assert assignment['SLOW/USDT']['tier'] == 'deadline_retry'
+    assert assignment['SLOW/USDT']['interval_sec'] == 30
+    print("\n✅ Дедлайн оцінки працює правильно!")
+
+def test_pipeline_stages():
+    """Тест конвеєра: повільна стадія не блокує інші, відсіяні символи завершуються одразу"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 5: Конвеєр стадій")
+    print("="*60)
+
+    symbols = [f"T{i}/USDT" for i in range(20)]
+    decided = []
+    lock = threading.Lock()
+
+    def enrich(item):
+        time.sleep(0.05)  # "DEX" стадія
+        item['dex_price'] = 1.0
+        return item
+
+    def filter_stage(item):
+        return item if int(item['symbol'][1:].split('/')[0]) % 2 == 0 else None
+
+    def decide(item):
+        with lock:
+            decided.append(item['symbol'])
+        return None
+
+    sweeps = []
+    stop_event = threading.Event()
+    pipeline = ScanPipeline(
+        stages=[PipelineStage('enrich', enrich, workers=10, queue_size=4),
+                PipelineStage('filter', filter_stage, workers=1, queue_size=4),
+                PipelineStage('decide', decide, workers=2, queue_size=4)],
+        stop_event=stop_event,
+        on_sweep_complete=lambda: sweeps.append(time.monotonic()),
+    )
+    pipeline.start(lambda: symbols)
+    started = time.monotonic()
+    while not sweeps and time.monotonic() - started < 5:
+        time.sleep(0.02)
+    stop_event.set()
+    pipeline.stop(timeout=2)
+
+    stats = pipeline.get_stats()
+    print(f"   • sweep'ів: {len(sweeps)}, рішень: {len(set(decided))}")
+    for name, stage in stats['stages'].items():
+        print(f"   • {name}: processed={stage['processed']} dropped={stage['dropped']} avg={stage['avg_ms']}мс")
+    assert sweeps, "Sweep має завершитись"
+    assert stats['stages']['enrich']['processed'] >= 20
+    assert set(decided) == {s for s in symbols if int(s[1:].split('/')[0]) % 2 == 0}
+    assert stats['engine'] == 'pipeline'
+    assert stats['stages']['filter']['dropped'] >= 10
+    print("\n✅ Конвеєр стадій працює правильно!")
+
+if __name__ == "__main__":
+    test_token_bucket_rate()
+    test_scheduler_sweeps()
+    test_priority_intervals()
+    test_evaluation_deadline()
+    test_pipeline_stages()
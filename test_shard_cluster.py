@@ -0,0 +1,116 @@
+"""
+Тестовий скрипт для перевірки шардування символів (координатор + сканери по TCP)
+"""
+import io
+import sys
+import time
+import threading
+
+sys.path.insert(0, '/app')
+
+from shard_cluster import ShardCoordinator, ShardScanner, assign_shards, read_messages
+
+def test_assign_shards():
+    """Тест розподілу: непересічні частини, при відключенні шарду переїжджають тільки його символи"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Rendezvous розподіл символів")
+    print("="*60)
+
+    symbols = [f"T{i}/USDT:USDT" for i in range(790)]
+    three = assign_shards(symbols, ['a', 'b', 'c'])
+    two = assign_shards(symbols, ['a', 'b'])
+    print(f"   • 3 шарди: {[len(v) for v in three.values()]}")
+
+    assert sorted(s for part in three.values() for s in part) == sorted(symbols)
+    assert all(len(part) > 150 for part in three.values())
+    assert set(three['a']) <= set(two['a']) and set(three['b']) <= set(two['b'])
+    print("\n✅ Розподіл символів працює правильно!")
+
+def test_coordinator_roundtrip():
+    """Тест координатора: сканери отримують частини, можливості повертаються, відключення -> перерозподіл"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Координатор і сканери")
+    print("="*60)
+
+    symbols = [f"T{i}/USDT:USDT" for i in range(40)]
+    decided = set()
+    lock = threading.Lock()
+
+    def on_opportunity(message):
+        with lock:
+            decided.add(message['symbol'])
+
+    def evaluate(symbol, has_position, params):
+        if has_position or int(symbol[1:].split('/')[0]) % 10 == 0:
+            return {'xt_price': 1.0, 'advanced_metrics': {'price_usd': 1.1}}
+        return None
+
+    stop_event = threading.Event()
+    coordinator = ShardCoordinator(lambda: symbols, on_opportunity, '127.0.0.1', 0, auth_token='secret',
+                                   rebalance_interval=0.2, open_symbols_fn=lambda: {'T7/USDT:USDT'},
+                                   stop_event=stop_event)
+    coordinator.start()
+
+    scanners = [ShardScanner('127.0.0.1', coordinator.port, f"s{i}", evaluate, auth_token='secret',
+                             num_workers=2, heartbeat_interval=0.2) for i in range(2)]
+    for scanner in scanners:
+        threading.Thread(target=scanner.run, daemon=True).start()
+
+    expected = {s for s in symbols if int(s[1:].split('/')[0]) % 10 == 0} | {'T7/USDT:USDT'}
+    started = time.monotonic()
+    while decided != expected and time.monotonic() - started < 5:
+        time.sleep(0.05)
+    parts = [set(scanner.symbols) for scanner in scanners]
+    print(f"   • частини: {[len(p) for p in parts]}, рішень: {len(decided)}")
+    assert decided == expected
+    assert not (parts[0] & parts[1]) and parts[0] | parts[1] == set(symbols)
+
+    scanners[1].stop()
+    while len(scanners[0].symbols) < len(symbols) and time.monotonic() - started < 8:
+        time.sleep(0.05)
+    stats = coordinator.get_stats()
+    print(f"   • після відключення s1: s0={len(scanners[0].symbols)}, сканерів={stats['scanners']}")
+    assert len(scanners[0].symbols) == len(symbols)
+    assert stats['scanners'] == 1
+
+    intruder = ShardScanner('127.0.0.1', coordinator.port, 'intruder', evaluate, auth_token='wrong', num_workers=1)
+    threading.Thread(target=intruder.run, daemon=True).start()
+    while coordinator.get_stats()['rejected'] < 1 and time.monotonic() - started < 10:
+        time.sleep(0.05)
+    assert coordinator.get_stats()['rejected'] >= 1 and not intruder.symbols
+
+    intruder.stop()
+    scanners[0].stop()
+    coordinator.stop(timeout=2)
+
+    # Координатор, доступний з мережі, без токена не стартує
+    exposed = ShardCoordinator(lambda: symbols, on_opportunity, '0.0.0.0', 0)
+    try:
+        exposed.start()
+        assert False, "координатор без SHARD_AUTH_TOKEN на 0.0.0.0 не повинен стартувати"
+    except ValueError as e:
+        print(f"   • 0.0.0.0 без токена: {e}")
+    assert exposed.server is None
+    print("\n✅ Координатор шардів працює правильно!")
+
+def test_malformed_messages_and_stop():
+    """Тест: рядки, що не є JSON об'єктами, пропускаються; можливості після stop() ігноруються"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 3: Некоректні повідомлення і зупинка координатора")
+    print("="*60)
+
+    stream = io.StringIO('1\n[]\n"hello"\nnot json\n{"type": "hello", "token": "secret"}\n')
+    messages = list(read_messages(stream))
+    print(f"   • прочитано: {messages}")
+    assert messages == [{'type': 'hello', 'token': 'secret'}]
+
+    coordinator = ShardCoordinator(lambda: [], lambda message: None, '127.0.0.1', 0)
+    coordinator.stop(timeout=1)
+    coordinator._on_opportunity(None, {'type': 'opportunity', 'symbol': 'BTC/USDT:USDT'})  # без RuntimeError
+    assert coordinator.get_stats()['opportunities'] == 0 and not coordinator.decide_pending
+    print("\n✅ Обробка некоректних повідомлень працює правильно!")
+
+if __name__ == "__main__":
+    test_assign_shards()
+    test_coordinator_roundtrip()
+    test_malformed_messages_and_stop()
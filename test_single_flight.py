@@ -0,0 +1,62 @@
+"""
+Тестовий скрипт для перевірки single-flight об'єднання запитів DexCheckClient
+"""
+import sys
+import time
+import threading
+
+sys.path.insert(0, '/app')
+
+from dex_client import DexCheckClient
+from deadline import DeadlineExceeded, deadline_scope
+
+def test_single_flight_coalescing():
+    """Тест single-flight: 10 одночасних викликів - один запит до провайдера"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ: Single-flight для resolve_best_pair")
+    print("="*60)
+
+    client = DexCheckClient()
+    calls = []
+
+    def slow_fetch(symbol):
+        calls.append(symbol)
+        time.sleep(0.3)
+        return {'price_usd': 1.23, 'symbol': symbol}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(client._single_flight('ABC_best_pair', slow_fetch, 'ABC')))
+               for _ in range(10)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    print(f"   • запитів до провайдера: {len(calls)}, результатів: {len(results)}")
+    assert len(calls) == 1
+    assert len(results) == 10 and all(r['price_usd'] == 1.23 for r in results)
+    assert client.provider_stats['single_flight_coalesced'] == 9
+    assert not client.inflight_requests
+
+    # Очікувач з коротшим дедлайном не чекає довше за свій бюджет
+    waiter_error = []
+
+    def impatient():
+        try:
+            with deadline_scope(0.1):
+                client._single_flight('SLOW_best_pair', slow_fetch, 'SLOW')
+        except DeadlineExceeded as e:
+            waiter_error.append(e)
+
+    leader = threading.Thread(target=client._single_flight, args=('SLOW_best_pair', slow_fetch, 'SLOW'))
+    leader.start()
+    time.sleep(0.05)
+    started = time.monotonic()
+    impatient()
+    print(f"   • очікувач покинув запит за {time.monotonic() - started:.2f}с")
+    leader.join()
+    assert waiter_error and time.monotonic() - started < 0.3
+    print("\n✅ Single-flight працює правильно!")
+
+if __name__ == "__main__":
+    test_single_flight_coalescing()
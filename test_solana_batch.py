@@ -0,0 +1,106 @@
+"""
+Тестовий скрипт для перевірки пакетного читання Solana пулів через getMultipleAccounts
+"""
+import os
+import sys
+import math
+import struct
+import tempfile
+
+sys.path.insert(0, '/app')
+
+from solders.pubkey import Pubkey
+from blockchain_pools_client import BlockchainPoolsClient
+from pool_registry import PoolRegistry
+
+USDC_MINT = Pubkey.from_string('EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v')
+
+def _key(n):
+    return Pubkey.from_bytes(bytes([n]) * 32)
+
+def _token_account(amount):
+    return bytes(64) + struct.pack('<Q', amount) + bytes(101)
+
+def _mint(decimals):
+    return bytes(44) + bytes([decimals]) + bytes(37)
+
+def _raydium_pool(base_vault, quote_vault, base_mint, quote_mint, base_decimal=6, quote_decimal=6):
+    data = bytearray(752)
+    struct.pack_into('<QQ', data, 32, base_decimal, quote_decimal)
+    data[336:368], data[368:400] = bytes(base_vault), bytes(quote_vault)
+    data[400:432], data[432:464] = bytes(base_mint), bytes(quote_mint)
+    return bytes(data)
+
+def _whirlpool(price, mint_a, mint_b):
+    data = bytearray(653)
+    sqrt_price = int(math.sqrt(price) * 2 ** 64)
+    struct.pack_into('<QQ', data, 65, sqrt_price & (2 ** 64 - 1), sqrt_price >> 64)
+    data[101:133], data[181:213] = bytes(mint_a), bytes(mint_b)
+    return bytes(data)
+
+class FakeSolanaClient:
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.requests = []
+
+    def get_multiple_accounts(self, pubkeys):
+        self.requests.append([str(p) for p in pubkeys])
+        values = [type('Account', (), {'data': self.accounts[str(p)]})() if str(p) in self.accounts else None
+                  for p in pubkeys]
+        return type('Response', (), {'value': values})()
+
+    def get_account_info(self, pubkey):
+        self.requests.append([str(pubkey)])
+        data = self.accounts.get(str(pubkey))
+        return type('Response', (), {'value': type('Account', (), {'data': data})() if data else None})()
+
+def test_solana_prices_in_one_request():
+    """Тест: після першого визначення vault акаунтів усі Solana ціни - один getMultipleAccounts"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: getMultipleAccounts для всіх Solana пулів")
+    print("="*60)
+
+    ray_pool, orca_pool, legacy_pool = _key(1), _key(2), _key(3)
+    base_vault, quote_vault, mint_a, mint_b = _key(4), _key(5), _key(6), USDC_MINT
+    accounts = {
+        str(ray_pool): _raydium_pool(base_vault, quote_vault, _key(8), USDC_MINT),
+        str(base_vault): _token_account(1000 * 10**6),
+        str(quote_vault): _token_account(2000 * 10**6),
+        str(orca_pool): _whirlpool(1.5, mint_a, mint_b),
+        str(mint_a): _mint(6),
+        str(mint_b): _mint(6),
+        str(legacy_pool): bytes(64) + struct.pack('<QQ', 1000, 150_000_000),
+    }
+    client = BlockchainPoolsClient()
+    registry_path = os.path.join(tempfile.mkdtemp(), 'pool_registry.json')
+    client.pool_registry = PoolRegistry(registry_path)
+    client.solana_client = FakeSolanaClient(accounts)
+    client.pools['solana'] = {
+        'RAY': {'address': str(ray_pool)},
+        'WIF': {'address': str(orca_pool)},
+        'SOL': {'address': str(legacy_pool)},
+        'BAD': {'address': 'not-a-valid-base58-address-0OIl'},
+    }
+
+    assert client.refresh_solana_prices() == 2  # пул з невідомим layout ціни не має
+    discovery_requests = len(client.solana_client.requests)  # пули + mint акаунти Whirlpool
+    prices = {s: client._peek_cache(client._get_cache_key(s, 'solana')) for s in ('RAY', 'WIF', 'SOL')}
+    print(f"   • ціни: {prices}, запитів на першому оновленні: {discovery_requests}")
+    assert prices['RAY'] == 2.0 and abs(prices['WIF'] - 1.5) < 1e-9 and prices['SOL'] is None
+    assert ('solana', str(legacy_pool)) in client.pool_registry.failed
+    assert str(legacy_pool) not in PoolRegistry(registry_path).pools.get('solana', {})  # не збережено на диск
+
+    client.refresh_solana_prices()
+    steady = client.solana_client.requests[discovery_requests:]
+    print(f"   • наступне оновлення: {len(steady)} запит, {len(steady[0])} акаунтів")
+    assert len(steady) == 1 and set(steady[0]) == {str(ray_pool), str(base_vault), str(quote_vault),
+                                                   str(orca_pool)}
+
+    # Окремий шлях (пакет недоступний): розбір за записом реєстру, невідомий пул - без ціни
+    assert client._solana_pool_price('RAY', str(ray_pool)) == 2.0
+    assert client.solana_client.requests[-3:] == [[str(ray_pool)], [str(base_vault)], [str(quote_vault)]]
+    assert client._solana_pool_price('SOL', str(legacy_pool)) is None
+    print("\n✅ Пакетне читання Solana пулів працює правильно!")
+
+if __name__ == "__main__":
+    test_solana_prices_in_one_request()
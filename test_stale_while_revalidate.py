@@ -0,0 +1,80 @@
+"""
+Тестовий скрипт для перевірки stale-while-revalidate кешу DEX пар
+"""
+import sys
+import time
+import threading
+
+sys.path.insert(0, '/app')
+
+from dex_client import DexCheckClient
+from pair_index import PairIndex
+
+def _client_with_fake_provider(delay=0.0):
+    client = DexCheckClient()
+    client.pair_index = PairIndex(':memory:')
+    calls = []
+    refreshed = threading.Event()
+
+    def fake_resolve(symbol, for_convergence=False, max_age=None):
+        calls.append(max_age)
+        time.sleep(delay)
+        data = {'price_usd': 2.0, 'liquidity_usd': 100000, 'chain': 'bsc'}
+        result = client.store_best_pair(symbol, data, 'coingecko', for_convergence)
+        refreshed.set()
+        return result
+
+    client._resolve_best_pair = fake_resolve
+    return client, calls, refreshed
+
+def test_stale_served_and_refreshed():
+    """Тест: застаріла пара повертається одразу з віком, оновлення йде у фоні"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 1: Stale пара + фонове оновлення")
+    print("="*60)
+
+    client, calls, refreshed = _client_with_fake_provider(delay=0.5)
+    client.token_cache.set('SWR_best_pair', {'price_usd': 1.0, 'cached_at': time.time() - 400}, namespace='best_pair')
+
+    started = time.monotonic()
+    pair = client.resolve_best_pair('SWR')
+    elapsed = time.monotonic() - started
+    print(f"   • ціна {pair['price_usd']}, вік {pair['age_sec']}с, stale={pair['stale']}, за {elapsed:.3f}с")
+    assert pair['price_usd'] == 1.0 and pair['stale'] and pair['age_sec'] >= 400
+    assert elapsed < 0.2  # воркер не чекає провайдера
+
+    client.resolve_best_pair('SWR')  # повторний виклик не запускає друге оновлення
+    assert refreshed.wait(2.0)
+    time.sleep(0.05)
+    pair = client.resolve_best_pair('SWR')
+    print(f"   • після оновлення: ціна {pair['price_usd']}, stale={pair['stale']}, оновлень: {len(calls)}")
+    assert pair['price_usd'] == 2.0 and not pair['stale']
+    assert len(calls) == 1 and client.provider_stats['stale_served'] == 2
+    print("\n✅ Stale-while-revalidate працює правильно!")
+
+def test_fresh_data_required():
+    """Тест: allow_stale=False і конвергенція (max_age) чекають свіжих даних"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ 2: Обов'язково свіжі дані")
+    print("="*60)
+
+    client, calls, _ = _client_with_fake_provider()
+    client.token_cache.set('FRS_best_pair', {'price_usd': 1.0, 'cached_at': time.time() - 400}, namespace='best_pair')
+    pair = client.resolve_best_pair('FRS', allow_stale=False)
+    assert pair['price_usd'] == 2.0 and not pair['stale']
+
+    # конвергенція: пара 60с - свіжа для сканера, але старша за DEX_CONVERGENCE_MAX_AGE_SEC
+    client.token_cache.set('FRS_convergence_best_pair', {'price_usd': 1.0, 'cached_at': time.time() - 60},
+                           namespace='best_pair')
+    pair = client.resolve_best_pair('FRS', for_convergence=True)
+    print(f"   • конвергенція: ціна {pair['price_usd']}, max_age виклику: {calls[-1]}")
+    assert pair['price_usd'] == 2.0 and calls[-1] == 30
+
+    # старша за жорсткий TTL пара не віддається взагалі
+    client.token_cache.set('OLD_best_pair', {'price_usd': 1.0, 'cached_at': time.time()}, namespace='best_pair', ttl=0)
+    assert client.resolve_best_pair('OLD')['price_usd'] == 2.0
+    print("\n✅ Вимога свіжих даних працює правильно!")
+
+if __name__ == "__main__":
+    test_stale_served_and_refreshed()
+    test_fresh_data_required()
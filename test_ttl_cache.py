@@ -0,0 +1,59 @@
+"""
+Тестовий скрипт для перевірки TTL+LRU кешу
+"""
+import sys
+import time
+import threading
+
+sys.path.insert(0, '/app')
+
+from ttl_cache import TTLCache, get_all_cache_stats
+from metrics import metrics
+
+def test_ttl_and_lru():
+    """Тест кешу: TTL по просторах імен, LRU витіснення за кількістю та розміром, статистика"""
+    print("\n" + "="*60)
+    print("🧪 ТЕСТ: TTL + LRU кеш")
+    print("="*60)
+
+    cache = TTLCache('test_cache', default_ttl=60, namespace_ttls={'short': 0.05}, max_entries=3, stripes=1)
+    cache.set('a', 1)
+    cache.set('b', 2, namespace='short')
+    assert cache.get('a') == 1 and cache.get('b', namespace='short') == 2
+    assert cache.get('b') is None  # інший простір імен
+    time.sleep(0.1)
+    assert cache.get('b', namespace='short') is None
+    assert cache.get('a') == 1
+
+    # LRU: 'a' щойно читали, тому витісняється 'c'
+    cache.set('c', 3)
+    cache.set('d', 4)
+    cache.get('a')
+    cache.set('e', 5)
+    print(f"   • записів: {len(cache)}")
+    assert len(cache) == 3 and cache.get('c') is None and cache.get('a') == 1
+
+    # Ліміт за розміром
+    sized = TTLCache('test_sized_cache', max_entries=None, max_bytes=4096, stripes=1)
+    for i in range(50):
+        sized.set(i, 'x' * 500)
+    assert sized.get_stats()['bytes'] <= 4096 and sized.get(49) is not None and sized.get(0) is None
+
+    # Конкурентний доступ
+    threads = [threading.Thread(target=lambda n=n: [cache.set(f"{n}_{i}", i) or cache.get(f"{n}_{i}") for i in range(200)])
+               for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(cache) == 3
+
+    stats = get_all_cache_stats()['test_cache']['namespaces']
+    print(f"   • статистика: {stats}")
+    assert stats['short']['expired'] == 1 and stats['short']['ttl_sec'] == 0.05
+    assert stats['default']['evictions'] > 0 and stats['default']['hits'] > 0
+    assert 'cache_requests_total{cache="test_cache"' in metrics.render_prometheus()
+    print("\n✅ TTL + LRU кеш працює правильно!")
+
+if __name__ == "__main__":
+    test_ttl_and_lru()
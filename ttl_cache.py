@@ -0,0 +1,196 @@
+"""
+💾 TTL CACHE: Потокобезпечний обмежений кеш з TTL по просторах імен та LRU витісненням
+Замінює звичайні dict кеші (DexCheckClient.token_cache, BlockchainPoolsClient.price_cache,
+TechnicalIndicators.cache, MarketConditionsMonitor.cache), які росли без меж і ділились між
+50 потоками без локу. Ключі розбиті на сегменти (lock striping) - потоки з різними символами
+не чекають один на одного. Статистика hit/miss/eviction експортується в /metrics.
+"""
+import sys
+import time
+import zlib
+import threading
+from collections import OrderedDict
+
+from metrics import metrics
+
+_registry = {}  # name -> TTLCache (для експорту статистики)
+_registry_lock = threading.Lock()
+
+
+def estimate_size(value, _depth=0):
+    """Орієнтовний розмір значення в байтах (вкладені dict/list до 3 рівнів)"""
+    size = sys.getsizeof(value)
+    if _depth >= 3:
+        return size
+    if isinstance(value, dict):
+        size += sum(estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(estimate_size(v, _depth + 1) for v in value)
+    return size
+
+
+class _Stripe:
+    __slots__ = ('entries', 'lock', 'bytes', 'stats')
+
+    def __init__(self):
+        self.entries = OrderedDict()  # (namespace, key) -> (value, expires_at, size)
+        self.lock = threading.Lock()
+        self.bytes = 0
+        self.stats = {}  # namespace -> {'hits', 'misses', 'expired', 'evictions', 'sets'}
+
+
+class TTLCache:
+    """
+    💾 Кеш з TTL та LRU:
+    - namespace_ttls: TTL (сек) для кожного простору імен, default_ttl для решти; ttl в set() перекриває їх
+    - max_entries / max_bytes: ліміти всього кешу (діляться порівну між сегментами)
+    - get() повертає default для відсутніх і прострочених записів
+    """
+
+    def __init__(self, name, default_ttl=60, namespace_ttls=None, max_entries=10000, max_bytes=None, stripes=16):
+        self.name = name
+        self.default_ttl = default_ttl
+        self.namespace_ttls = dict(namespace_ttls or {})
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stripes = [_Stripe() for _ in range(max(1, stripes))]
+        self.stripe_max_entries = max(1, -(-max_entries // len(self.stripes))) if max_entries else None
+        self.stripe_max_bytes = max(1, max_bytes // len(self.stripes)) if max_bytes else None
+        with _registry_lock:
+            _registry[name] = self
+
+    def _stripe(self, namespace, key):
+        return self.stripes[zlib.crc32(f"{namespace}:{key}".encode()) % len(self.stripes)]
+
+    @staticmethod
+    def _count(stripe, namespace, field, amount=1):
+        stats = stripe.stats.get(namespace)
+        if stats is None:
+            stats = stripe.stats[namespace] = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'sets': 0}
+        stats[field] += amount
+
+    def ttl_for(self, namespace):
+        return self.namespace_ttls.get(namespace, self.default_ttl)
+
+    def get(self, key, namespace='default', default=None):
+        stripe = self._stripe(namespace, key)
+        entry_key = (namespace, key)
+        with stripe.lock:
+            entry = stripe.entries.get(entry_key)
+            if entry is None:
+                self._count(stripe, namespace, 'misses')
+                return default
+            value, expires_at, size = entry
+            if expires_at <= time.time():
+                del stripe.entries[entry_key]
+                stripe.bytes -= size
+                self._count(stripe, namespace, 'expired')
+                self._count(stripe, namespace, 'misses')
+                return default
+            stripe.entries.move_to_end(entry_key)
+            self._count(stripe, namespace, 'hits')
+            return value
+
+    def set(self, key, value, namespace='default', ttl=None):
+        stripe = self._stripe(namespace, key)
+        entry_key = (namespace, key)
+        ttl = self.ttl_for(namespace) if ttl is None else ttl
+        size = estimate_size(value) if self.stripe_max_bytes else 0
+        with stripe.lock:
+            previous = stripe.entries.pop(entry_key, None)
+            if previous is not None:
+                stripe.bytes -= previous[2]
+            stripe.entries[entry_key] = (value, time.time() + ttl, size)
+            stripe.bytes += size
+            self._count(stripe, namespace, 'sets')
+            self._evict(stripe)
+        return value
+
+    def _evict(self, stripe):
+        """LRU витіснення поки сегмент перевищує ліміт (викликається під локом сегмента)"""
+        while stripe.entries and (
+            (self.stripe_max_entries and len(stripe.entries) > self.stripe_max_entries) or
+            (self.stripe_max_bytes and stripe.bytes > self.stripe_max_bytes)
+        ):
+            (namespace, _), (_, _, size) = stripe.entries.popitem(last=False)
+            stripe.bytes -= size
+            self._count(stripe, namespace, 'evictions')
+
+    def delete(self, key, namespace='default'):
+        stripe = self._stripe(namespace, key)
+        with stripe.lock:
+            entry = stripe.entries.pop((namespace, key), None)
+            if entry is not None:
+                stripe.bytes -= entry[2]
+        return entry is not None
+
+    def clear(self, namespace=None):
+        for stripe in self.stripes:
+            with stripe.lock:
+                if namespace is None:
+                    stripe.entries.clear()
+                    stripe.bytes = 0
+                    continue
+                for entry_key in [k for k in stripe.entries if k[0] == namespace]:
+                    stripe.bytes -= stripe.entries.pop(entry_key)[2]
+
+    def purge_expired(self):
+        """Видаляє всі прострочені записи (LRU і так витіснить їх, це для звітності/пам'яті)"""
+        now = time.time()
+        removed = 0
+        for stripe in self.stripes:
+            with stripe.lock:
+                for entry_key in [k for k, entry in stripe.entries.items() if entry[1] <= now]:
+                    stripe.bytes -= stripe.entries.pop(entry_key)[2]
+                    self._count(stripe, entry_key[0], 'expired')
+                    removed += 1
+        return removed
+
+    def __len__(self):
+        return sum(len(stripe.entries) for stripe in self.stripes)
+
+    def get_stats(self):
+        namespaces = {}
+        entries_by_namespace = {}
+        total_bytes = 0
+        for stripe in self.stripes:
+            with stripe.lock:
+                total_bytes += stripe.bytes
+                for namespace, _ in stripe.entries:
+                    entries_by_namespace[namespace] = entries_by_namespace.get(namespace, 0) + 1
+                for namespace, stats in stripe.stats.items():
+                    merged = namespaces.setdefault(namespace, dict.fromkeys(stats, 0))
+                    for field, value in stats.items():
+                        merged[field] += value
+        for namespace, stats in namespaces.items():
+            lookups = stats['hits'] + stats['misses']
+            stats['entries'] = entries_by_namespace.get(namespace, 0)
+            stats['hit_rate_percent'] = round(stats['hits'] / lookups * 100, 2) if lookups else 0.0
+            stats['ttl_sec'] = self.ttl_for(namespace)
+        return {
+            'entries': len(self),
+            'max_entries': self.max_entries,
+            'bytes': total_bytes if self.max_bytes else None,
+            'max_bytes': self.max_bytes,
+            'namespaces': namespaces,
+        }
+
+
+def get_all_cache_stats():
+    with _registry_lock:
+        caches = list(_registry.values())
+    return {cache.name: cache.get_stats() for cache in caches}
+
+
+def _collect_cache_metrics():
+    """Лічильники для /metrics: cache_requests_total{cache, namespace, result}"""
+    samples = []
+    for name, stats in get_all_cache_stats().items():
+        for namespace, ns_stats in stats['namespaces'].items():
+            for result in ('hits', 'misses', 'expired', 'evictions'):
+                samples.append(({'cache': name, 'namespace': namespace, 'result': result}, ns_stats[result]))
+    return samples
+
+
+metrics.register_collector('cache_requests_total', 'counter', _collect_cache_metrics,
+                           'Звернення до кешів за результатом (hits/misses/expired/evictions)')
@@ -6,6 +6,8 @@ import time
 import json
 from datetime import datetime
 from typing import Optional
+from metrics import metrics
+from rate_governor import rate_governor
 
 # 🔗 НОВА ІНТЕГРАЦІЯ: DEX Link Generator для прямих посилань на торгові пари
 # Simple fallback instead of dex_link_generator
@@ -52,6 +54,7 @@ def send_telegram(bot_token, chat_id, text):
             text = text[:4000] + "..."
         
         # Відправляємо запит з HTML форматом БЕЗ web page preview
+        rate_governor.acquire('telegram')
         response = requests.post(url, data={
             "chat_id": chat_id, 
             "text": text, 
@@ -78,6 +81,7 @@ def send_telegram(bot_token, chat_id, text):
         logging.error(f"❌ Telegram network error для chat_id={chat_id}: {str(e)}")
         return False
 
+@metrics.timed('scan_stage_seconds', stage='telegram_send')
 def send_to_admins_and_group(text):
     """
     🎯 ЦЕНТРАЛІЗОВАНА ФУНКЦІЯ: Відправляє повідомлення обом адмінам + групі
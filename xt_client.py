@@ -2,6 +2,8 @@ import ccxt
 import logging
 import time
 from config import XT_API_KEY, XT_API_SECRET, XT_ACCOUNT_2_API_KEY, XT_ACCOUNT_2_API_SECRET, DRY_RUN, ALLOW_LIVE_TRADING
+from deadline import check_deadline
+from rate_governor import rate_governor, critical_traffic
 
 # Глобальна змінна для збереження ринків XT
 xt_markets = {}
@@ -44,9 +46,14 @@ def create_xt(api_key=None, api_secret=None, account_name="Account 1"):
     except Exception as e:
         logging.warning(f"⚠️ {account_name}: Не вдалося налаштувати connection pool: {e}")
     
+    xt.rate_limit_key = f"xt_private:{account_name}"  # ⏱️ окремий ліміт приватного API на кожен акаунт
     logging.info(f"✅ XT {account_name} клієнт створено успішно")
     return xt
 
+def _acquire_private(xt):
+    """⏱️ Токен приватного API акаунта (пріоритет - з контексту, ордери йдуть першими)"""
+    rate_governor.acquire(getattr(xt, 'rate_limit_key', 'xt_private'))
+
 def load_xt_futures_markets(xt):
     """🚀 Завантажує ВСІ futures ринки XT (swap + future для 700+)"""
     global xt_markets
@@ -105,6 +112,8 @@ def load_xt_futures_markets(xt):
 
 def fetch_xt_ticker(xt, symbol):
     """Отримання тікера з XT"""
+    check_deadline(f"XT ticker {symbol}")
+    rate_governor.acquire('xt_public')
     return xt.fetch_ticker(symbol)
 
 def get_all_xt_futures_pairs(client):
@@ -138,6 +147,8 @@ def get_all_xt_futures_pairs(client):
 
 def fetch_xt_order_book(xt, symbol, depth=10):
     """Отримання стакану з XT"""
+    check_deadline(f"XT order book {symbol}")
+    rate_governor.acquire('xt_public')
     return xt.fetch_order_book(symbol, depth)
 
 def collect_market_depth_data(xt, symbol, depth_levels=20):
@@ -344,6 +355,7 @@ def get_xt_futures_balance(xt):
                 'used': 50.0
             }
         
+        _acquire_private(xt)
         balance = xt.fetch_balance({'type': 'swap'})
         
         # 🔍 DEBUG: Логування сирої відповіді для діагностики
@@ -415,6 +427,7 @@ def is_xt_futures_tradeable(symbol):
         logging.error(f"Помилка перевірки XT futures для {symbol}: {e}")
         return False
 
+@critical_traffic
 def xt_open_market_position(xt, symbol, side, usd_amount, leverage, xt_price_ref=None, dex_price_ref=None, spread_ref=None):
     """
     Створює ринковий ордер на XT futures через CCXT (аналогічно Gate.io).
@@ -470,6 +483,7 @@ def xt_open_market_position(xt, symbol, side, usd_amount, leverage, xt_price_ref
         
         # ⚙️ КРОК 5A: Встановлюємо ISOLATED MARGIN MODE
         try:
+            _acquire_private(xt)
             xt.set_margin_mode('isolated', symbol)
             logging.info(f"[XT {symbol}] ⚙️ КРОК 5A: ✅ Встановлено ISOLATED margin mode")
         except Exception as e:
@@ -479,6 +493,7 @@ def xt_open_market_position(xt, symbol, side, usd_amount, leverage, xt_price_ref
         # ⚙️ КРОК 5B: Встановлюємо плече для futures контракту
         position_side = "LONG" if side == "LONG" else "SHORT"
         try:
+            _acquire_private(xt)
             xt.set_leverage(clamped_leverage, symbol, {"positionSide": position_side})
             logging.info(f"[XT {symbol}] ⚙️ КРОК 5B: ✅ Встановлено леверидж {clamped_leverage}x ({position_side})")
         except Exception as e:
@@ -536,6 +551,7 @@ def xt_open_market_position(xt, symbol, side, usd_amount, leverage, xt_price_ref
 
         # 🎯 КРОК 12: СТВОРЕННЯ ОРДЕРА
         logging.info(f"[XT {symbol}] 🎯 КРОК 12: Створення ордера на біржі...")
+        _acquire_private(xt)
         order = xt.create_order(
             symbol, 
             'market', 
@@ -577,6 +593,7 @@ def xt_open_market_position(xt, symbol, side, usd_amount, leverage, xt_price_ref
         logging.error("XT Order create error: %s %s", type(e).__name__, e)
         return None
 
+@critical_traffic
 def xt_close_position_market(xt, symbol, side, usd_amount):
     """
     Закриття позиції на XT futures.
@@ -602,6 +619,7 @@ def xt_close_position_market(xt, symbol, side, usd_amount):
     try:
         # 🔧 КРИТИЧНО: Отримуємо СПРАВЖНІЙ розмір позиції з біржі!
         try:
+            _acquire_private(xt)
             live_positions = xt.fetch_positions([symbol])
             actual_position = None
             
@@ -656,6 +674,7 @@ def xt_close_position_market(xt, symbol, side, usd_amount):
         
         logging.info(f"[XT {symbol}] 🎯 INSTANT CLOSE: exact={exact_contracts:.6f}, final={contracts_final}, instant_price=${instant_price:.6f}")
         
+        _acquire_private(xt)
         order = xt.create_order(
             symbol, 
             'market', 
@@ -735,6 +754,7 @@ def get_xt_open_positions(xt):
             return []
         
         # XT.com може вимагати інші параметри
+        _acquire_private(xt)
         positions = xt.fetch_positions()
         # Фільтруємо тільки відкриті позиції з розміром > 0
         open_positions = []